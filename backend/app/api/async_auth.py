@@ -0,0 +1,96 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import limit_login, limit_register, oauth2_scheme, optional_oauth2_scheme
+from app.db.async_session import get_async_db
+from app.core.security import verify_token, token_cache
+from app.core.responses import model_response
+from app.services.auth_service import create_user_token
+from app.services.async_auth_service import (
+    create_user,
+    authenticate_user,
+    get_user_by_username
+)
+from app.schemas.user import User, UserCreate, Token
+
+# Same endpoints as app.api.auth, served from the AsyncSession stack
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+@router.post(
+    "/register",
+    response_model=User,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_register)],
+)
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Register a new user.
+    
+    - **email**: Valid email address
+    - **username**: Unique username
+    - **password**: Strong password
+    """
+    return model_response(User, await create_user(db=db, user=user), status.HTTP_201_CREATED)
+
+@router.post("/token", response_model=Token, dependencies=[Depends(limit_login)])
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    OAuth2 compatible token login.
+    
+    - **username**: Your username
+    - **password**: Your password
+    """
+    user = await authenticate_user(db, form_data.username, form_data.password)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return create_user_token(user)
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Dependency to get current authenticated user."""
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user
+
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    payload = verify_token(token, credentials_exception)
+    username: str = payload.get("sub")
+    if username is None:
+        raise credentials_exception
+        
+    user = await get_user_by_username(db, username)
+    if user is None:
+        raise credentials_exception
+    snapshot = User.model_validate(user)
+    token_cache.set(token, payload, snapshot)
+    return snapshot
+
+async def get_optional_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[User]:
+    """Like get_current_user, but returns None for anonymous requests."""
+    if token is None:
+        return None
+    return await get_current_user(token=token, db=db)
+
+@router.get("/me", response_model=User)
+async def read_users_me(current_user: User = Depends(get_current_user)):
+    """Get current user information."""
+    return model_response(User, current_user)
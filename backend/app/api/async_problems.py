@@ -0,0 +1,149 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.async_auth import get_optional_user
+from app.api.auth import optional_oauth2_scheme
+from app.api.problems import CompletionStatus, build_filters
+from app.core.cache import cached_json_response, problem_cache
+from app.core.responses import model_response
+from app.db.async_session import get_async_db
+from app.schemas.problem import (
+    Problem,
+    ProblemCreate,
+    ProblemFacets,
+    ProblemSummary,
+    serialize_problem,
+    serialize_problem_summaries
+)
+from app.services.async_problem_service import (
+    get_problems,
+    get_problems_page,
+    get_problem,
+    get_problem_facets,
+    create_problem,
+    ProblemFilters,
+    DETAIL_PREREQUISITE_DEPTH
+)
+
+# Same endpoints as app.api.problems, served from the AsyncSession stack
+router = APIRouter(prefix="/problems", tags=["problems"])
+
+async def problem_filters(
+    subject: Optional[str] = None,
+    min_difficulty: Optional[int] = Query(None, ge=0),
+    max_difficulty: Optional[int] = Query(None, ge=0),
+    completion_status: Optional[CompletionStatus] = Query(None, alias="status"),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> ProblemFilters:
+    """
+    Query parameters shared by the list and facet endpoints.
+
+    The token is only verified for a status filter, so clients that send a
+    stale token with every request can still read the public catalog.
+    """
+    current_user = None
+    if completion_status is not None:
+        current_user = await get_optional_user(token=token, db=db)
+    return build_filters(subject, min_difficulty, max_difficulty, completion_status, current_user)
+
+async def to_response(db: AsyncSession, db_problem, status_code: int = status.HTTP_200_OK):
+    """Serialize an ORM problem inside the session's greenlet context.
+
+    Prerequisite trees deeper than the eager-loaded depth need lazy loads,
+    which only work under `run_sync`.
+    """
+    return await db.run_sync(lambda _: model_response(Problem, db_problem, status_code))
+
+@router.get("/", response_model=List[ProblemSummary])
+async def read_problems(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    filters: ProblemFilters = Depends(problem_filters),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List problem summaries ordered by id; `GET /problems/{id}` has the full
+    problem with steps, hints and prerequisites.
+
+    - **cursor**: Opaque cursor taken from the `X-Next-Cursor` or
+      `X-Prev-Cursor` header of a previous page; repeat the same filters
+    - **limit**: Max number of problems to return
+    - **skip**: Offset-based paging, kept for existing clients
+    - **subject**, **min_difficulty**, **max_difficulty**: Catalog filters
+    - **status**: `completed`, `in_progress` or `not_started` for the
+      signed-in user
+
+    Responses carry an ETag; send it back in `If-None-Match` to get a 304
+    while the catalog is unchanged.
+    """
+    cache_key = None if filters.status else f"list:{cursor}:{skip}:{limit}:{filters.cache_key()}"
+    entry, version = problem_cache.get(cache_key)
+    if entry is None:
+        headers = {}
+        if cursor is None and skip:
+            problems = await get_problems(
+                db, skip=skip, limit=limit, prerequisite_depth=None,
+                filters=filters
+            )
+        else:
+            try:
+                page = await get_problems_page(
+                    db, cursor=cursor, limit=limit, prerequisite_depth=None,
+                    filters=filters
+                )
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            problems = page.items
+            if page.next_cursor:
+                headers["X-Next-Cursor"] = page.next_cursor
+            if page.prev_cursor:
+                headers["X-Prev-Cursor"] = page.prev_cursor
+        entry = problem_cache.set(cache_key, version, serialize_problem_summaries(problems), headers)
+    return cached_json_response(request, entry)
+
+@router.get("/facets", response_model=ProblemFacets)
+async def read_problem_facets(
+    request: Request,
+    filters: ProblemFilters = Depends(problem_filters),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Count problems per subject and per difficulty, after applying the same
+    filters as the list endpoint.
+    """
+    cache_key = None if filters.status else f"facets:{filters.cache_key()}"
+    entry, version = problem_cache.get(cache_key)
+    if entry is None:
+        facets = await get_problem_facets(db, filters)
+        entry = problem_cache.set(cache_key, version, facets.model_dump_json().encode())
+    return cached_json_response(request, entry)
+
+@router.get("/{problem_id}", response_model=Problem)
+async def read_problem(
+    request: Request,
+    problem_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    cache_key = f"detail:{problem_id}"
+    entry, version = problem_cache.get(cache_key)
+    if entry is None:
+        db_problem = await get_problem(
+            db, problem_id=problem_id, prerequisite_depth=DETAIL_PREREQUISITE_DEPTH
+        )
+        if db_problem is None:
+            raise HTTPException(status_code=404, detail="Problem not found")
+        body = await db.run_sync(lambda _: serialize_problem(db_problem))
+        entry = problem_cache.set(cache_key, version, body)
+    return cached_json_response(request, entry)
+
+@router.post("/", response_model=Problem, status_code=status.HTTP_201_CREATED)
+async def create_new_problem(problem: ProblemCreate, db: AsyncSession = Depends(get_async_db)):
+    db_problem = await create_problem(db=db, problem=problem)
+    return await to_response(db, db_problem, status.HTTP_201_CREATED)
@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.core.security import verify_token
+from app.core.security import verify_token, token_cache
+from app.core.responses import model_response
 from app.core.config import settings
+from app.core.rate_limit import (
+    client_address,
+    login_ip_limiter,
+    login_username_limiter,
+    register_ip_limiter,
+    trusted_proxies
+)
 from app.services.auth_service import (
     create_user,
     authenticate_user,
@@ -15,8 +24,34 @@ from app.schemas.user import User, UserCreate, Token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/token")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.API_V1_STR}/auth/token", auto_error=False
+)
+
+def client_ip(request: Request) -> Optional[str]:
+    """The client address, read through `settings.TRUSTED_PROXIES`."""
+    peer = request.client.host if request.client else None
+    return client_address(peer, request.headers.get("x-forwarded-for"), trusted_proxies)
+
+async def limit_register(request: Request):
+    """Reject registrations over the per-IP budget before any hashing."""
+    register_ip_limiter.check(client_ip(request))
+
+async def limit_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    """
+    Reject login attempts over the per-IP or per-username budget before the
+    user lookup and bcrypt verification run. The parsed form is shared with
+    the route.
+    """
+    login_ip_limiter.check(client_ip(request))
+    login_username_limiter.check(form_data.username.lower())
 
-@router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=User,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_register)],
+)
 def register_user(user: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user.
@@ -25,9 +60,9 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     - **username**: Unique username
     - **password**: Strong password
     """
-    return create_user(db=db, user=user)
+    return model_response(User, create_user(db=db, user=user), status.HTTP_201_CREATED)
 
-@router.post("/token", response_model=Token)
+@router.post("/token", response_model=Token, dependencies=[Depends(limit_login)])
 def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -51,7 +86,16 @@ async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
-    """Dependency to get current authenticated user."""
+    """
+    Dependency to get current authenticated user.
+
+    Verified tokens are cached with a snapshot of the user, so repeat calls
+    with the same token skip both JWT verification and the user lookup.
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -66,9 +110,20 @@ async def get_current_user(
     user = get_user_by_username(db, username)
     if user is None:
         raise credentials_exception
-    return user
+    snapshot = User.model_validate(user)
+    token_cache.set(token, payload, snapshot)
+    return snapshot
+
+async def get_optional_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Optional[User]:
+    """Like get_current_user, but returns None for anonymous requests."""
+    if token is None:
+        return None
+    return await get_current_user(token=token, db=db)
 
 @router.get("/me", response_model=User)
 def read_users_me(current_user: User = Depends(get_current_user)):
     """Get current user information."""
-    return current_user
+    return model_response(User, current_user)
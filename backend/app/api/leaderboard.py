@@ -0,0 +1,33 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.auth import get_current_user
+from app.core.responses import model_response
+from app.db.session import get_db
+from app.schemas.leaderboard import LeaderboardEntry, LeaderboardStanding
+from app.schemas.user import User
+from app.services.leaderboard import get_leaderboard, get_standing
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+@router.get("/", response_model=List[LeaderboardEntry])
+def read_leaderboard(
+    subject: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Top users by completed problems, overall or within a subject."""
+    return model_response(List[LeaderboardEntry], get_leaderboard(db, subject, limit))
+
+@router.get("/me", response_model=LeaderboardStanding)
+def read_my_standing(
+    subject: Optional[str] = None,
+    radius: int = Query(5, ge=0, le=50),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """The current user's rank and score, with the users ranked around them."""
+    return model_response(
+        LeaderboardStanding, get_standing(db, subject, current_user.id, radius)
+    )
@@ -1,25 +1,243 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.api.auth import get_current_user, get_optional_user, optional_oauth2_scheme
+from app.core.cache import cached_json_response, problem_cache
+from app.core.responses import model_response
 from app.db.session import get_db
-from app.schemas.problem import Problem, ProblemCreate
-from app.services.problem_service import get_problems, get_problem, create_problem
+from app.schemas.user import User
+from app.schemas.problem import (
+    Problem,
+    ProblemCreate,
+    BulkImportResult,
+    LearningPath,
+    ProblemFacets,
+    ProblemSearchHit,
+    ProblemSummary,
+    Recommendations,
+    serialize_problem,
+    serialize_problem_summaries
+)
+from app.services.recommendation_service import get_recommendations
+from app.services.search_service import SEARCH_LIMIT, search_problems
+from app.services.export_service import iter_problem_export
+from app.services.import_service import BulkImportError, import_problems, iter_json_records
+from app.services.problem_service import (
+    get_problems,
+    get_problems_page,
+    get_problem,
+    create_problem,
+    get_learning_path,
+    get_problem_facets,
+    ProblemFilters,
+    DETAIL_PREREQUISITE_DEPTH
+)
 
 router = APIRouter(prefix="/problems", tags=["problems"])
 
-@router.get("/", response_model=List[Problem])
-def read_problems(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    problems = get_problems(db, skip=skip, limit=limit)
-    return problems
+CompletionStatus = Literal["completed", "in_progress", "not_started"]
+
+def build_filters(
+    subject: Optional[str],
+    min_difficulty: Optional[int],
+    max_difficulty: Optional[int],
+    completion_status: Optional[str],
+    user: Optional[User]
+) -> ProblemFilters:
+    if min_difficulty is not None and max_difficulty is not None and min_difficulty > max_difficulty:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_difficulty cannot exceed max_difficulty"
+        )
+    if completion_status is not None and user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Sign in to filter by completion status",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return ProblemFilters(
+        subject=subject,
+        min_difficulty=min_difficulty,
+        max_difficulty=max_difficulty,
+        status=completion_status,
+        user_id=user.id if completion_status is not None else None,
+    )
+
+async def problem_filters(
+    subject: Optional[str] = None,
+    min_difficulty: Optional[int] = Query(None, ge=0),
+    max_difficulty: Optional[int] = Query(None, ge=0),
+    completion_status: Optional[CompletionStatus] = Query(None, alias="status"),
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> ProblemFilters:
+    """
+    Query parameters shared by the list and facet endpoints.
+
+    The token is only verified for a status filter, so clients that send a
+    stale token with every request can still read the public catalog.
+    """
+    current_user = None
+    if completion_status is not None:
+        current_user = await get_optional_user(token=token, db=db)
+    return build_filters(subject, min_difficulty, max_difficulty, completion_status, current_user)
+
+@router.get("/", response_model=List[ProblemSummary])
+def read_problems(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
+    filters: ProblemFilters = Depends(problem_filters),
+    db: Session = Depends(get_db)
+):
+    """
+    List problem summaries ordered by id; `GET /problems/{id}` has the full
+    problem with steps, hints and prerequisites.
+
+    - **cursor**: Opaque cursor taken from the `X-Next-Cursor` or
+      `X-Prev-Cursor` header of a previous page; repeat the same filters
+    - **limit**: Max number of problems to return
+    - **skip**: Offset-based paging, kept for existing clients
+    - **subject**, **min_difficulty**, **max_difficulty**: Catalog filters
+    - **status**: `completed`, `in_progress` or `not_started` for the
+      signed-in user
+
+    Responses carry an ETag; send it back in `If-None-Match` to get a 304
+    while the catalog is unchanged.
+    """
+    # Completion filters depend on the user's progress, which does not
+    # invalidate the catalog cache
+    cache_key = None if filters.status else f"list:{cursor}:{skip}:{limit}:{filters.cache_key()}"
+    entry, version = problem_cache.get(cache_key)
+    if entry is None:
+        headers = {}
+        if cursor is None and skip:
+            problems = get_problems(
+                db, skip=skip, limit=limit, prerequisite_depth=None,
+                filters=filters
+            )
+        else:
+            try:
+                page = get_problems_page(
+                    db, cursor=cursor, limit=limit, prerequisite_depth=None,
+                    filters=filters
+                )
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor"
+                )
+            problems = page.items
+            if page.next_cursor:
+                headers["X-Next-Cursor"] = page.next_cursor
+            if page.prev_cursor:
+                headers["X-Prev-Cursor"] = page.prev_cursor
+        entry = problem_cache.set(cache_key, version, serialize_problem_summaries(problems), headers)
+    return cached_json_response(request, entry)
+
+@router.get("/facets", response_model=ProblemFacets)
+def read_problem_facets(
+    request: Request,
+    filters: ProblemFilters = Depends(problem_filters),
+    db: Session = Depends(get_db)
+):
+    """
+    Count problems per subject and per difficulty, after applying the same
+    filters as the list endpoint.
+    """
+    cache_key = None if filters.status else f"facets:{filters.cache_key()}"
+    entry, version = problem_cache.get(cache_key)
+    if entry is None:
+        facets = get_problem_facets(db, filters)
+        entry = problem_cache.set(cache_key, version, facets.model_dump_json().encode())
+    return cached_json_response(request, entry)
+
+@router.get("/search", response_model=List[ProblemSearchHit])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(SEARCH_LIMIT, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search across problem titles, descriptions, steps and hints.
+
+    Every word must match and the last one may be a prefix. Results are
+    ranked best first; title matches weigh most, then the description.
+    """
+    return model_response(List[ProblemSearchHit], search_problems(db, q, limit=limit))
+
+@router.get("/export", response_class=StreamingResponse)
+def export_problems(db: Session = Depends(get_db)):
+    """
+    Stream every problem with its steps, hints and prerequisites as NDJSON.
+
+    Each line is a bulk import record whose `ref` is the problem id, so the
+    file can be uploaded to `POST /problems/bulk` to restore or seed a
+    catalog.
+    """
+    return StreamingResponse(
+        iter_problem_export(db),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="problems.ndjson"'},
+    )
+
+@router.get("/recommended", response_model=Recommendations)
+def read_recommended_problems(
+    limit: int = Query(5, ge=1, le=50),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Suggest what to try next: problems whose prerequisites the user has all
+    completed, closest in difficulty to their estimated skill.
+    """
+    return model_response(Recommendations, get_recommendations(db, current_user.id, limit))
 
 @router.get("/{problem_id}", response_model=Problem)
-def read_problem(problem_id: int, db: Session = Depends(get_db)):
-    db_problem = get_problem(db, problem_id=problem_id)
-    if db_problem is None:
+def read_problem(request: Request, problem_id: int, db: Session = Depends(get_db)):
+    cache_key = f"detail:{problem_id}"
+    entry, version = problem_cache.get(cache_key)
+    if entry is None:
+        db_problem = get_problem(
+            db, problem_id=problem_id, prerequisite_depth=DETAIL_PREREQUISITE_DEPTH
+        )
+        if db_problem is None:
+            raise HTTPException(status_code=404, detail="Problem not found")
+        entry = problem_cache.set(cache_key, version, serialize_problem(db_problem))
+    return cached_json_response(request, entry)
+
+@router.get("/{problem_id}/learning-path", response_model=LearningPath)
+def read_learning_path(problem_id: int, db: Session = Depends(get_db)):
+    """
+    List every prerequisite of a problem, direct or transitive, in an order
+    that can be studied front to back. The problem itself comes last.
+    """
+    problems = get_learning_path(db, problem_id)
+    if problems is None:
         raise HTTPException(status_code=404, detail="Problem not found")
-    return db_problem
+    return model_response(LearningPath, LearningPath(problem_id=problem_id, problems=problems))
 
 @router.post("/", response_model=Problem, status_code=status.HTTP_201_CREATED)
 def create_new_problem(problem: ProblemCreate, db: Session = Depends(get_db)):
-    return create_problem(db=db, problem=problem)
+    return model_response(
+        Problem, create_problem(db=db, problem=problem), status.HTTP_201_CREATED
+    )
+
+@router.post("/bulk", response_model=BulkImportResult, status_code=status.HTTP_201_CREATED)
+def import_problem_file(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """
+    Bulk import problems from a JSON array or NDJSON file.
+
+    Each record is a problem with its steps and hints. Records may set a
+    `ref` and list other records' refs in `prerequisite_refs`; existing
+    problems are referenced with `prerequisite_ids`. The whole file is
+    imported in one transaction.
+    """
+    try:
+        result = import_problems(db, iter_json_records(file.file))
+    except BulkImportError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return model_response(BulkImportResult, result, status.HTTP_201_CREATED)
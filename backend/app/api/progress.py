@@ -0,0 +1,64 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.auth import get_current_user
+from app.core.responses import model_response
+from app.db.models import Problem
+from app.db.session import get_db
+from app.schemas.progress import Progress, ProgressSummary, ProgressUpdate
+from app.schemas.user import User
+from app.services.prerequisite_graph import get_prerequisite_graph
+from app.services.progress_service import (
+    get_progress, get_progress_summary, get_user_progress, record_progress
+)
+
+router = APIRouter(prefix="/progress", tags=["progress"])
+
+@router.get("/", response_model=List[Progress])
+def read_user_progress(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the current user's progress on every problem they have started."""
+    return model_response(List[Progress], get_user_progress(db, current_user.id))
+
+@router.get("/summary", response_model=ProgressSummary)
+def read_progress_summary(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Dashboard totals: problems started and completed per subject, average
+    hints used and the completion streak, from maintained aggregates.
+    """
+    return model_response(ProgressSummary, get_progress_summary(db, current_user.id))
+
+@router.get("/{problem_id}", response_model=Progress)
+def read_problem_progress(
+    problem_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    progress = get_progress(db, current_user.id, problem_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Progress not found")
+    return model_response(Progress, progress)
+
+@router.put("/{problem_id}", response_model=Progress)
+def update_progress(
+    problem_id: int,
+    update: ProgressUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Record a step or hint event for a problem.
+
+    Events are coalesced and written in batches, so the response reflects
+    the new state before it is stored. Completing a problem is written
+    before the response is sent.
+    """
+    if problem_id not in get_prerequisite_graph(db) and db.get(Problem, problem_id) is None:
+        raise HTTPException(status_code=404, detail="Problem not found")
+    return model_response(Progress, record_progress(db, current_user.id, problem_id, update))
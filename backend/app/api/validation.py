@@ -0,0 +1,34 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.responses import model_response
+from app.db.session import get_db
+from app.schemas.validation import AnswerSubmission, BatchValidationRequest, ValidationResult
+from app.services.validation_service import validate_answer, validate_answers
+
+router = APIRouter(prefix="/validation", tags=["validation"])
+
+@router.post("/batch", response_model=List[ValidationResult])
+def validate_batch(request: BatchValidationRequest, db: Session = Depends(get_db)):
+    """
+    Check several answers at once, e.g. a worksheet or an offline session.
+
+    Results are in submission order; any unknown problem fails the batch.
+    """
+    results = validate_answers(db, request.answers)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Problem not found")
+    return model_response(List[ValidationResult], results)
+
+@router.post("/{problem_id}", response_model=ValidationResult)
+def validate_problem_answer(
+    problem_id: int,
+    submission: AnswerSubmission,
+    db: Session = Depends(get_db)
+):
+    """Check an answer against a problem's solution without revealing it."""
+    result = validate_answer(db, problem_id, submission.answer)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Problem not found")
+    return model_response(ValidationResult, result)
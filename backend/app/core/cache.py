@@ -0,0 +1,169 @@
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """
+    Storage interface for `ResponseCache`.
+
+    The in-process LRU is the default; a shared backend (e.g. Redis) can be
+    plugged in so every worker sees the same entries and invalidations.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value, expiring it after `ttl` seconds when given."""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Atomically increment an integer counter, starting from 0."""
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+
+class LRUCacheBackend(CacheBackend):
+    """Thread-safe in-process LRU cache; expired entries are dropped when read."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # Values with their monotonic expiry time, or None
+        self._entries: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        # Counters live outside the LRU so they are never evicted
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    headers: Dict[str, str]
+
+
+class ResponseCache:
+    """
+    Versioned read-through cache of serialized JSON responses.
+
+    Keys are prefixed with a namespace version; `invalidate` bumps the
+    version so every existing entry becomes unreachable at once and ages out
+    of the backend. Entries also expire after `ttl` seconds, which bounds
+    how long workers that did not see an invalidation serve old responses.
+    """
+
+    def __init__(self, namespace: str, backend: CacheBackend, ttl: Optional[float] = None):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    def _key(self, key: str, version: int) -> str:
+        return f"{self.namespace}:v{version}:{key}"
+
+    def get(self, key: Optional[str]) -> Tuple[Optional[CachedResponse], int]:
+        """
+        Look up an entry; returns it with the namespace version it was read at.
+
+        Pass the version to `set` on a miss, so a response built by a query
+        that raced an `invalidate` is stored under the old version, where
+        nothing reads it.
+        """
+        if key is None:
+            return None, 0
+        version = self.backend.get(self._version_key) or 0
+        return self.backend.get(self._key(key, version)), version
+
+    def set(
+        self,
+        key: Optional[str],
+        version: int,
+        body: bytes,
+        headers: Optional[Dict[str, str]] = None
+    ) -> CachedResponse:
+        """Store a response; a None key builds the entry without storing it."""
+        entry = CachedResponse(body, make_etag(body), headers or {})
+        if key is not None:
+            self.backend.set(self._key(key, version), entry, self.ttl)
+        return entry
+
+    def invalidate(self):
+        self.backend.incr(self._version_key)
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [
+        tag[2:] if tag.startswith("W/") else tag for tag in candidates
+    ]
+
+
+def cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    """Serve a cached entry, answering 304 when the client's copy is current."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", **entry.headers}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+# Serialized problem reads, invalidated whenever problems are written
+problem_cache = ResponseCache(
+    "problems",
+    LRUCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES),
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
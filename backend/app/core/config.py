@@ -7,9 +7,85 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = Field(default="supersecretkey")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+
+    # Password hashing scheme for new hashes: "bcrypt", or "argon2" with
+    # argon2-cffi installed. Older hashes are upgraded on the next login.
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    # Raise the bcrypt cost at startup while a verify stays under this many
+    # milliseconds on this machine (0 keeps PASSWORD_BCRYPT_ROUNDS)
+    PASSWORD_HASH_TARGET_MS: int = 0
+
+    # Password hashing pool (0 workers hashes inline on the request thread)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 8
+    PASSWORD_HASH_RETRY_AFTER: int = 1  # seconds
+
+    # Login and registration attempts allowed per window (0 disables a limit).
+    # Usernames are limited across all IPs, so distributed guessing of one
+    # account is capped too.
+    LOGIN_RATE_LIMIT_PER_IP: int = 30
+    LOGIN_RATE_LIMIT_PER_USERNAME: int = 10
+    REGISTER_RATE_LIMIT_PER_IP: int = 10
+    RATE_LIMIT_WINDOW_SECONDS: int = 60
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    # Per-IP limits key on the socket peer unless it is one of these proxy
+    # addresses or CIDRs, e.g. '["172.16.0.0/12"]' behind the compose
+    # network's reverse proxy; then the client is the rightmost
+    # X-Forwarded-For entry that is not itself a trusted proxy. Leave empty
+    # when clients connect directly, or anyone can pick their own key.
+    TRUSTED_PROXIES: List[str] = []
+
+    # Verified-token cache used by get_current_user (0 entries disables it)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_MAX_TTL_SECONDS: int = 300
+
+    # Progress events are coalesced in memory and written in batches. Buffered
+    # events are lost if the process dies within one interval; completions are
+    # always written before the request returns. 0 writes every event through.
+    PROGRESS_FLUSH_INTERVAL_SECONDS: float = 2.0
+    PROGRESS_MAX_PENDING: int = 1000  # flush early once this many entries wait
+
+    # Serialized problem responses kept in the in-process cache (0 disables it)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    # Invalidations only reach the worker that wrote; other workers' entries
+    # expire after this many seconds (0 keeps them until evicted)
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
     
+    # Seconds between reloads of the in-memory leaderboards, which pick up
+    # completions made by other workers (0 never reloads)
+    LEADERBOARD_REFRESH_SECONDS: float = 60.0
+
+    # Next-problem recommendations: users whose unlocked-problem frontier is
+    # kept in memory, candidates kept per user, and seconds before a user's
+    # state is reloaded to include progress written by other workers
+    RECOMMENDATION_MAX_USERS: int = 10000
+    RECOMMENDATION_FRONTIER_SIZE: int = 100
+    RECOMMENDATION_STATE_TTL_SECONDS: float = 300.0
+
+    # Compiled answer matchers kept per problem (0 compiles on every request),
+    # and the relative tolerance numeric answers are compared with by default
+    VALIDATION_MATCHER_CACHE_SIZE: int = 10000
+    VALIDATION_REL_TOLERANCE: float = 1e-6
+
+    # Request, SQL and password-hashing metrics served at /api/v1/metrics
+    METRICS_ENABLED: bool = True
+
     # Database settings - Using SQLite for development
     SQLALCHEMY_DATABASE_URI: str = "sqlite:///./learnbydoing.db"
+    # Serve requests from the AsyncSession stack (aiosqlite / asyncpg)
+    DATABASE_ASYNC: bool = False
+
+    # Connection pool (server databases and file-backed SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 3600  # seconds
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # Postgres statement_timeout, 0 disables it
+
+    # SQLite tuning
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
     
     # CORS settings
     BACKEND_CORS_ORIGINS: List[str] = [
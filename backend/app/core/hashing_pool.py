@@ -0,0 +1,72 @@
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing pool has no free slot for another request."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing pool is saturated")
+        self.retry_after = retry_after
+
+
+class PasswordHashingPool:
+    """
+    Size-capped process pool for password hashing.
+
+    Hashing runs in worker processes so bcrypt never competes with request
+    handling for the GIL. At most `max_workers + max_pending` calls may be
+    running or queued at once; further calls fail fast with
+    `PasswordHashingBusy` instead of piling up on request threads.
+    With `max_workers=0` the work runs inline on the calling thread.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, retry_after: int = 1):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max(max_workers, 1) + max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    # Forking a threaded server is unsafe; start clean interpreters.
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def run(self, fn: Callable, *args):
+        """Run `fn(*args)` in the pool and wait for its result."""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusy(self.retry_after)
+        try:
+            if self.max_workers == 0:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    async def run_async(self, fn: Callable, *args):
+        """Like `run`, but awaits the result without holding a thread."""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusy(self.retry_after)
+        try:
+            if self.max_workers == 0:
+                return await asyncio.to_thread(fn, *args)
+            return await asyncio.wrap_future(self._get_executor().submit(fn, *args))
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        """Stop the worker processes; they are restarted on next use."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
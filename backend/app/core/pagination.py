@@ -0,0 +1,33 @@
+import base64
+import json
+
+CURSOR_NEXT = "next"
+CURSOR_PREV = "prev"
+
+# Keyset values are bound as 64-bit SQL integers
+KEY_MIN = -(2 ** 63)
+KEY_MAX = 2 ** 63 - 1
+
+def encode_cursor(key: dict, direction: str) -> str:
+    """Encode a keyset position into an opaque, URL-safe cursor."""
+    raw = json.dumps({"k": key, "d": direction}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor into its keyset position and direction.
+
+    Raises ValueError if the cursor was not produced by `encode_cursor`.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, direction = data["k"], data["d"]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(key, dict) or direction not in (CURSOR_NEXT, CURSOR_PREV):
+        raise ValueError("Invalid cursor")
+    for value in key.values():
+        # bool is an int subclass; out-of-range ints overflow the driver
+        if isinstance(value, bool) or (isinstance(value, int) and not KEY_MIN <= value <= KEY_MAX):
+            raise ValueError("Invalid cursor")
+    return key, direction
@@ -0,0 +1,151 @@
+import ipaddress
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+rate_limit_checks = registry.counter(
+    "rate_limit_checks_total", "Rate limiter decisions by limiter and outcome",
+    ("limiter", "outcome"),
+)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a caller has used up its request budget."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Too many requests")
+        self.retry_after = retry_after
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage interface for `RateLimiter`.
+
+    The in-process token buckets are the default; a shared backend (e.g.
+    Redis with a Lua script) can be plugged in so every worker draws from
+    the same budget.
+    """
+
+    @abstractmethod
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """
+        Atomically take one token from a key's bucket.
+
+        Returns 0 when a token was taken, otherwise the seconds until the
+        next token is available.
+        """
+
+    @abstractmethod
+    def clear(self):
+        ...
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Thread-safe token buckets, least recently used keys evicted first."""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> (tokens left, time of last refill)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, refill_per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / refill_per_second
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class RateLimiter:
+    """
+    Token bucket limiter allowing `limit` requests per `window` seconds.
+
+    Budgets refill continuously, so a caller that stops for a while gets
+    its full burst back. A limit of 0 disables the limiter.
+    """
+
+    def __init__(self, name: str, limit: int, window: float, backend: RateLimitBackend):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.backend = backend
+
+    def check(self, key: Optional[str]):
+        """
+        Count one request against `key`, e.g. a client IP or a username.
+
+        Raises `RateLimitExceeded` once the key is over its budget; a None
+        key is not limited.
+        """
+        if self.limit <= 0 or key is None:
+            return
+        wait = self.backend.take(f"{self.name}:{key}", self.limit, self.limit / self.window)
+        if wait:
+            rate_limit_checks.inc(limiter=self.name, outcome="rejected")
+            raise RateLimitExceeded(max(1, math.ceil(wait)))
+        rate_limit_checks.inc(limiter=self.name, outcome="allowed")
+
+
+def client_address(peer: Optional[str], forwarded_for: Optional[str], trusted: List) -> Optional[str]:
+    """
+    The address to rate limit a request by.
+
+    `X-Forwarded-For` is only read when the peer is a trusted proxy, and
+    only from the right: each trusted proxy appends the address it saw, so
+    the first untrusted entry is the client and anything left of it may be
+    forged.
+    """
+    if not _is_trusted(peer, trusted) or not forwarded_for:
+        return peer
+    hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted):
+            return hop
+    return hops[0] if hops else peer
+
+
+def _is_trusted(address: Optional[str], trusted: List) -> bool:
+    if address is None or not trusted:
+        return False
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+
+trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES]
+
+# Login and registration limits, checked before any database or bcrypt work
+rate_limit_backend = InMemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+login_ip_limiter = RateLimiter(
+    "login_ip", settings.LOGIN_RATE_LIMIT_PER_IP,
+    settings.RATE_LIMIT_WINDOW_SECONDS, rate_limit_backend,
+)
+login_username_limiter = RateLimiter(
+    "login_username", settings.LOGIN_RATE_LIMIT_PER_USERNAME,
+    settings.RATE_LIMIT_WINDOW_SECONDS, rate_limit_backend,
+)
+register_ip_limiter = RateLimiter(
+    "register_ip", settings.REGISTER_RATE_LIMIT_PER_IP,
+    settings.RATE_LIMIT_WINDOW_SECONDS, rate_limit_backend,
+)
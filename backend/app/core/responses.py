@@ -0,0 +1,55 @@
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the stdlib encoder
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when it is installed.
+
+    Pydantic models are dumped by pydantic-core and bytes are sent as they
+    are, so pre-serialized bodies are never decoded and encoded again.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type: Any) -> TypeAdapter:
+    """Build (once per type) the adapter used to serialize a response model."""
+    return TypeAdapter(response_type)
+
+
+def model_response(
+    response_type: Any,
+    value: Any,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Serialize ORM objects or models straight to a JSON response.
+
+    Returning a Response makes FastAPI skip its own response_model
+    validation and `jsonable_encoder` pass; the value is validated once from
+    attributes and dumped by pydantic-core. Keep `response_model` on the
+    route for the OpenAPI schema.
+    """
+    adapter = type_adapter(response_type)
+    body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return Response(
+        content=body, status_code=status_code, headers=headers, media_type="application/json"
+    )
@@ -1,19 +1,177 @@
+import logging
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.hashing_pool import PasswordHashingPool
+from app.core.metrics import password_hash_duration
+from app.core.token_cache import TokenCache
 
-# Password hashing configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# passlib accepts 4-31; below 10 is too weak for production hashes
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+
+class PasswordPolicy(NamedTuple):
+    """
+    Scheme and cost for new hashes.
+
+    Hashing workers import this module with the configured policy, so the
+    current one is passed to them by value and calibration applies there too.
+    """
+    scheme: str = "bcrypt"
+    bcrypt_rounds: int = 12
+
+@lru_cache(maxsize=None)
+def crypt_context(policy: PasswordPolicy) -> CryptContext:
+    """
+    Build the passlib context for a policy.
+
+    Hashes in another scheme, or bcrypt hashes below the configured rounds,
+    still verify but are flagged for rehashing. Hashes with more rounds are
+    kept, so a lower calibrated cost never weakens existing hashes.
+    """
+    schemes = [policy.scheme] + [scheme for scheme in ("bcrypt",) if scheme != policy.scheme]
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        # Not `bcrypt__rounds`, which also caps the rounds and so would flag
+        # stronger hashes for rehashing
+        bcrypt__default_rounds=policy.bcrypt_rounds,
+        bcrypt__min_rounds=policy.bcrypt_rounds,
+    )
+
+# Password hashing configuration; `calibrate_password_policy` may raise the
+# bcrypt cost at startup
+password_policy = PasswordPolicy(settings.PASSWORD_HASH_SCHEME, settings.PASSWORD_BCRYPT_ROUNDS)
+pwd_context = crypt_context(password_policy)
+
+# Bcrypt is CPU-bound, so it runs in a separate, bounded process pool
+hashing_pool = PasswordHashingPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER,
+)
+
+# Verified tokens and user snapshots, so repeat requests skip JWT decoding
+token_cache = TokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    max_ttl=settings.TOKEN_CACHE_MAX_TTL_SECONDS,
+)
+
+def _verify_password(
+    plain_password: str,
+    hashed_password: str,
+    policy: Optional[PasswordPolicy] = None
+) -> bool:
+    return crypt_context(policy or password_policy).verify(plain_password, hashed_password)
+
+def _verify_and_update(
+    plain_password: str,
+    hashed_password: str,
+    policy: Optional[PasswordPolicy] = None
+) -> Tuple[bool, Optional[str]]:
+    return crypt_context(policy or password_policy).verify_and_update(
+        plain_password, hashed_password
+    )
+
+def _hash_password(password: str, policy: Optional[PasswordPolicy] = None) -> str:
+    return crypt_context(policy or password_policy).hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    with password_hash_duration.time(operation="verify"):
+        return hashing_pool.run(_verify_password, plain_password, hashed_password, password_policy)
+
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its hash is outdated.
+
+    Returns whether the password matched and, if the stored hash uses an old
+    scheme or a lower cost than the current policy, its replacement.
+    """
+    with password_hash_duration.time(operation="verify"):
+        return hashing_pool.run(
+            _verify_and_update, plain_password, hashed_password, password_policy
+        )
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    return pwd_context.hash(password)
+    with password_hash_duration.time(operation="hash"):
+        return hashing_pool.run(_hash_password, password, password_policy)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop."""
+    with password_hash_duration.time(operation="verify"):
+        return await hashing_pool.run_async(
+            _verify_password, plain_password, hashed_password, password_policy
+        )
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Like `verify_and_update_password`, without blocking the event loop."""
+    with password_hash_duration.time(operation="verify"):
+        return await hashing_pool.run_async(
+            _verify_and_update, plain_password, hashed_password, password_policy
+        )
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash without blocking the event loop."""
+    with password_hash_duration.time(operation="hash"):
+        return await hashing_pool.run_async(_hash_password, password, password_policy)
+
+def time_bcrypt(rounds: int, samples: int = 3) -> float:
+    """Fastest of `samples` bcrypt hashes at a cost, in seconds."""
+    context = crypt_context(PasswordPolicy("bcrypt", rounds))
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def calibrate_bcrypt_rounds(
+    target_ms: float,
+    min_rounds: int = BCRYPT_MIN_ROUNDS,
+    max_rounds: int = BCRYPT_MAX_ROUNDS
+) -> int:
+    """
+    Pick the highest bcrypt cost whose verify time stays within `target_ms`.
+
+    Each extra round doubles the work, so one measurement at `min_rounds`
+    predicts the others. Never returns less than `min_rounds`.
+    """
+    seconds = time_bcrypt(min_rounds)
+    rounds = min_rounds
+    while rounds < max_rounds and seconds * 2 * 1000 <= target_ms:
+        rounds += 1
+        seconds *= 2
+    return rounds
+
+def calibrate_password_policy():
+    """Set the bcrypt cost from PASSWORD_HASH_TARGET_MS, if configured."""
+    global password_policy, pwd_context
+    if settings.PASSWORD_HASH_TARGET_MS <= 0:
+        return
+    rounds = calibrate_bcrypt_rounds(
+        settings.PASSWORD_HASH_TARGET_MS,
+        min_rounds=max(BCRYPT_MIN_ROUNDS, settings.PASSWORD_BCRYPT_ROUNDS),
+    )
+    password_policy = password_policy._replace(bcrypt_rounds=rounds)
+    pwd_context = crypt_context(password_policy)
+    logger.info(
+        "Calibrated bcrypt to %d rounds for a %d ms verify target",
+        rounds, settings.PASSWORD_HASH_TARGET_MS,
+    )
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
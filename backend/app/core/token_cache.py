@@ -0,0 +1,87 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Set
+
+
+class CachedToken(NamedTuple):
+    expires_at: float
+    claims: dict
+    user: Any
+
+
+class TokenCache:
+    """
+    In-process LRU cache of verified access tokens.
+
+    Entries are keyed by a SHA-256 of the token, so raw tokens are never held,
+    and live until the token's `exp` claim or `max_ttl` seconds, whichever
+    comes first. `max_ttl` bounds how long another process may serve a
+    snapshot after this one invalidated it.
+    """
+
+    def __init__(self, max_entries: int, max_ttl: int):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, CachedToken]" = OrderedDict()
+        self._keys_by_username: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        """Return the cached entry for a token, or None if absent or expired."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, token: str, claims: dict, user: Any):
+        """Cache verified claims and a user snapshot for a token."""
+        if self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.max_ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]))
+        key = self._key(token)
+        username = claims.get("sub")
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = CachedToken(expires_at, claims, user)
+            self._keys_by_username.setdefault(username, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, username: Optional[str]):
+        """Drop every cached token belonging to a user."""
+        with self._lock:
+            for key in list(self._keys_by_username.get(username, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_username.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        username = entry.claims.get("sub")
+        keys = self._keys_by_username.get(username)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_username[username]
@@ -0,0 +1,126 @@
+"""
+Database management commands.
+
+Usage (from the backend directory):
+    python -m app.db init
+    python -m app.db import-problems problems.ndjson [--batch-size 500]
+    python -m app.db export-problems problems.ndjson [--batch-size 500]
+    python -m app.db reindex-search
+    python -m app.db rebuild-progress-summary [--check]
+"""
+
+import argparse
+import sys
+
+from app.db.init_db import SchemaUpgradeError, init_db
+from app.db.session import SessionLocal
+from app.services.export_service import EXPORT_BATCH_SIZE, iter_problem_export
+from app.services.import_service import (
+    IMPORT_BATCH_SIZE,
+    BulkImportError,
+    import_problems,
+    iter_json_records
+)
+from app.services.progress_service import check_progress_summaries, rebuild_progress_summaries
+from app.services.search_service import rebuild_search_index
+
+def import_problems_command(args) -> int:
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as stream:
+            result = import_problems(db, iter_json_records(stream), batch_size=args.batch_size)
+    except BulkImportError as exc:
+        print(f"Import failed, nothing was written: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    print(f"Imported {result.created} problems from {args.path}")
+    return 0
+
+def export_problems_command(args) -> int:
+    db = SessionLocal()
+    exported = 0
+    try:
+        with open(args.path, "wb") as stream:
+            for chunk in iter_problem_export(db, batch_size=args.batch_size):
+                stream.write(chunk)
+                exported += chunk.count(b"\n")
+    finally:
+        db.close()
+    print(f"Exported {exported} problems to {args.path}")
+    return 0
+
+def reindex_search_command(args) -> int:
+    db = SessionLocal()
+    try:
+        indexed = rebuild_search_index(db)
+    finally:
+        db.close()
+    print(f"Indexed {indexed} problems for search")
+    return 0
+
+def rebuild_progress_summary_command(args) -> int:
+    db = SessionLocal()
+    try:
+        if args.check:
+            differences = check_progress_summaries(db)
+            for difference in differences:
+                print(difference)
+            print(f"{len(differences)} dashboard aggregates differ from user_progress")
+            return 1 if differences else 0
+        rebuilt = rebuild_progress_summaries(db)
+    finally:
+        db.close()
+    print(f"Rebuilt dashboard aggregates for {rebuilt} user subjects")
+    return 0
+
+def init_command(args) -> int:
+    try:
+        init_db()
+    except SchemaUpgradeError as exc:
+        print(f"Upgrade stopped: {exc}", file=sys.stderr)
+        return 1
+    print("Database tables created and upgraded")
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.db", description="Database management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init_parser = commands.add_parser("init", help="create missing tables and upgrade existing ones")
+    init_parser.set_defaults(handler=init_command)
+
+    import_parser = commands.add_parser(
+        "import-problems", help="bulk import problems from a JSON or NDJSON file"
+    )
+    import_parser.add_argument("path", help="JSON array or NDJSON file of problems")
+    import_parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    import_parser.set_defaults(handler=import_problems_command)
+
+    export_parser = commands.add_parser(
+        "export-problems", help="export every problem to an NDJSON file"
+    )
+    export_parser.add_argument("path", help="NDJSON file to write")
+    export_parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    export_parser.set_defaults(handler=export_problems_command)
+
+    reindex_parser = commands.add_parser(
+        "reindex-search", help="rebuild the full-text search index from the problem tables"
+    )
+    reindex_parser.set_defaults(handler=reindex_search_command)
+
+    summary_parser = commands.add_parser(
+        "rebuild-progress-summary",
+        help="recompute the dashboard aggregates from user_progress",
+    )
+    summary_parser.add_argument(
+        "--check", action="store_true",
+        help="only report aggregates that differ, exiting 1 if any do",
+    )
+    summary_parser.set_defaults(handler=rebuild_progress_summary_command)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.session import configure_sqlite, engine_options, instrument_engine
+
+# Async drivers for the sync URLs used elsewhere in the app
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def get_async_database_uri(uri: str) -> str:
+    """Translate a sync database URI to the matching async driver."""
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+# Create async database engine mirroring the sync engine settings
+ASYNC_SQLALCHEMY_DATABASE_URI = get_async_database_uri(settings.SQLALCHEMY_DATABASE_URI)
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URI,
+    **engine_options(ASYNC_SQLALCHEMY_DATABASE_URI, use_async=True)
+)
+configure_sqlite(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine)
+
+# Create async session factory; objects stay usable after commit so
+# responses can be serialized without awaiting a refresh
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+async def get_async_db():
+    """
+    Dependency to get an AsyncSession.
+    Yields a database session and ensures it is closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,9 +1,90 @@
+from typing import Dict, List
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateIndex
 from app.db.session import engine
 from app.db.models import Base
 
+def create_index(connection: Connection, table: str, name: str):
+    """Create a model-declared index unless it already exists."""
+    [index] = [index for index in Base.metadata.tables[table].indexes if index.name == name]
+    connection.execute(CreateIndex(index, if_not_exists=True))
+
+class SchemaUpgradeError(Exception):
+    """Raised when existing data must be fixed by hand before an upgrade."""
+
+def case_insensitive_duplicates(connection: Connection, column: str) -> Dict[str, List[int]]:
+    """Ids of users sharing a value of `column` once lowercased, by value."""
+    rows = connection.execute(text(
+        f"SELECT lower({column}), id FROM users WHERE lower({column}) IN "
+        f"(SELECT lower({column}) FROM users GROUP BY lower({column}) HAVING COUNT(*) > 1) "
+        f"ORDER BY lower({column}), id"
+    ))
+    duplicates: Dict[str, List[int]] = {}
+    for value, user_id in rows:
+        duplicates.setdefault(value, []).append(user_id)
+    return duplicates
+
+def upgrade_users(connection: Connection):
+    """
+    Replace the per-column unique indexes with the case-insensitive ones.
+
+    Accounts that differ only in case cannot be merged automatically, so
+    they are listed and the upgrade stops until they are renamed or merged.
+    """
+    conflicts = [
+        f"  {column} {value!r}: user ids {', '.join(map(str, ids))}"
+        for column in ("email", "username")
+        for value, ids in case_insensitive_duplicates(connection, column).items()
+    ]
+    if conflicts:
+        raise SchemaUpgradeError(
+            "Users whose email or username differ only in case:\n"
+            + "\n".join(conflicts)
+            + "\nRename or merge these accounts, e.g. "
+            "UPDATE users SET email = '...' WHERE id = ..., then run init again."
+        )
+    create_index(connection, "users", "uq_users_email_lower")
+    create_index(connection, "users", "uq_users_username_lower")
+    connection.execute(text("DROP INDEX IF EXISTS ix_users_email"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_users_username"))
+
+def upgrade_user_progress(connection: Connection):
+    """
+    Add the one-row-per-user-and-problem index progress upserts rely on,
+    keeping the latest row of any duplicates, and the completed_at column.
+    """
+    connection.execute(text(
+        "DELETE FROM user_progress WHERE id NOT IN "
+        "(SELECT MAX(id) FROM user_progress GROUP BY user_id, problem_id)"
+    ))
+    create_index(connection, "user_progress", "uq_user_progress_user_problem")
+    columns = {column["name"] for column in inspect(connection).get_columns("user_progress")}
+    if "completed_at" not in columns:
+        column_type = Base.metadata.tables["user_progress"].c.completed_at.type
+        connection.execute(text(
+            "ALTER TABLE user_progress ADD COLUMN completed_at "
+            + column_type.compile(dialect=connection.dialect)
+        ))
+
+# `create_all` creates missing tables but never changes existing ones, so
+# databases created by earlier versions are brought up to date by these
+# steps, in order. Each must be safe to run again on an up-to-date database.
+UPGRADE_STEPS = [
+    upgrade_users,
+    upgrade_user_progress,
+]
+
+def upgrade_db(bind: Engine = engine):
+    """Apply the schema upgrade steps in one transaction."""
+    with bind.begin() as connection:
+        for step in UPGRADE_STEPS:
+            step(connection)
+
 def init_db():
     """Initialize the database with all required tables."""
     Base.metadata.create_all(bind=engine)
+    upgrade_db(engine)
 
 if __name__ == "__main__":
     init_db()
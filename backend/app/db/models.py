@@ -1,5 +1,5 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, Float, Table
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import DDL, Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, String, Text, Float, Table, event, func
+from sqlalchemy.orm import relationship, declarative_base, query_expression
 
 Base = declarative_base()
 
@@ -15,14 +15,22 @@ class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True)
-    username = Column(String, unique=True, index=True)
+    email = Column(String)
+    username = Column(String)
     hashed_password = Column(String)
     is_active = Column(Boolean, default=True)
     
     # Relationships
     progress = relationship("UserProgress", back_populates="user")
 
+    __table_args__ = (
+        # Case-insensitive uniqueness. Lookups compare lower() on both sides
+        # so they can use these indexes, and registration relies on them
+        # instead of checking for duplicates before inserting.
+        Index("uq_users_email_lower", func.lower(email), unique=True),
+        Index("uq_users_username_lower", func.lower(username), unique=True),
+    )
+
 class Problem(Base):
     __tablename__ = "problems"
 
@@ -44,11 +52,28 @@ class Problem(Base):
     )
     user_progress = relationship("UserProgress", back_populates="problem")
 
+    # Computed by list queries with with_expression(); None when not requested
+    preview = query_expression()
+    step_count = query_expression()
+
+    @property
+    def prerequisite_ids(self):
+        return [prerequisite.id for prerequisite in self.prerequisites]
+
+    __table_args__ = (
+        # Keyset pagination within a subject: WHERE subject = ? AND id > ? ORDER BY id
+        Index("ix_problems_subject_id", "subject", "id"),
+        # Difficulty-range filters walked in id order
+        Index("ix_problems_difficulty_id", "difficulty", "id"),
+        # Covers the facet GROUP BY and subject + difficulty filters
+        Index("ix_problems_subject_difficulty", "subject", "difficulty"),
+    )
+
 class Step(Base):
     __tablename__ = "steps"
 
     id = Column(Integer, primary_key=True, index=True)
-    problem_id = Column(Integer, ForeignKey("problems.id"))
+    problem_id = Column(Integer, ForeignKey("problems.id"), index=True)
     order = Column(Integer)
     content = Column(Text)
     
@@ -59,7 +84,7 @@ class Hint(Base):
     __tablename__ = "hints"
 
     id = Column(Integer, primary_key=True, index=True)
-    problem_id = Column(Integer, ForeignKey("problems.id"))
+    problem_id = Column(Integer, ForeignKey("problems.id"), index=True)
     order = Column(Integer)
     content = Column(Text)
     
@@ -75,7 +100,57 @@ class UserProgress(Base):
     completed = Column(Boolean, default=False)
     current_step = Column(Integer, default=0)
     hints_used = Column(Integer, default=0)
+    # First completion, UTC; streaks are counted from these dates
+    completed_at = Column(DateTime(timezone=True))
     
     # Relationships
     user = relationship("User", back_populates="progress")
     problem = relationship("Problem", back_populates="user_progress")
+
+    __table_args__ = (
+        # One row per user and problem; progress writes upsert against it
+        Index("uq_user_progress_user_problem", "user_id", "problem_id", unique=True),
+    )
+
+class UserSubjectStats(Base):
+    """
+    Per user and subject totals over `user_progress`, maintained as progress
+    is written so the dashboard never scans a user's history.
+    """
+    __tablename__ = "user_subject_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    subject = Column(String, primary_key=True)
+    started = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    hints_used = Column(Integer, nullable=False, default=0)
+
+class UserStreak(Base):
+    """Consecutive UTC days with at least one completion, per user."""
+    __tablename__ = "user_streaks"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    # Length of the run of days ending at last_completed_on
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_completed_on = Column(Date)
+
+# Full-text search index over problem titles, descriptions, steps and hints.
+# It is kept outside the ORM, as an FTS5 table on SQLite and a tsvector table
+# with a GIN index on Postgres, and maintained by app.services.search_service.
+event.listen(Base.metadata, "after_create", DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS problem_search "
+    "USING fts5(title, description, body, tokenize='porter unicode61')"
+).execute_if(dialect="sqlite"))
+event.listen(Base.metadata, "after_create", DDL(
+    "CREATE TABLE IF NOT EXISTS problem_search ("
+    "problem_id INTEGER PRIMARY KEY REFERENCES problems (id) ON DELETE CASCADE, "
+    "document tsvector NOT NULL)"
+).execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "after_create", DDL(
+    "CREATE INDEX IF NOT EXISTS ix_problem_search_document "
+    "ON problem_search USING gin (document)"
+).execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "before_drop", DDL(
+    "DROP TABLE IF EXISTS problem_search"
+).execute_if(dialect=("sqlite", "postgresql")))
@@ -0,0 +1,90 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """Counters describing how often requests had to wait for a connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+
+    def record_checkout(self, waited: bool, elapsed: float):
+        with self._lock:
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+                self.wait_time_total += elapsed
+                self.wait_time_max = max(self.wait_time_max, elapsed)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "wait_time_total_ms": round(self.wait_time_total * 1000, 3),
+                "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+class InstrumentedPoolMixin:
+    """Records checkout waits and timeouts on top of a QueuePool."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        # A checkout waits when no idle connection exists and the overflow
+        # allowance is used up.
+        waited = (
+            self._pool.qsize() == 0
+            and self._max_overflow > -1
+            and self._overflow >= self._max_overflow
+        )
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        self.stats.record_checkout(waited, time.perf_counter() - start)
+        return record
+
+    def usage(self) -> dict:
+        """Snapshot of pool occupancy and wait counters."""
+        return {
+            "pool_size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeout": self.timeout(),
+            **self.stats.as_dict(),
+        }
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_usage(pool) -> dict:
+    """Describe any pool; non-instrumented pools only report their class."""
+    if isinstance(pool, InstrumentedPoolMixin):
+        return {"class": type(pool).__name__, **pool.usage()}
+    return {"class": type(pool).__name__, "status": pool.status()}
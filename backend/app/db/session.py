@@ -1,15 +1,102 @@
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import db_statement_duration, db_statements
+from app.db.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+
+def is_memory_sqlite(uri: str) -> bool:
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def engine_options(uri: str, use_async: bool = False) -> dict:
+    """Build create_engine keyword arguments for a database URI from settings."""
+    backend = make_url(uri).get_backend_name()
+    options = {
+        "pool_pre_ping": True,  # Enables reconnection on stale connections
+        "echo": False,          # Set to True for SQL query debugging
+    }
+    connect_args = {}
+
+    if backend == "sqlite":
+        # Sessions move between threadpool workers
+        if not use_async:
+            connect_args["check_same_thread"] = False
+    elif backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        if use_async:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+            }
+        else:
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
+    # In-memory SQLite keeps SQLAlchemy's single-connection pools
+    if not is_memory_sqlite(uri):
+        options.update(
+            poolclass=InstrumentedAsyncAdaptedQueuePool if use_async else InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if connect_args:
+        options["connect_args"] = connect_args
+    return options
+
+def configure_sqlite(engine: Engine):
+    """
+    Apply journal mode and busy timeout pragmas to every new SQLite connection.
+    WAL lets readers run alongside a writer, and the busy timeout makes
+    writers wait for the lock instead of failing with "database is locked".
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if not is_memory_sqlite(str(engine.url)):
+                cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        finally:
+            cursor.close()
+
+def instrument_engine(engine: Engine):
+    """Count SQL statements and time spent executing them on every connection."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        # A stack, since statements can nest (e.g. during a flush)
+        conn.info.setdefault("statement_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("statement_start")
+        if starts:
+            db_statement_duration.observe(time.perf_counter() - starts.pop())
+            db_statements.inc()
+
+    @event.listens_for(engine, "handle_error")
+    def drop_timer(exception_context):
+        # Failed statements never reach after_cursor_execute; without this
+        # their start would pair with the next statement on the connection
+        conn = exception_context.connection
+        if conn is not None:
+            starts = conn.info.get("statement_start")
+            if starts:
+                db_statement_duration.observe(time.perf_counter() - starts.pop())
+                db_statements.inc()
 
 # Create database engine with proper connection settings
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,  # Enables reconnection on stale connections
-    pool_recycle=3600,   # Connection recycling for optimal pool management
-    echo=False           # Set to True for SQL query debugging
+    **engine_options(settings.SQLALCHEMY_DATABASE_URI)
 )
+configure_sqlite(engine)
+instrument_engine(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
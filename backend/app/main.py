@@ -1,8 +1,35 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from app.core.config import settings
+from app.core.hashing_pool import PasswordHashingBusy
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, registry, render_gauges
+from app.core.rate_limit import RateLimitExceeded
+from app.core.responses import FastJSONResponse
+from app.core.security import calibrate_password_policy, hashing_pool
+from app.db.pool import pool_usage
+from app.db.session import engine
+from app.services.progress_service import progress_buffer
 
-app = FastAPI(title="Learn By Doing API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    calibrate_password_policy()
+    progress_buffer.start()
+    yield
+    progress_buffer.close()
+    hashing_pool.shutdown()
+    if settings.DATABASE_ASYNC:
+        from app.db.async_session import async_engine
+        await async_engine.dispose()
+
+# Routes returning plain data are rendered with orjson; routes that return
+# model_response() bypass FastAPI's response_model re-validation entirely
+app = FastAPI(
+    title="Learn By Doing API",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 # Configure CORS
 app.add_middleware(
@@ -11,8 +38,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Prev-Cursor"],
 )
 
+# Outermost, so latency covers CORS handling and the full response body
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many attempts, please retry later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Learn By Doing API"}
@@ -21,11 +69,52 @@ async def root():
 async def health_check():
     return {"status": "ok", "message": "Service is running"}
 
+def get_active_engine():
+    """The engine serving requests, sync or async."""
+    if settings.DATABASE_ASYNC:
+        from app.db.async_session import async_engine
+        return async_engine.sync_engine
+    return engine
+
+@app.get("/api/v1/health/db")
+async def database_health_check():
+    """Report connection pool occupancy and checkout wait counters."""
+    active_engine = get_active_engine()
+    return {
+        "status": "ok",
+        "dialect": active_engine.dialect.name,
+        "pool": pool_usage(active_engine.pool),
+    }
+
+@app.get("/api/v1/metrics", include_in_schema=False)
+async def metrics():
+    """Request, SQL and password hashing metrics in Prometheus text format."""
+    body = registry.render() + render_gauges(
+        "db_pool", pool_usage(get_active_engine().pool), "Connection pool usage"
+    )
+    return Response(content=body, media_type=PROMETHEUS_CONTENT_TYPE)
+
+def use_async_routes(router: APIRouter, async_router: APIRouter):
+    """Swap sync endpoints for their async versions, keeping route order.
+
+    Endpoints without an async version stay on the sync stack.
+    """
+    async_routes = {
+        (route.path, frozenset(route.methods)): route for route in async_router.routes
+    }
+    router.routes = [
+        async_routes.get((route.path, frozenset(route.methods)), route)
+        for route in router.routes
+    ]
+
 # Import and include routers
-from app.api import auth, problems
+from app.api import auth, leaderboard, problems, progress, validation
+if settings.DATABASE_ASYNC:
+    from app.api import async_auth, async_problems
+    use_async_routes(auth.router, async_auth.router)
+    use_async_routes(problems.router, async_problems.router)
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(problems.router, prefix=settings.API_V1_STR)
-# Uncomment when implemented
-# from app.api import progress, validation
-# app.include_router(progress.router, prefix=settings.API_V1_STR)
-# app.include_router(validation.router, prefix=settings.API_V1_STR)
+app.include_router(progress.router, prefix=settings.API_V1_STR)
+app.include_router(leaderboard.router, prefix=settings.API_V1_STR)
+app.include_router(validation.router, prefix=settings.API_V1_STR)
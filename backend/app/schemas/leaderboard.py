@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    username: str
+    score: int  # completed problems
+
+class LeaderboardStanding(BaseModel):
+    rank: Optional[int] = None  # None until the user completes a problem
+    score: int = 0
+    players: int = 0
+    around: List[LeaderboardEntry] = []
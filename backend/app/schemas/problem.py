@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing import Dict, List, Optional
 
 class StepBase(BaseModel):
     order: int
@@ -39,6 +39,28 @@ class ProblemCreate(ProblemBase):
     hints: List[HintCreate]
     prerequisite_ids: Optional[List[int]] = []
 
+class ProblemImport(ProblemCreate):
+    """A problem in a bulk import file.
+
+    `ref` is a file-local key other records can list in `prerequisite_refs`,
+    before or after the record that defines it; `prerequisite_ids` refer to
+    problems already in the database.
+    """
+    ref: Optional[str] = None
+    prerequisite_refs: List[str] = []
+
+class ProblemExport(ProblemImport):
+    """A problem in a catalog export, one NDJSON line per problem.
+
+    `ref` is the problem id and `prerequisite_refs` the ids of its
+    prerequisites, so an export loads back through the bulk import.
+    """
+    id: int
+
+class BulkImportResult(BaseModel):
+    created: int
+    ids_by_ref: Dict[str, int] = {}
+
 class Problem(ProblemBase):
     id: int
     steps: List[Step] = []
@@ -49,3 +71,57 @@ class Problem(ProblemBase):
 
 # Avoid circular reference issues
 Problem.model_rebuild()
+
+class ProblemRef(BaseModel):
+    id: int
+    title: str
+    subject: str
+    difficulty: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ProblemSearchHit(ProblemRef):
+    score: float
+
+class ProblemFacets(BaseModel):
+    """Problem counts per subject and per difficulty."""
+    total: int = 0
+    subjects: Dict[str, int] = {}
+    difficulties: Dict[int, int] = {}
+
+class LearningPath(BaseModel):
+    """Prerequisites of a problem in study order, ending with the problem."""
+    problem_id: int
+    problems: List[ProblemRef]
+
+class Recommendations(BaseModel):
+    """Unlocked problems closest to the user's estimated skill, best first."""
+    skill: float
+    problems: List[ProblemRef]
+
+class ProblemSummary(BaseModel):
+    """List-view projection of a problem; the full problem is served by id."""
+    id: int
+    title: str
+    subject: str
+    difficulty: int
+    preview: str = ""
+    step_count: int = 0
+    prerequisite_ids: List[int] = []
+
+    model_config = ConfigDict(from_attributes=True)
+
+ProblemList = TypeAdapter(List[Problem])
+ProblemSummaryList = TypeAdapter(List[ProblemSummary])
+
+def serialize_problem(problem) -> bytes:
+    """Serialize an ORM problem to JSON bytes."""
+    return Problem.model_validate(problem).model_dump_json().encode()
+
+def serialize_problems(problems) -> bytes:
+    """Serialize a list of ORM problems to JSON bytes."""
+    return ProblemList.dump_json(ProblemList.validate_python(problems))
+
+def serialize_problem_summaries(problems) -> bytes:
+    """Serialize ORM problems loaded with summary options to JSON bytes."""
+    return ProblemSummaryList.dump_json(ProblemSummaryList.validate_python(problems))
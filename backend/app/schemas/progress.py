@@ -0,0 +1,36 @@
+from datetime import date
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
+
+class ProgressUpdate(BaseModel):
+    """Fields to change; omitted fields keep their current value."""
+    current_step: Optional[int] = Field(None, ge=0)
+    hints_used: Optional[int] = Field(None, ge=0)
+    completed: Optional[bool] = None
+
+class Progress(BaseModel):
+    user_id: int
+    problem_id: int
+    completed: bool = False
+    current_step: int = 0
+    hints_used: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+class SubjectSummary(BaseModel):
+    subject: str
+    started: int = 0
+    completed: int = 0
+    hints_used: int = 0
+    average_hints: float = 0.0  # per started problem
+
+class ProgressSummary(BaseModel):
+    started: int = 0
+    completed: int = 0
+    hints_used: int = 0
+    average_hints: float = 0.0
+    # Consecutive UTC days with a completion, ending today or yesterday
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_completed_on: Optional[date] = None
+    subjects: List[SubjectSummary] = []
@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+# Longest answer accepted; answers are parsed, so this also bounds parse cost
+MAX_ANSWER_LENGTH = 1000
+MAX_BATCH_SIZE = 100
+
+class AnswerSubmission(BaseModel):
+    answer: str = Field(..., max_length=MAX_ANSWER_LENGTH)
+
+class BatchAnswer(AnswerSubmission):
+    problem_id: int
+
+class BatchValidationRequest(BaseModel):
+    answers: List[BatchAnswer] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+class ValidationResult(BaseModel):
+    problem_id: int
+    correct: bool
@@ -0,0 +1,51 @@
+from typing import Optional
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.security import verify_and_update_password_async, get_password_hash_async
+from app.db.models import User
+from app.services.auth_service import duplicate_user_error, is_duplicate_user, new_user_values
+from app.schemas.user import UserCreate
+
+# Async counterparts of app.services.auth_service for the AsyncSession stack;
+# token creation is pure CPU and is shared with the sync service.
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Get user by email, ignoring case."""
+    return (await db.scalars(
+        select(User).filter(func.lower(User.email) == func.lower(email))
+    )).first()
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+    """Get user by username, ignoring case."""
+    return (await db.scalars(
+        select(User).filter(func.lower(User.username) == func.lower(username))
+    )).first()
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    """Create a new user with a single INSERT ... RETURNING."""
+    hashed_password = await get_password_hash_async(user.password)
+    try:
+        db_user = (await db.scalars(
+            insert(User).returning(User), [new_user_values(user, hashed_password)]
+        )).one()
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if not is_duplicate_user(exc):
+            raise
+        raise duplicate_user_error(await get_user_by_email(db, user.email) is not None)
+    return db_user
+
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+    """Authenticate user by username and password."""
+    user = await get_user_by_username(db, username)
+    if not user:
+        return None
+    valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        await db.commit()
+    return user
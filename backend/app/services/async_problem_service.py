@@ -0,0 +1,104 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import problem_cache
+from app.db.models import Problem, Step, Hint
+from app.schemas.problem import ProblemCreate, ProblemFacets
+from app.services.prerequisite_graph import prerequisite_graph
+from app.services.search_service import index_documents, problem_document
+from app.services.problem_service import (
+    LIST_PREREQUISITE_DEPTH,
+    DETAIL_PREREQUISITE_DEPTH,
+    ProblemFilters,
+    ProblemPage,
+    apply_problem_filters,
+    build_problem_facets,
+    build_problems_page,
+    list_loader_options,
+    problem_facets_statement,
+    problem_loader_options,
+    problems_page_statement
+)
+
+# Async counterparts of app.services.problem_service. Statements and loader
+# options are shared with the sync service; everything a response needs is
+# eager-loaded because lazy loads are not available under AsyncSession.
+
+async def get_problems(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    prerequisite_depth: Optional[int] = LIST_PREREQUISITE_DEPTH,
+    filters: Optional[ProblemFilters] = None
+) -> List[Problem]:
+    """Get problems by offset; a None depth loads `ProblemSummary` columns only."""
+    stmt = (
+        apply_problem_filters(select(Problem), filters)
+        .options(*list_loader_options(prerequisite_depth))
+        .execution_options(populate_existing=True)
+        .order_by(Problem.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return (await db.scalars(stmt)).all()
+
+async def get_problems_page(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    prerequisite_depth: Optional[int] = LIST_PREREQUISITE_DEPTH,
+    filters: Optional[ProblemFilters] = None
+) -> ProblemPage:
+    """Get a page of problems using keyset pagination on `Problem.id`."""
+    stmt, direction = problems_page_statement(cursor, limit, prerequisite_depth, filters)
+    rows = (await db.scalars(stmt)).all()
+    return build_problems_page(rows, cursor, direction, limit)
+
+async def get_problem_facets(
+    db: AsyncSession,
+    filters: Optional[ProblemFilters] = None
+) -> ProblemFacets:
+    """Get per-subject and per-difficulty problem counts matching the filters."""
+    return build_problem_facets(await db.execute(problem_facets_statement(filters)))
+
+async def get_problem(
+    db: AsyncSession,
+    problem_id: int,
+    prerequisite_depth: int = DETAIL_PREREQUISITE_DEPTH
+) -> Optional[Problem]:
+    stmt = (
+        select(Problem)
+        .filter(Problem.id == problem_id)
+        .options(*problem_loader_options(prerequisite_depth))
+    )
+    return (await db.scalars(stmt)).first()
+
+async def create_problem(db: AsyncSession, problem: ProblemCreate) -> Problem:
+    db_problem = Problem(
+        title=problem.title,
+        subject=problem.subject,
+        difficulty=problem.difficulty,
+        description=problem.description,
+        solution=problem.solution,
+        steps=[Step(order=step.order, content=step.content) for step in problem.steps],
+        hints=[Hint(order=hint.order, content=hint.content) for hint in problem.hints],
+    )
+
+    # Add prerequisites, looked up in a single query
+    if problem.prerequisite_ids:
+        prereqs = await db.scalars(
+            select(Problem).filter(Problem.id.in_(problem.prerequisite_ids))
+        )
+        db_problem.prerequisites = list(prereqs.all())
+
+    db.add(db_problem)
+    await db.flush()
+    document = problem_document(db_problem.id, problem)
+    await db.run_sync(lambda session: index_documents(session, [document]))
+    await db.commit()
+    problem_cache.invalidate()
+    if prerequisite_graph.loaded:
+        prerequisite_graph.add_problem(
+            db_problem.id, [prereq.id for prereq in db_problem.prerequisites]
+        )
+    return await get_problem(db, db_problem.id)
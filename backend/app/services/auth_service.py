@@ -1,54 +1,125 @@
 from datetime import timedelta
 from typing import Optional
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.core.security import (
+    verify_and_update_password,
+    get_password_hash,
+    create_access_token,
+    token_cache
+)
 from app.db.models import User
 from app.schemas.user import UserCreate
 
+def invalidate_user_tokens(username: Optional[str]):
+    """Drop cached token verifications for a user.
+
+    Called automatically when a loaded user's credentials, activation state
+    or profile fields change; call it directly after bulk UPDATEs that
+    bypass the ORM.
+    """
+    token_cache.invalidate_user(username)
+
+@event.listens_for(User.hashed_password, "set")
+@event.listens_for(User.is_active, "set")
+@event.listens_for(User.email, "set")
+def _invalidate_on_change(target, value, oldvalue, initiator):
+    invalidate_user_tokens(target.username)
+
+@event.listens_for(User.username, "set")
+def _invalidate_on_rename(target, value, oldvalue, initiator):
+    if isinstance(oldvalue, str):
+        invalidate_user_tokens(oldvalue)
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
-    """Get user by email."""
-    return db.query(User).filter(User.email == email).first()
+    """Get user by email, ignoring case."""
+    return db.scalars(select(User).filter(func.lower(User.email) == func.lower(email))).first()
 
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
-    """Get user by username."""
-    return db.query(User).filter(User.username == username).first()
+    """Get user by username, ignoring case."""
+    return db.scalars(
+        select(User).filter(func.lower(User.username) == func.lower(username))
+    ).first()
 
-def create_user(db: Session, user: UserCreate) -> User:
-    """Create a new user."""
-    # Check if email already exists
-    if get_user_by_email(db, user.email):
-        raise HTTPException(
+# Unique indexes on users as named in violation messages: the current
+# case-insensitive ones, and the per-column ones of databases not yet upgraded
+USER_UNIQUE_INDEXES = (
+    "uq_users_email_lower", "uq_users_username_lower",
+    "ix_users_email", "ix_users_username", "users.email", "users.username",
+)
+
+def is_duplicate_user(exc: IntegrityError) -> bool:
+    """Whether an integrity error is a unique index violation on users."""
+    message = str(exc.orig)
+    return any(index in message for index in USER_UNIQUE_INDEXES)
+
+def duplicate_user_error(email_taken: bool) -> HTTPException:
+    """
+    The registration error for a duplicate user.
+
+    Which index a database reports first when both the email and the
+    username collide is arbitrary, so callers look the email up after the
+    violation and report it in preference to the username.
+    """
+    if email_taken:
+        return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-    
-    # Check if username already exists
-    if get_user_by_username(db, user.username):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
-        )
-    
-    # Create new user
-    db_user = User(
-        email=user.email,
-        username=user.username,
-        hashed_password=get_password_hash(user.password)
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Username already taken"
     )
-    
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+
+def new_user_values(user: UserCreate, hashed_password: str) -> dict:
+    return {
+        "email": user.email,
+        "username": user.username,
+        "hashed_password": hashed_password,
+        "is_active": True,
+    }
+
+def create_user(db: Session, user: UserCreate) -> User:
+    """
+    Create a new user with a single INSERT ... RETURNING.
+
+    Duplicates are caught by the case-insensitive unique indexes, so two
+    concurrent registrations cannot both succeed. The returned user is
+    detached before the commit, which keeps its attributes loaded without
+    a refresh query.
+    """
+    hashed_password = get_password_hash(user.password)
+    try:
+        db_user = db.scalars(
+            insert(User).returning(User), [new_user_values(user, hashed_password)]
+        ).one()
+        db.expunge(db_user)
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if not is_duplicate_user(exc):
+            raise
+        raise duplicate_user_error(get_user_by_email(db, user.email) is not None)
     return db_user
 
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
-    """Authenticate user by username and password."""
+    """
+    Authenticate user by username and password.
+
+    Hashes made with an older scheme or a lower cost are replaced on a
+    successful login, while the plain password is at hand.
+    """
     user = get_user_by_username(db, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
 def create_user_token(user: User) -> dict:
@@ -0,0 +1,59 @@
+from typing import Iterator
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from app.db.models import Problem
+from app.schemas.problem import HintCreate, ProblemExport, StepCreate
+
+EXPORT_BATCH_SIZE = 500
+
+def export_statement(batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Select every problem in id order through a server-side cursor.
+
+    `yield_per` streams rows in batches of `batch_size`; steps, hints and
+    prerequisite ids are loaded with one SELECT ... IN per batch.
+    """
+    return (
+        select(Problem)
+        .options(
+            selectinload(Problem.steps),
+            selectinload(Problem.hints),
+            selectinload(Problem.prerequisites).load_only(Problem.id),
+        )
+        .order_by(Problem.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+def export_record(problem: Problem) -> ProblemExport:
+    """Build the export record of an ORM problem."""
+    return ProblemExport(
+        id=problem.id,
+        ref=str(problem.id),
+        title=problem.title,
+        subject=problem.subject,
+        difficulty=problem.difficulty,
+        description=problem.description,
+        solution=problem.solution,
+        steps=[
+            StepCreate(order=step.order, content=step.content)
+            for step in sorted(problem.steps, key=lambda step: (step.order, step.id))
+        ],
+        hints=[
+            HintCreate(order=hint.order, content=hint.content)
+            for hint in sorted(problem.hints, key=lambda hint: (hint.order, hint.id))
+        ],
+        prerequisite_refs=[str(prereq_id) for prereq_id in sorted(problem.prerequisite_ids)],
+    )
+
+def iter_problem_export(db: Session, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """
+    Stream the whole catalog as NDJSON, one chunk of lines per batch.
+
+    Only one batch of problems is held at a time, so memory use does not
+    grow with the catalog. The output is a valid bulk import file.
+    """
+    for batch in db.scalars(export_statement(batch_size)).partitions():
+        yield b"".join(
+            export_record(problem).model_dump_json(exclude={"prerequisite_ids"}).encode() + b"\n"
+            for problem in batch
+        )
@@ -0,0 +1,201 @@
+import codecs
+import json
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Set, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+from app.core.cache import problem_cache
+from app.db.models import Problem, Step, Hint, problem_prerequisites
+from app.schemas.problem import BulkImportResult, ProblemImport
+from app.services.prerequisite_graph import PrerequisiteCycleError, get_prerequisite_graph
+from app.services.search_service import index_documents, problem_document
+
+READ_CHUNK_SIZE = 64 * 1024
+IMPORT_BATCH_SIZE = 500
+
+class BulkImportError(ValueError):
+    """Raised when an import file is malformed or references unknown problems."""
+
+def iter_json_records(stream: BinaryIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Incrementally parse a JSON array of objects or NDJSON from a binary stream.
+
+    The format is detected from the first non-whitespace character. Only one
+    record and one read chunk are held in memory at a time.
+    """
+    decoder = json.JSONDecoder()
+    # Multi-byte characters may straddle chunk boundaries
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            buffer += utf8.decode(b"", final=True)
+            return False
+        buffer += utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        return True
+
+    # Skip a UTF-8 BOM and leading whitespace to detect the format
+    while not eof and not buffer.lstrip("\ufeff \t\r\n"):
+        buffer = ""
+        fill()
+    buffer = buffer.lstrip("\ufeff \t\r\n")
+    if not buffer:
+        return
+    in_array = buffer[0] == "["
+    pos = 1 if in_array else 0
+    separator_needed = False
+
+    while True:
+        # Skip whitespace and, inside an array, the separating comma
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = "", 0
+            fill()
+        if pos >= len(buffer):
+            if in_array:
+                raise BulkImportError("Unterminated JSON array")
+            return
+        if in_array and buffer[pos] == "]":
+            return
+        if in_array and separator_needed:
+            if buffer[pos] != ",":
+                raise BulkImportError("Expected ',' between records")
+            pos += 1
+            separator_needed = False
+            continue
+
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # The record may continue in the next chunk
+            if fill():
+                continue
+            raise BulkImportError("Malformed JSON record in import file")
+        if not isinstance(record, dict):
+            raise BulkImportError("Import records must be JSON objects")
+        yield record
+        buffer, pos = buffer[end:], 0
+        separator_needed = in_array
+
+def _batches(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+def import_problems(
+    db: Session,
+    records: Iterable[dict],
+    batch_size: int = IMPORT_BATCH_SIZE
+) -> BulkImportResult:
+    """
+    Load problems, steps, hints and prerequisite edges in a single transaction.
+
+    Rows are written with executemany INSERTs, one per table per batch, and
+    problem ids come back through ordered RETURNING (batched on Postgres;
+    SQLite executes those rows individually). Prerequisite edges are collected
+    as records stream past and resolved once every problem has an id, so
+    references may point forwards within the file. Nothing is committed if
+    any record is invalid or the edges would form a prerequisite cycle.
+    """
+    # Build the graph before this import adds rows to the session
+    graph = get_prerequisite_graph(db)
+    ids_by_ref: Dict[str, int] = {}
+    ref_edges: List[Tuple[int, str]] = []
+    id_edges: List[Tuple[int, int]] = []
+    created_ids: List[int] = []
+
+    try:
+        for batch_number, batch in enumerate(_batches(records, batch_size)):
+            items = []
+            for offset, record in enumerate(batch):
+                try:
+                    items.append(ProblemImport.model_validate(record))
+                except ValidationError as exc:
+                    index = batch_number * batch_size + offset
+                    raise BulkImportError(f"Record {index} is invalid: {exc.errors()}")
+
+            problem_ids = db.scalars(
+                insert(Problem).returning(Problem.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "title": item.title,
+                        "subject": item.subject,
+                        "difficulty": item.difficulty,
+                        "description": item.description,
+                        "solution": item.solution,
+                    }
+                    for item in items
+                ],
+            ).all()
+
+            step_rows, hint_rows = [], []
+            for problem_id, item in zip(problem_ids, items):
+                if item.ref is not None:
+                    if item.ref in ids_by_ref:
+                        raise BulkImportError(f"Duplicate ref '{item.ref}'")
+                    ids_by_ref[item.ref] = problem_id
+                step_rows.extend(
+                    {"problem_id": problem_id, "order": step.order, "content": step.content}
+                    for step in item.steps
+                )
+                hint_rows.extend(
+                    {"problem_id": problem_id, "order": hint.order, "content": hint.content}
+                    for hint in item.hints
+                )
+                id_edges.extend((problem_id, prereq_id) for prereq_id in item.prerequisite_ids or [])
+                ref_edges.extend((problem_id, ref) for ref in item.prerequisite_refs)
+            if step_rows:
+                db.execute(insert(Step), step_rows)
+            if hint_rows:
+                db.execute(insert(Hint), hint_rows)
+            index_documents(db, [
+                problem_document(problem_id, item) for problem_id, item in zip(problem_ids, items)
+            ])
+            created_ids.extend(problem_ids)
+
+        edges: Set[Tuple[int, int]] = set()
+        for problem_id, ref in ref_edges:
+            if ref not in ids_by_ref:
+                raise BulkImportError(f"Unknown prerequisite ref '{ref}'")
+            edges.add((problem_id, ids_by_ref[ref]))
+
+        # Ids may point at problems created earlier or in this import
+        imported_ids = set(created_ids)
+        external_ids = {prereq_id for _, prereq_id in id_edges} - imported_ids
+        existing_ids: Set[int] = set()
+        for chunk in _batches(sorted(external_ids), batch_size):
+            existing_ids.update(db.scalars(select(Problem.id).filter(Problem.id.in_(chunk))))
+        missing = external_ids - existing_ids
+        if missing:
+            raise BulkImportError(f"Unknown prerequisite ids {sorted(missing)}")
+        edges.update(id_edges)
+
+        try:
+            graph.check_new_edges(edges)
+        except PrerequisiteCycleError as exc:
+            raise BulkImportError(str(exc))
+
+        if edges:
+            db.execute(
+                insert(problem_prerequisites),
+                [{"problem_id": child, "prerequisite_id": parent} for child, parent in sorted(edges)],
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    problem_cache.invalidate()
+    for problem_id in created_ids:
+        graph.add_problem(problem_id)
+    graph.add_edges(edges)
+
+    return BulkImportResult(created=len(created_ids), ids_by_ref=ids_by_ref)
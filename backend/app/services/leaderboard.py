@@ -0,0 +1,369 @@
+import threading
+import time
+from contextlib import contextmanager
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models import User, UserSubjectStats
+from app.schemas.leaderboard import LeaderboardEntry, LeaderboardStanding
+
+# Ranking keys pack (score, user id) into one int ordered by score
+# descending, then user id ascending; ints keep a million entries compact
+_USER_BITS = 32
+_USER_MASK = (1 << _USER_BITS) - 1
+
+def _key(score: int, user_id: int) -> int:
+    return (-score << _USER_BITS) | user_id
+
+def _unpack(key: int) -> Tuple[int, int]:
+    return -(key >> _USER_BITS), key & _USER_MASK
+
+class RankedList:
+    """
+    Sorted list with O(log n) position lookups.
+
+    Keys are kept in sorted buckets of roughly `load` keys, found by
+    bisecting the bucket maxima; a Fenwick tree over bucket sizes maps
+    between global positions and (bucket, offset). Inserts and removals move
+    at most one bucket's worth of keys, and the tree is rebuilt only when a
+    bucket splits or empties.
+    """
+
+    def __init__(self, keys: Iterable[int] = (), load: int = 1000):
+        self._load = load
+        ordered = sorted(keys)
+        self._buckets = [ordered[i:i + load] for i in range(0, len(ordered), load)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(ordered)
+        self._build_tree()
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _build_tree(self):
+        tree = [0] + [len(bucket) for bucket in self._buckets]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, bucket: int, delta: int):
+        i = bucket + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_before(self, bucket: int) -> int:
+        """Keys in the buckets before `bucket`."""
+        total = 0
+        i = bucket
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """(bucket, offset) of the key at a position, by Fenwick descent."""
+        bucket = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            upper = bucket + step
+            if upper < len(self._tree) and self._tree[upper] <= index:
+                bucket = upper
+                index -= self._tree[upper]
+            step >>= 1
+        return bucket, index
+
+    def add(self, key: int):
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._build_tree()
+            return
+        i = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        if len(bucket) > 2 * self._load:
+            self._buckets[i:i + 1] = [bucket[:self._load], bucket[self._load:]]
+            self._maxes[i:i + 1] = [bucket[self._load - 1], bucket[-1]]
+            self._build_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def remove(self, key: int):
+        """Remove a key; raises KeyError when it is not present."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            raise KeyError(key)
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, key)
+        if bucket[j] != key:
+            raise KeyError(key)
+        del bucket[j]
+        self._len -= 1
+        if bucket:
+            self._maxes[i] = bucket[-1]
+            self._tree_add(i, -1)
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+            self._build_tree()
+
+    def bisect_left(self, key: int) -> int:
+        """Number of keys smaller than `key`."""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return self._len
+        return self._count_before(i) + bisect_left(self._buckets[i], key)
+
+    def islice(self, start: int, stop: int) -> Iterator[int]:
+        """Keys at positions start to stop - 1, clamped to the list."""
+        start, stop = max(0, start), min(stop, self._len)
+        if start >= stop:
+            return
+        bucket, offset = self._locate(start)
+        remaining = stop - start
+        while remaining > 0:
+            keys = self._buckets[bucket][offset:offset + remaining]
+            yield from keys
+            remaining -= len(keys)
+            bucket, offset = bucket + 1, 0
+
+class RankedScore(NamedTuple):
+    rank: int
+    user_id: int
+    score: int
+
+class Leaderboard:
+    """
+    Scores by user with rank, top-N and around-user queries in O(log n).
+
+    Ranks are competition ranks: tied users share a rank and the next score
+    down skips past them ("1, 2, 2, 4"); ties are listed by user id. Users
+    with no points are not ranked. Not thread-safe; `Leaderboards` locks.
+    """
+
+    def __init__(self, scores: Optional[Dict[int, int]] = None):
+        self._scores = {user_id: score for user_id, score in (scores or {}).items() if score > 0}
+        self._ranking = RankedList(_key(score, user_id) for user_id, score in self._scores.items())
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def add(self, user_id: int, points: int):
+        """Change a user's score by `points`."""
+        old = self._scores.pop(user_id, 0)
+        if old:
+            self._ranking.remove(_key(old, user_id))
+        new = old + points
+        if new > 0:
+            self._scores[user_id] = new
+            self._ranking.add(_key(new, user_id))
+
+    def score(self, user_id: int) -> int:
+        return self._scores.get(user_id, 0)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return self._ranking.bisect_left(_key(score, 0)) + 1
+
+    def _ranked(self, start: int, stop: int) -> List[RankedScore]:
+        entries = []
+        for key in self._ranking.islice(start, stop):
+            score, user_id = _unpack(key)
+            if entries and entries[-1].score == score:
+                rank = entries[-1].rank
+            else:
+                rank = self._ranking.bisect_left(_key(score, 0)) + 1
+            entries.append(RankedScore(rank, user_id, score))
+        return entries
+
+    def top(self, limit: int) -> List[RankedScore]:
+        return self._ranked(0, limit)
+
+    def around(self, user_id: int, radius: int) -> List[RankedScore]:
+        """The user's entry with up to `radius` entries above and below it."""
+        score = self._scores.get(user_id)
+        if score is None:
+            return []
+        position = self._ranking.bisect_left(_key(score, user_id))
+        return self._ranked(position - radius, position + radius + 1)
+
+def _add_completions(global_board: Leaderboard, subjects: Dict[str, Leaderboard],
+                     completions: Dict[Tuple[int, str], int]):
+    for (user_id, subject), count in completions.items():
+        if not count:
+            continue
+        global_board.add(user_id, count)
+        subjects.setdefault(subject, Leaderboard()).add(user_id, count)
+
+class Leaderboards:
+    """
+    The global board and one board per subject, scored by completed problems.
+
+    Boards are loaded from `user_subject_stats`, which is their durable
+    snapshot, and then updated incrementally as completions are committed
+    in this process. Each worker keeps its own copy and reloads it every
+    `refresh_seconds` to pick up completions made by other workers.
+    """
+
+    def __init__(self, refresh_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        # Serializes reloads, which are built outside `_lock`
+        self._rebuild_lock = threading.Lock()
+        # Held by writers across commit and record, and by a reload while
+        # its snapshot query starts; see `recording`
+        self._snapshot_lock = threading.Lock()
+        self._global = Leaderboard()
+        self._subjects: Dict[str, Leaderboard] = {}
+        # Completions recorded after a reload's snapshot, replayed onto it
+        self._replay: Optional[List[Dict[Tuple[int, str], int]]] = None
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    @property
+    def stale(self) -> bool:
+        return (
+            self.loaded_at is None
+            or 0 < self.refresh_seconds < time.monotonic() - self.loaded_at
+        )
+
+    def reset(self):
+        with self._lock:
+            self._global = Leaderboard()
+            self._subjects = {}
+            self._replay = None
+            self.loaded_at = None
+
+    @contextmanager
+    def recording(self):
+        """
+        Hold while committing completions and passing them to
+        `record_completions`, so a reload's snapshot has either both the
+        rows and the record or neither.
+        """
+        with self._snapshot_lock:
+            yield
+
+    def rebuild(self, db: Session):
+        """
+        Load every board from the per-subject completion counts.
+
+        Completions recorded once the snapshot query has started are not in
+        it; they are kept and replayed onto the new boards before the swap.
+        """
+        try:
+            with self._snapshot_lock:
+                with self._lock:
+                    self._replay = []
+                rows = db.execute(
+                    select(UserSubjectStats.user_id, UserSubjectStats.subject, UserSubjectStats.completed)
+                    .filter(UserSubjectStats.completed > 0)
+                    .execution_options(yield_per=10000)
+                )
+            totals: Dict[int, int] = defaultdict(int)
+            by_subject: Dict[str, Dict[int, int]] = defaultdict(dict)
+            for user_id, subject, completed in rows:
+                totals[user_id] += completed
+                by_subject[subject][user_id] = completed
+            global_board = Leaderboard(totals)
+            subjects = {subject: Leaderboard(scores) for subject, scores in by_subject.items()}
+        except BaseException:
+            with self._lock:
+                self._replay = None
+            raise
+        with self._lock:
+            for completions in self._replay:
+                _add_completions(global_board, subjects, completions)
+            self._replay = None
+            self._global, self._subjects = global_board, subjects
+            self.loaded_at = time.monotonic()
+
+    def record_completions(self, completions: Dict[Tuple[int, str], int]):
+        """
+        Add committed completions, counted per (user id, subject).
+
+        Call inside `recording`, together with the commit. Ignored until the
+        boards are loaded, since loading reads them back.
+        """
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(completions)
+            if self.loaded:
+                _add_completions(self._global, self._subjects, completions)
+
+    def _board(self, subject: Optional[str]) -> Leaderboard:
+        if subject is None:
+            return self._global
+        return self._subjects.get(subject) or Leaderboard()
+
+    def top(self, subject: Optional[str], limit: int) -> List[RankedScore]:
+        with self._lock:
+            return self._board(subject).top(limit)
+
+    def standing(self, subject: Optional[str], user_id: int, radius: int) -> tuple:
+        """(rank, score, ranked users, entries around the user)."""
+        with self._lock:
+            board = self._board(subject)
+            return (
+                board.rank(user_id), board.score(user_id), len(board),
+                board.around(user_id, radius),
+            )
+
+leaderboards = Leaderboards(settings.LEADERBOARD_REFRESH_SECONDS)
+
+def get_leaderboards(db: Session) -> Leaderboards:
+    """
+    Return the shared boards, loading them if needed.
+
+    The first load blocks; later reloads of stale boards run in one request
+    while the others keep reading the current boards.
+    """
+    if not leaderboards.loaded:
+        with leaderboards._rebuild_lock:
+            if not leaderboards.loaded:
+                leaderboards.rebuild(db)
+    elif leaderboards.stale and leaderboards._rebuild_lock.acquire(blocking=False):
+        try:
+            leaderboards.rebuild(db)
+        finally:
+            leaderboards._rebuild_lock.release()
+    return leaderboards
+
+def with_usernames(db: Session, scores: List[RankedScore]) -> List[LeaderboardEntry]:
+    """Attach usernames to ranked scores with one primary-key lookup."""
+    if not scores:
+        return []
+    usernames = dict(db.execute(
+        select(User.id, User.username).filter(User.id.in_([score.user_id for score in scores]))
+    ).all())
+    return [
+        LeaderboardEntry(
+            rank=score.rank,
+            user_id=score.user_id,
+            username=usernames.get(score.user_id, ""),
+            score=score.score,
+        )
+        for score in scores
+    ]
+
+def get_leaderboard(db: Session, subject: Optional[str], limit: int) -> List[LeaderboardEntry]:
+    return with_usernames(db, get_leaderboards(db).top(subject, limit))
+
+def get_standing(db: Session, subject: Optional[str], user_id: int, radius: int) -> LeaderboardStanding:
+    rank, score, players, around = get_leaderboards(db).standing(subject, user_id, radius)
+    return LeaderboardStanding(
+        rank=rank, score=score, players=players, around=with_usernames(db, around)
+    )
@@ -0,0 +1,212 @@
+import heapq
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.db.models import Problem, problem_prerequisites
+
+logger = logging.getLogger(__name__)
+
+class PrerequisiteCycleError(ValueError):
+    """Raised when new prerequisite edges would make the graph cyclic."""
+
+class PrerequisiteGraph:
+    """
+    In-memory prerequisite DAG with a maintained transitive closure.
+
+    Built once from `problem_prerequisites` and then updated incrementally as
+    problems are created, so ancestor/descendant lookups are set lookups and
+    no request has to walk the table. Each worker process keeps its own copy;
+    call `reset` to force a rebuild after writes made by other processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.loaded = False
+        self._parents: Dict[int, Set[int]] = {}
+        self._children: Dict[int, Set[int]] = {}
+        self._ancestors: Dict[int, Set[int]] = {}
+        self._descendants: Dict[int, Set[int]] = {}
+
+    def reset(self):
+        with self._lock:
+            self.loaded = False
+            self._parents.clear()
+            self._children.clear()
+            self._ancestors.clear()
+            self._descendants.clear()
+
+    def rebuild(self, db: Session):
+        """Load every problem and edge and compute the closure in topological order."""
+        problem_ids = db.scalars(select(Problem.id)).all()
+        edges = db.execute(
+            select(problem_prerequisites.c.problem_id, problem_prerequisites.c.prerequisite_id)
+        ).all()
+        with self._lock:
+            self.reset()
+            for problem_id in problem_ids:
+                self._add_node(problem_id)
+            for child, parent in edges:
+                self._add_node(child)
+                self._add_node(parent)
+                self._parents[child].add(parent)
+                self._children[parent].add(child)
+
+            order = self._topological_order(self._parents.keys())
+            if len(order) < len(self._parents):
+                # Legacy rows may contain cycles; their edges are left out of
+                # the closure rather than failing every lookup.
+                cyclic = set(self._parents) - set(order)
+                logger.warning("Prerequisite cycle among problems %s", sorted(cyclic))
+                for node in cyclic:
+                    for parent in self._parents[node] & cyclic:
+                        self._children[parent].discard(node)
+                    self._parents[node] -= cyclic
+                order = self._topological_order(self._parents.keys())
+
+            for node in order:
+                ancestors = self._ancestors[node]
+                for parent in self._parents[node]:
+                    ancestors.add(parent)
+                    ancestors |= self._ancestors[parent]
+                for ancestor in ancestors:
+                    self._descendants[ancestor].add(node)
+            self.loaded = True
+
+    def check_new_edges(self, edges: Iterable[Tuple[int, int]]):
+        """
+        Raise PrerequisiteCycleError if adding (problem, prerequisite) edges
+        would create a cycle. Edges are not applied.
+        """
+        pending: Dict[int, Set[int]] = {}
+        for child, parent in edges:
+            if child == parent:
+                raise PrerequisiteCycleError(f"Problem {child} cannot be its own prerequisite")
+            pending.setdefault(child, set()).add(parent)
+
+        with self._lock:
+            # Existing edges are acyclic, so any cycle runs through pending
+            # edges joined by existing paths. Contract it onto the nodes the
+            # pending edges touch and look for a cycle there.
+            nodes = set(pending)
+            for parents in pending.values():
+                nodes |= parents
+            graph = {}
+            for node in nodes:
+                existing = self._ancestors.get(node, set())
+                if len(existing) > len(nodes):
+                    reachable = {other for other in nodes if other in existing}
+                else:
+                    reachable = existing & nodes
+                graph[node] = reachable | pending.get(node, set())
+
+            remaining = {node: 0 for node in nodes}
+            for parents in graph.values():
+                for parent in parents:
+                    remaining[parent] += 1
+            ready = [node for node, count in remaining.items() if count == 0]
+            visited = 0
+            while ready:
+                node = ready.pop()
+                visited += 1
+                for parent in graph[node]:
+                    remaining[parent] -= 1
+                    if remaining[parent] == 0:
+                        ready.append(parent)
+            if visited < len(nodes):
+                cyclic = sorted(node for node, count in remaining.items() if count > 0)
+                raise PrerequisiteCycleError(
+                    f"Prerequisites would form a cycle through problems {cyclic}"
+                )
+
+    def add_edges(self, edges: Iterable[Tuple[int, int]]):
+        """Apply (problem, prerequisite) edges, updating the closure incrementally."""
+        edges = list(edges)
+        self.check_new_edges(edges)
+        with self._lock:
+            for child, parent in edges:
+                self._add_node(child)
+                self._add_node(parent)
+                if parent in self._parents[child]:
+                    continue
+                self._parents[child].add(parent)
+                self._children[parent].add(child)
+                new_ancestors = {parent} | self._ancestors[parent]
+                affected = {child} | self._descendants[child]
+                for node in affected:
+                    self._ancestors[node] |= new_ancestors
+                for ancestor in new_ancestors:
+                    self._descendants[ancestor] |= affected
+
+    def add_problem(self, problem_id: int, prerequisite_ids: Iterable[int] = ()):
+        """Register a newly created problem and its prerequisites."""
+        with self._lock:
+            self._add_node(problem_id)
+            self.add_edges((problem_id, prereq_id) for prereq_id in prerequisite_ids)
+
+    def __contains__(self, problem_id: int) -> bool:
+        return problem_id in self._parents
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def unlocked(self, completed: Set[int]) -> List[int]:
+        """Problems outside `completed` whose direct prerequisites are all in it."""
+        with self._lock:
+            return [
+                problem_id for problem_id, parents in self._parents.items()
+                if problem_id not in completed and parents <= completed
+            ]
+
+    def prerequisites(self, problem_id: int) -> FrozenSet[int]:
+        return frozenset(self._parents.get(problem_id, ()))
+
+    def dependents(self, problem_id: int) -> FrozenSet[int]:
+        return frozenset(self._children.get(problem_id, ()))
+
+    def ancestors(self, problem_id: int) -> FrozenSet[int]:
+        return frozenset(self._ancestors.get(problem_id, ()))
+
+    def descendants(self, problem_id: int) -> FrozenSet[int]:
+        return frozenset(self._descendants.get(problem_id, ()))
+
+    def learning_path(self, problem_id: int) -> List[int]:
+        """Every prerequisite of a problem in a valid study order, ending with it."""
+        with self._lock:
+            return self._topological_order(self._ancestors.get(problem_id, set()) | {problem_id})
+
+    def _add_node(self, problem_id: int):
+        if problem_id not in self._parents:
+            self._parents[problem_id] = set()
+            self._children[problem_id] = set()
+            self._ancestors[problem_id] = set()
+            self._descendants[problem_id] = set()
+
+    def _topological_order(self, nodes: Iterable[int]) -> List[int]:
+        """Kahn's algorithm over a node subset; ties are broken by lowest id."""
+        nodes = set(nodes)
+        remaining = {node: len(self._parents.get(node, set()) & nodes) for node in nodes}
+        ready = [node for node, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            node = heapq.heappop(ready)
+            order.append(node)
+            for child in self._children.get(node, ()):
+                if child in remaining:
+                    remaining[child] -= 1
+                    if remaining[child] == 0:
+                        heapq.heappush(ready, child)
+        return order
+
+# Process-wide graph, built lazily on first use
+prerequisite_graph = PrerequisiteGraph()
+
+def get_prerequisite_graph(db: Session) -> PrerequisiteGraph:
+    """Return the shared graph, building it from the database if needed."""
+    if not prerequisite_graph.loaded:
+        with prerequisite_graph._lock:
+            if not prerequisite_graph.loaded:
+                prerequisite_graph.rebuild(db)
+    return prerequisite_graph
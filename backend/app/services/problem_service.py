@@ -1,13 +1,240 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.db.models import Problem, Step, Hint
-from app.schemas.problem import ProblemCreate
+from sqlalchemy import Select, and_, exists, func, select
+from sqlalchemy.orm import Session, load_only, selectinload, with_expression
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from app.core.cache import problem_cache
+from app.core.pagination import CURSOR_NEXT, CURSOR_PREV, encode_cursor, decode_cursor
+from app.db.models import Problem, Step, Hint, UserProgress
+from app.schemas.problem import ProblemCreate, ProblemFacets
+from app.services.prerequisite_graph import get_prerequisite_graph, prerequisite_graph
+from app.services.search_service import index_documents, problem_document
 
-def get_problems(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Problem).offset(skip).limit(limit).all()
+# How many levels of the prerequisite tree are eager-loaded per endpoint.
+# Every level costs a fixed number of SELECT ... IN statements (prerequisites,
+# steps, hints), independent of how many problems are on the page. Deeper
+# trees fall back to lazy loading below the configured depth.
+LIST_PREREQUISITE_DEPTH = 2
+DETAIL_PREREQUISITE_DEPTH = 4
 
-def get_problem(db: Session, problem_id: int):
-    return db.query(Problem).filter(Problem.id == problem_id).first()
+# Characters of the description returned in list views
+PREVIEW_LENGTH = 160
+
+def problem_summary_options() -> list:
+    """
+    Loader options for problems serialized with `ProblemSummary`.
+
+    Only the short columns are selected, the description is cut to a preview
+    and steps are counted in SQL, so the Text columns, steps and hints are
+    never transferred. Prerequisite ids come from one SELECT ... IN.
+    """
+    step_count = (
+        select(func.count(Step.id))
+        .where(Step.problem_id == Problem.id)
+        .correlate(Problem)
+        .scalar_subquery()
+    )
+    return [
+        load_only(Problem.id, Problem.title, Problem.subject, Problem.difficulty),
+        with_expression(Problem.preview, func.substr(Problem.description, 1, PREVIEW_LENGTH)),
+        with_expression(Problem.step_count, step_count),
+        selectinload(Problem.prerequisites).load_only(Problem.id),
+    ]
+
+def list_loader_options(prerequisite_depth: Optional[int]) -> list:
+    """Summary options when no depth is given, full problem trees otherwise."""
+    if prerequisite_depth is None:
+        return problem_summary_options()
+    return problem_loader_options(prerequisite_depth)
+
+def problem_loader_options(prerequisite_depth: int = LIST_PREREQUISITE_DEPTH) -> list:
+    """Build loader options for problems serialized with the full `Problem` schema."""
+    options = [selectinload(Problem.steps), selectinload(Problem.hints)]
+    path = selectinload(Problem.prerequisites)
+    for _ in range(prerequisite_depth):
+        options.append(path.selectinload(Problem.steps))
+        options.append(path.selectinload(Problem.hints))
+        path = path.selectinload(Problem.prerequisites)
+    # Also load the prerequisite collection of the deepest level so trees that
+    # fit within the depth never trigger a lazy load.
+    options.append(path)
+    return options
+
+COMPLETED = "completed"
+IN_PROGRESS = "in_progress"
+NOT_STARTED = "not_started"
+
+class ProblemFilters(NamedTuple):
+    """Catalog filters applied in SQL; `status` needs `user_id`."""
+    subject: Optional[str] = None
+    min_difficulty: Optional[int] = None
+    max_difficulty: Optional[int] = None
+    status: Optional[str] = None
+    user_id: Optional[int] = None
+
+    def cache_key(self) -> str:
+        return f"{self.subject}:{self.min_difficulty}:{self.max_difficulty}"
+
+def apply_problem_filters(stmt: Select, filters: Optional[ProblemFilters]) -> Select:
+    """
+    Add WHERE clauses for catalog filters.
+
+    Subject and difficulty use the composite indexes on problems; completion
+    state is an EXISTS against the (user_id, problem_id) unique index.
+    Progress still buffered in memory is not visible to the filter.
+    """
+    if filters is None:
+        return stmt
+    if filters.subject is not None:
+        stmt = stmt.filter(Problem.subject == filters.subject)
+    if filters.min_difficulty is not None:
+        stmt = stmt.filter(Problem.difficulty >= filters.min_difficulty)
+    if filters.max_difficulty is not None:
+        stmt = stmt.filter(Problem.difficulty <= filters.max_difficulty)
+    if filters.status is not None:
+        started = and_(
+            UserProgress.user_id == filters.user_id,
+            UserProgress.problem_id == Problem.id,
+        )
+        if filters.status == COMPLETED:
+            stmt = stmt.filter(exists().where(started, UserProgress.completed.is_(True)))
+        elif filters.status == IN_PROGRESS:
+            stmt = stmt.filter(exists().where(started, UserProgress.completed.is_not(True)))
+        else:
+            stmt = stmt.filter(~exists().where(started))
+    return stmt
+
+def get_problems(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    prerequisite_depth: Optional[int] = LIST_PREREQUISITE_DEPTH,
+    filters: Optional[ProblemFilters] = None
+) -> List[Problem]:
+    """Get problems by offset; a None depth loads `ProblemSummary` columns only."""
+    stmt = (
+        apply_problem_filters(select(Problem), filters)
+        .options(*list_loader_options(prerequisite_depth))
+        .execution_options(populate_existing=True)
+        .order_by(Problem.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return db.scalars(stmt).all()
+
+class ProblemPage(NamedTuple):
+    items: List[Problem]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+def problems_page_statement(
+    cursor: Optional[str],
+    limit: int,
+    prerequisite_depth: Optional[int],
+    filters: Optional[ProblemFilters] = None
+) -> Tuple[Select, str]:
+    """Build the keyset query for a page; returns the statement and direction.
+
+    Cursors do not carry filters; pass the same filters with every page.
+    Raises ValueError for malformed cursors.
+    """
+    stmt = apply_problem_filters(select(Problem), filters)
+    stmt = stmt.options(*list_loader_options(prerequisite_depth))
+    # Objects already in the session would otherwise keep stale expressions
+    stmt = stmt.execution_options(populate_existing=True)
+    direction = CURSOR_NEXT
+    if cursor is not None:
+        key, direction = decode_cursor(cursor)
+        if not isinstance(key.get("id"), int):
+            raise ValueError("Invalid cursor")
+        if direction == CURSOR_NEXT:
+            stmt = stmt.filter(Problem.id > key["id"])
+        else:
+            stmt = stmt.filter(Problem.id < key["id"])
+
+    # Fetch one extra row to find out whether another page follows.
+    if direction == CURSOR_NEXT:
+        stmt = stmt.order_by(Problem.id).limit(limit + 1)
+    else:
+        stmt = stmt.order_by(Problem.id.desc()).limit(limit + 1)
+    return stmt, direction
+
+def build_problems_page(
+    rows: List[Problem],
+    cursor: Optional[str],
+    direction: str,
+    limit: int
+) -> ProblemPage:
+    """Trim the look-ahead row and compute the cursors around a page."""
+    problems = list(rows)
+    has_more = len(problems) > limit
+    problems = problems[:limit]
+    if direction == CURSOR_PREV:
+        problems.reverse()
+
+    if not problems:
+        return ProblemPage(problems, None, None)
+    first_id, last_id = problems[0].id, problems[-1].id
+    if direction == CURSOR_NEXT:
+        has_next, has_prev = has_more, cursor is not None
+    else:
+        has_next, has_prev = True, has_more
+    return ProblemPage(
+        problems,
+        encode_cursor({"id": last_id}, CURSOR_NEXT) if has_next else None,
+        encode_cursor({"id": first_id}, CURSOR_PREV) if has_prev else None,
+    )
+
+def get_problems_page(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    prerequisite_depth: Optional[int] = LIST_PREREQUISITE_DEPTH,
+    filters: Optional[ProblemFilters] = None
+) -> ProblemPage:
+    """Get a page of problems using keyset pagination on `Problem.id`.
+
+    The cursor is opaque to clients; it encodes the id at the edge of the
+    previous page and the direction to move in. Every page is a range scan
+    on the primary key, so deep pages cost the same as the first one.
+    Raises ValueError for malformed cursors.
+    """
+    stmt, direction = problems_page_statement(cursor, limit, prerequisite_depth, filters)
+    return build_problems_page(db.scalars(stmt).all(), cursor, direction, limit)
+
+def problem_facets_statement(filters: Optional[ProblemFilters] = None) -> Select:
+    """Count problems per (subject, difficulty) in one grouped query."""
+    stmt = select(Problem.subject, Problem.difficulty, func.count().label("count"))
+    return apply_problem_filters(stmt, filters).group_by(Problem.subject, Problem.difficulty)
+
+def build_problem_facets(rows: Iterable) -> ProblemFacets:
+    """Roll grouped (subject, difficulty, count) rows up into facet counts."""
+    total = 0
+    subjects: Dict[str, int] = {}
+    difficulties: Dict[int, int] = {}
+    for subject, difficulty, count in rows:
+        total += count
+        if subject is not None:
+            subjects[subject] = subjects.get(subject, 0) + count
+        if difficulty is not None:
+            difficulties[difficulty] = difficulties.get(difficulty, 0) + count
+    return ProblemFacets(
+        total=total,
+        subjects=dict(sorted(subjects.items())),
+        difficulties=dict(sorted(difficulties.items())),
+    )
+
+def get_problem_facets(db: Session, filters: Optional[ProblemFilters] = None) -> ProblemFacets:
+    """Get per-subject and per-difficulty problem counts matching the filters."""
+    return build_problem_facets(db.execute(problem_facets_statement(filters)))
+
+def get_problem(
+    db: Session,
+    problem_id: int,
+    prerequisite_depth: Optional[int] = None
+) -> Optional[Problem]:
+    stmt = select(Problem).filter(Problem.id == problem_id)
+    if prerequisite_depth is not None:
+        stmt = stmt.options(*problem_loader_options(prerequisite_depth))
+    return db.scalars(stmt).first()
 
 def create_problem(db: Session, problem: ProblemCreate):
     db_problem = Problem(
@@ -20,7 +247,7 @@ def create_problem(db: Session, problem: ProblemCreate):
     db.add(db_problem)
     db.commit()
     db.refresh(db_problem)
-    
+
     # Add steps
     for step in problem.steps:
         db_step = Step(
@@ -29,7 +256,7 @@ def create_problem(db: Session, problem: ProblemCreate):
             content=step.content
         )
         db.add(db_step)
-    
+
     # Add hints
     for hint in problem.hints:
         db_hint = Hint(
@@ -38,14 +265,37 @@ def create_problem(db: Session, problem: ProblemCreate):
             content=hint.content
         )
         db.add(db_hint)
-    
+
     # Add prerequisites
     if problem.prerequisite_ids:
         for prereq_id in problem.prerequisite_ids:
             prereq = get_problem(db, prereq_id)
             if prereq:
                 db_problem.prerequisites.append(prereq)
-    
+
+    index_documents(db, [problem_document(db_problem.id, problem)])
     db.commit()
+    problem_cache.invalidate()
+    if prerequisite_graph.loaded:
+        prerequisite_graph.add_problem(
+            db_problem.id, [prereq.id for prereq in db_problem.prerequisites]
+        )
     db.refresh(db_problem)
     return db_problem
+
+def get_learning_path(db: Session, problem_id: int) -> Optional[List[Problem]]:
+    """
+    Get every prerequisite of a problem in study order, ending with the problem.
+
+    The order comes from the in-memory prerequisite graph; the rows are
+    fetched with a single query. Returns None if the problem does not exist.
+    """
+    graph = get_prerequisite_graph(db)
+    if problem_id not in graph:
+        return None
+    path = graph.learning_path(problem_id)
+    problems = {
+        problem.id: problem
+        for problem in db.scalars(select(Problem).filter(Problem.id.in_(path)))
+    }
+    return [problems[pid] for pid in path if pid in problems]
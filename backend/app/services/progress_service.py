@@ -0,0 +1,516 @@
+import logging
+import threading
+from datetime import date, datetime, timedelta, timezone
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import Select, case, delete, func, insert, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models import Problem, UserProgress, UserStreak, UserSubjectStats
+from app.db.session import SessionLocal
+from app.schemas.progress import Progress, ProgressSummary, ProgressUpdate, SubjectSummary
+from app.services.leaderboard import leaderboards
+from app.services.recommendation_service import recommender
+
+logger = logging.getLogger(__name__)
+
+ProgressKey = Tuple[int, int]  # (user_id, problem_id)
+StatsKey = Tuple[int, str]  # (user_id, subject)
+
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+STAT_FIELDS = ("started", "completed", "hints_used")
+# Progress keys per row-value IN lookup, keeping SQLite under 999 parameters
+STORED_STATE_CHUNK_SIZE = 400
+
+def _merge(entry: Dict[str, Any], update: Dict[str, Any]):
+    """Apply newer field values to an entry; completion is sticky."""
+    for field, value in update.items():
+        if field == "completed":
+            entry[field] = bool(entry.get(field)) or value
+        else:
+            entry[field] = value
+
+def write_progress(db: Session, entries: Dict[ProgressKey, Dict[str, Any]]) -> "SummaryChanges":
+    """
+    Upsert coalesced progress entries on (user_id, problem_id).
+
+    Entries only carry the fields that changed, so rows are grouped by field
+    set and each group is written with one executemany INSERT ... ON CONFLICT
+    DO UPDATE. The dashboard aggregates are updated in the same transaction.
+    The caller commits; the returned changes are for after the commit.
+    """
+    now = datetime.now(timezone.utc)
+    changes = summary_changes(db, entries)
+    groups: Dict[Tuple[str, ...], List[dict]] = {}
+    for (user_id, problem_id), entry in entries.items():
+        if entry.get("completed"):
+            entry = {**entry, "completed_at": now}
+        groups.setdefault(tuple(sorted(entry)), []).append(
+            {"user_id": user_id, "problem_id": problem_id, **entry}
+        )
+
+    make_insert = UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    for fields, rows in groups.items():
+        if make_insert is None:
+            _write_rows(db, rows)
+            continue
+        stmt = make_insert(UserProgress)
+        if not fields:
+            stmt = stmt.on_conflict_do_nothing(index_elements=["user_id", "problem_id"])
+        else:
+            values = {field: stmt.excluded[field] for field in fields}
+            if "completed" in values:
+                values["completed"] = or_(UserProgress.completed, stmt.excluded.completed)
+            if "completed_at" in values:
+                values["completed_at"] = func.coalesce(
+                    UserProgress.completed_at, stmt.excluded.completed_at
+                )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "problem_id"], set_=values
+            )
+        db.execute(stmt, rows)
+    apply_summary_changes(db, changes, now.date())
+    return changes
+
+def _write_rows(db: Session, rows: List[dict]):
+    """Row-at-a-time fallback for dialects without ON CONFLICT."""
+    for row in rows:
+        progress = db.scalars(
+            select(UserProgress).filter(
+                UserProgress.user_id == row["user_id"],
+                UserProgress.problem_id == row["problem_id"],
+            )
+        ).first()
+        if progress is None:
+            progress = UserProgress(user_id=row["user_id"], problem_id=row["problem_id"])
+            db.add(progress)
+        for field in ("current_step", "hints_used"):
+            if field in row:
+                setattr(progress, field, row[field])
+        if "completed" in row:
+            progress.completed = bool(progress.completed) or row["completed"]
+        if "completed_at" in row and progress.completed_at is None:
+            progress.completed_at = row["completed_at"]
+    db.flush()
+
+class SummaryChanges(NamedTuple):
+    # Increments of STAT_FIELDS per (user, subject)
+    subjects: Dict[StatsKey, Dict[str, int]]
+    # First completions, with the hints used on each
+    completed_problems: Dict[ProgressKey, int]
+
+    def completions(self) -> Dict[StatsKey, int]:
+        """Newly completed problems per (user, subject)."""
+        return {
+            key: delta["completed"] for key, delta in self.subjects.items() if delta["completed"]
+        }
+
+def summary_changes(db: Session, entries: Dict[ProgressKey, Dict[str, Any]]) -> SummaryChanges:
+    """
+    Work out how writing `entries` moves the dashboard aggregates.
+
+    Reads the stored state of the rows the entries overwrite (locking them
+    on Postgres) and the subjects of their problems, so it must run before
+    the entries are written.
+    """
+    changes = SummaryChanges({}, {})
+    keys = list(entries)
+    if not keys:
+        return changes
+    stored = {}
+    for start in range(0, len(keys), STORED_STATE_CHUNK_SIZE):
+        chunk = keys[start:start + STORED_STATE_CHUNK_SIZE]
+        for row in db.execute(
+            select(
+                UserProgress.user_id, UserProgress.problem_id,
+                UserProgress.completed, UserProgress.hints_used,
+            )
+            .filter(tuple_(UserProgress.user_id, UserProgress.problem_id).in_(chunk))
+            .with_for_update()
+        ):
+            stored[(row.user_id, row.problem_id)] = row
+    subjects = dict(db.execute(
+        select(Problem.id, Problem.subject)
+        .filter(Problem.id.in_({problem_id for _, problem_id in keys}))
+    ).all())
+
+    for (user_id, problem_id), entry in entries.items():
+        row = stored.get((user_id, problem_id))
+        was_completed = bool(row and row.completed)
+        old_hints = (row and row.hints_used) or 0
+        hints_used = entry.get("hints_used", old_hints)
+        newly_completed = not was_completed and bool(entry.get("completed"))
+        if newly_completed:
+            changes.completed_problems[(user_id, problem_id)] = hints_used
+        subject = subjects.get(problem_id)
+        if subject is None:
+            continue
+        delta = changes.subjects.setdefault((user_id, subject), dict.fromkeys(STAT_FIELDS, 0))
+        delta["started"] += row is None
+        delta["completed"] += newly_completed
+        delta["hints_used"] += hints_used - old_hints
+    return changes
+
+def extend_streak(streak: UserStreak, day: date):
+    """Count a completion on `day` towards a streak."""
+    last = streak.last_completed_on
+    if last is not None and last >= day:
+        return
+    if last == day - timedelta(days=1):
+        streak.current_streak = (streak.current_streak or 0) + 1
+    else:
+        streak.current_streak = 1
+    streak.longest_streak = max(streak.longest_streak or 0, streak.current_streak)
+    streak.last_completed_on = day
+
+def apply_summary_changes(db: Session, changes: SummaryChanges, today: date):
+    """
+    Add a batch's increments to the per-subject stats and extend the streaks
+    of users who completed something. The caller commits.
+    """
+    rows = [
+        {"user_id": user_id, "subject": subject, **delta}
+        for (user_id, subject), delta in changes.subjects.items()
+        if any(delta.values())
+    ]
+    make_insert = UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if rows and make_insert is not None:
+        stmt = make_insert(UserSubjectStats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "subject"],
+            set_={
+                field: getattr(UserSubjectStats, field) + stmt.excluded[field]
+                for field in STAT_FIELDS
+            },
+        )
+        db.execute(stmt, rows)
+    elif rows:
+        for row in rows:
+            stats = db.get(UserSubjectStats, (row["user_id"], row["subject"]))
+            if stats is None:
+                stats = UserSubjectStats(
+                    user_id=row["user_id"], subject=row["subject"], **dict.fromkeys(STAT_FIELDS, 0)
+                )
+                db.add(stats)
+            for field in STAT_FIELDS:
+                setattr(stats, field, getattr(stats, field) + row[field])
+
+    completed_users = {user_id for user_id, _ in changes.completed_problems}
+    if completed_users:
+        streaks = {
+            streak.user_id: streak
+            for streak in db.scalars(
+                select(UserStreak).filter(UserStreak.user_id.in_(completed_users))
+            )
+        }
+        for user_id in completed_users:
+            streak = streaks.get(user_id)
+            if streak is None:
+                streak = UserStreak(user_id=user_id)
+                db.add(streak)
+            extend_streak(streak, today)
+    db.flush()
+
+class ProgressBuffer:
+    """
+    Coalesces progress events per (user, problem) and writes them in batches.
+
+    Every event merges into the pending entry for its key, so any number of
+    step clicks or hint reveals between flushes cost one row in one batched
+    upsert. Reads overlay pending entries on the stored rows.
+
+    Durability: step and hint events are acknowledged once buffered and are
+    lost if the process dies before the next flush, i.e. at most
+    `flush_interval` seconds of activity. Completions are flushed before
+    `record` returns, `close` flushes what is left on shutdown, and a failed
+    flush puts its entries back to be retried. Each process has its own
+    buffer, so other workers may read progress up to one interval late.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        flush_interval: float,
+        max_pending: int
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # Serializes flushes so an older batch never overwrites a newer one
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[ProgressKey, Dict[str, Any]] = {}
+        self._inflight: Dict[ProgressKey, Dict[str, Any]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, db: Session, user_id: int, problem_id: int, update: Dict[str, Any]):
+        """Buffer an event, flushing right away on completion or when full."""
+        with self._lock:
+            _merge(self._pending.setdefault((user_id, problem_id), {}), update)
+            size = len(self._pending)
+        if update.get("completed") or self.flush_interval <= 0 or size >= self.max_pending:
+            self.flush(db)
+
+    def pending(self, user_id: int, problem_id: int) -> Optional[Dict[str, Any]]:
+        """Fields written for a key since the last completed flush, if any."""
+        key = (user_id, problem_id)
+        with self._lock:
+            if key not in self._inflight and key not in self._pending:
+                return None
+            entry = dict(self._inflight.get(key, {}))
+            _merge(entry, self._pending.get(key, {}))
+            return entry
+
+    def pending_for_user(self, user_id: int) -> Dict[int, Dict[str, Any]]:
+        """Unflushed fields for every problem a user has touched, by problem id."""
+        with self._lock:
+            keys = {key for key in self._inflight if key[0] == user_id}
+            keys.update(key for key in self._pending if key[0] == user_id)
+            entries = {}
+            for key in keys:
+                entry = dict(self._inflight.get(key, {}))
+                _merge(entry, self._pending.get(key, {}))
+                entries[key[1]] = entry
+            return entries
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """Write and commit every pending entry; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, {}
+                self._inflight = batch
+
+            own_session = db is None
+            if own_session:
+                db = self.session_factory()
+            # A leaderboard reload sees the commit and the record together
+            with leaderboards.recording():
+                try:
+                    changes = write_progress(db, batch)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    with self._lock:
+                        for key, entry in batch.items():
+                            _merge(entry, self._pending.get(key, {}))
+                            self._pending[key] = entry
+                    raise
+                finally:
+                    with self._lock:
+                        self._inflight = {}
+                    if own_session:
+                        db.close()
+                leaderboards.record_completions(changes.completions())
+            recommender.record_completions(changes.completed_problems)
+            return len(batch)
+
+    def start(self):
+        """Start the background flusher; a zero interval writes events through."""
+        if self.flush_interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="progress-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Progress flush failed; entries will be retried")
+
+    def close(self):
+        """Stop the background flusher and write any remaining entries."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+progress_buffer = ProgressBuffer(
+    SessionLocal,
+    flush_interval=settings.PROGRESS_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.PROGRESS_MAX_PENDING,
+)
+
+def _to_progress(user_id: int, problem_id: int, row: Optional[UserProgress], pending: dict) -> Progress:
+    state = {"completed": False, "current_step": 0, "hints_used": 0}
+    if row is not None:
+        state.update(
+            completed=bool(row.completed),
+            current_step=row.current_step or 0,
+            hints_used=row.hints_used or 0,
+        )
+    _merge(state, pending)
+    return Progress(user_id=user_id, problem_id=problem_id, **state)
+
+def get_progress(db: Session, user_id: int, problem_id: int) -> Optional[Progress]:
+    """Get a user's progress on a problem, including unflushed events."""
+    pending = progress_buffer.pending(user_id, problem_id)
+    row = db.scalars(
+        select(UserProgress).filter(
+            UserProgress.user_id == user_id,
+            UserProgress.problem_id == problem_id,
+        )
+    ).first()
+    if row is None and pending is None:
+        return None
+    return _to_progress(user_id, problem_id, row, pending or {})
+
+def get_user_progress(db: Session, user_id: int) -> List[Progress]:
+    """Get a user's progress on every problem they have started."""
+    pending = progress_buffer.pending_for_user(user_id)
+    rows = {
+        row.problem_id: row
+        for row in db.scalars(select(UserProgress).filter(UserProgress.user_id == user_id))
+    }
+    return [
+        _to_progress(user_id, problem_id, rows.get(problem_id), pending.get(problem_id, {}))
+        for problem_id in sorted(rows.keys() | pending.keys())
+    ]
+
+def record_progress(
+    db: Session,
+    user_id: int,
+    problem_id: int,
+    update: ProgressUpdate
+) -> Progress:
+    """Record a progress event and return the resulting state."""
+    progress_buffer.record(db, user_id, problem_id, update.model_dump(exclude_none=True))
+    return get_progress(db, user_id, problem_id)
+
+def get_progress_summary(db: Session, user_id: int, today: Optional[date] = None) -> ProgressSummary:
+    """
+    Dashboard totals for a user, read from the maintained aggregates with
+    one primary-key lookup. Step and hint events count once flushed.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    rows = db.execute(
+        select(UserSubjectStats, UserStreak)
+        .outerjoin(UserStreak, UserStreak.user_id == UserSubjectStats.user_id)
+        .filter(UserSubjectStats.user_id == user_id)
+        .order_by(UserSubjectStats.subject)
+    ).all()
+    subjects = [
+        SubjectSummary(
+            subject=stats.subject,
+            started=stats.started,
+            completed=stats.completed,
+            hints_used=stats.hints_used,
+            average_hints=_average(stats.hints_used, stats.started),
+        )
+        for stats, _ in rows
+    ]
+    started = sum(subject.started for subject in subjects)
+    hints_used = sum(subject.hints_used for subject in subjects)
+    streak = rows[0][1] if rows else None
+    current_streak = longest_streak = 0
+    last_completed_on = None
+    if streak is not None:
+        longest_streak = streak.longest_streak
+        last_completed_on = streak.last_completed_on
+        # A streak is current until a whole UTC day passes without a completion
+        if last_completed_on >= today - timedelta(days=1):
+            current_streak = streak.current_streak
+    return ProgressSummary(
+        started=started,
+        completed=sum(subject.completed for subject in subjects),
+        hints_used=hints_used,
+        average_hints=_average(hints_used, started),
+        current_streak=current_streak,
+        longest_streak=longest_streak,
+        last_completed_on=last_completed_on,
+        subjects=subjects,
+    )
+
+def _average(total: int, count: int) -> float:
+    return round(total / count, 2) if count else 0.0
+
+def subject_stats_statement() -> Select:
+    """Per user and subject totals computed from `user_progress`."""
+    return (
+        select(
+            UserProgress.user_id,
+            Problem.subject,
+            func.count().label("started"),
+            func.sum(case((UserProgress.completed.is_(True), 1), else_=0)).label("completed"),
+            func.coalesce(func.sum(UserProgress.hints_used), 0).label("hints_used"),
+        )
+        .join(Problem, Problem.id == UserProgress.problem_id)
+        .filter(Problem.subject.is_not(None))
+        .group_by(UserProgress.user_id, Problem.subject)
+    )
+
+def _utc_date(value: datetime) -> date:
+    return value.astimezone(timezone.utc).date() if value.tzinfo else value.date()
+
+def computed_streaks(db: Session) -> Dict[int, UserStreak]:
+    """Streaks recomputed from completion times, as unsaved rows by user id."""
+    rows = db.execute(
+        select(UserProgress.user_id, UserProgress.completed_at)
+        .filter(UserProgress.completed_at.is_not(None))
+        .order_by(UserProgress.user_id, UserProgress.completed_at)
+    )
+    streaks = {}
+    for user_id, completions in groupby(rows, key=itemgetter(0)):
+        streak = streaks[user_id] = UserStreak(user_id=user_id)
+        for _, completed_at in completions:
+            extend_streak(streak, _utc_date(completed_at))
+    return streaks
+
+def check_progress_summaries(db: Session) -> List[str]:
+    """Describe every aggregate row that differs from a recomputation."""
+    differences = []
+    expected = {
+        (row.user_id, row.subject): tuple(row)[2:]
+        for row in db.execute(subject_stats_statement())
+    }
+    stored = {
+        (stats.user_id, stats.subject): tuple(getattr(stats, field) for field in STAT_FIELDS)
+        for stats in db.scalars(select(UserSubjectStats))
+    }
+    for user_id, subject in sorted(expected.keys() | stored.keys()):
+        key = (user_id, subject)
+        if stored.get(key) != expected.get(key):
+            differences.append(
+                f"user {user_id} subject {subject!r}: "
+                f"stored {stored.get(key)}, expected {expected.get(key)}"
+            )
+
+    def streak_state(streak: UserStreak) -> tuple:
+        return (streak.current_streak, streak.longest_streak, streak.last_completed_on)
+
+    expected = {user_id: streak_state(streak) for user_id, streak in computed_streaks(db).items()}
+    stored = {streak.user_id: streak_state(streak) for streak in db.scalars(select(UserStreak))}
+    for user_id in sorted(expected.keys() | stored.keys()):
+        if stored.get(user_id) != expected.get(user_id):
+            differences.append(
+                f"user {user_id} streak: stored {stored.get(user_id)}, expected {expected.get(user_id)}"
+            )
+    return differences
+
+def rebuild_progress_summaries(db: Session) -> int:
+    """
+    Recompute every dashboard aggregate from `user_progress` and commit.
+
+    Returns the number of (user, subject) rows written.
+    """
+    db.execute(delete(UserSubjectStats))
+    db.execute(delete(UserStreak))
+    result = db.execute(insert(UserSubjectStats).from_select(
+        ["user_id", "subject", *STAT_FIELDS], subject_stats_statement()
+    ))
+    db.add_all(computed_streaks(db).values())
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,202 @@
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
+from app.core.config import settings
+from app.db.models import Problem, UserProgress
+from app.schemas.problem import Recommendations
+from app.services.prerequisite_graph import (
+    PrerequisiteGraph, get_prerequisite_graph, prerequisite_graph,
+)
+
+ProgressKey = Tuple[int, int]  # (user_id, problem_id)
+
+# Skill is estimated on the difficulty scale as a moving average of how each
+# completion went: a clean solve counts as performing half a level above the
+# problem, and every hint used takes a quarter level off, at most one level.
+INITIAL_SKILL = 1.0
+SKILL_RATE = 0.3
+SOLVE_BONUS = 0.5
+HINT_PENALTY = 0.25
+MAX_HINT_PENALTY = 1.0
+
+def update_skill(skill: float, difficulty: int, hints_used: int) -> float:
+    performance = difficulty + SOLVE_BONUS - min(HINT_PENALTY * (hints_used or 0), MAX_HINT_PENALTY)
+    return skill + SKILL_RATE * (performance - skill)
+
+class UserFrontier:
+    """
+    Recommendation state of one user: the problems they have completed,
+    their skill estimate and up to `frontier_size` unlocked candidates.
+    """
+
+    def __init__(self, completed: Set[int], skill: float):
+        self.completed = completed
+        self.skill = skill
+        self.loaded_at = time.monotonic()
+        self.candidates: Set[int] = set()
+        # More unlocked problems exist than the candidates hold
+        self.truncated = False
+        self.filled_skill = skill
+        self.catalog_version = -1
+
+class Recommender:
+    """
+    Per-user frontiers of unlocked problems, ranked by closeness to skill.
+
+    A user's frontier is computed once from the prerequisite graph and then
+    maintained as completions are committed: the completed problem leaves
+    it and any dependent whose prerequisites are now all complete joins it.
+    Only the `frontier_size` candidates closest to the user's skill are
+    kept; a truncated frontier is recomputed when it runs low or holds
+    fewer than a request asks for, when the skill estimate has moved a
+    whole level since, or when problems are added. States of up to
+    `max_users` users are kept, least recently used evicted first, and
+    reloaded after `ttl` seconds so progress written by other workers is
+    picked up.
+    """
+
+    def __init__(self, max_users: int, frontier_size: int, ttl: float):
+        self.max_users = max_users
+        self.frontier_size = frontier_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[int, UserFrontier]" = OrderedDict()
+        self._difficulty: Dict[int, int] = {}
+        self.catalog_version = 0
+
+    def reset(self):
+        with self._lock:
+            self._users.clear()
+            self._difficulty = {}
+            self.catalog_version += 1
+
+    def _sync_catalog(self, db: Session, graph: PrerequisiteGraph):
+        """Reload difficulties once the graph holds problems not seen yet."""
+        if len(graph) == len(self._difficulty):
+            return
+        difficulty = {
+            problem_id: value or 1
+            for problem_id, value in db.execute(select(Problem.id, Problem.difficulty))
+        }
+        with self._lock:
+            self._difficulty = difficulty
+            self.catalog_version += 1
+
+    def _score(self, problem_id: int, skill: float) -> Tuple[float, int]:
+        return abs(self._difficulty.get(problem_id, skill) - skill), problem_id
+
+    def _load_user(self, db: Session, user_id: int) -> UserFrontier:
+        """Replay a user's completions, in the order they happened."""
+        rows = db.execute(
+            select(UserProgress.problem_id, UserProgress.hints_used)
+            .filter(UserProgress.user_id == user_id, UserProgress.completed.is_(True))
+            .order_by(UserProgress.completed_at.asc().nulls_first(), UserProgress.id)
+        )
+        state = UserFrontier(set(), INITIAL_SKILL)
+        for problem_id, hints_used in rows:
+            state.completed.add(problem_id)
+            if problem_id in self._difficulty:
+                state.skill = update_skill(state.skill, self._difficulty[problem_id], hints_used)
+        return state
+
+    def _fill(self, state: UserFrontier, graph: PrerequisiteGraph):
+        unlocked = graph.unlocked(state.completed)
+        best = heapq.nsmallest(
+            self.frontier_size, unlocked, key=lambda problem_id: self._score(problem_id, state.skill)
+        )
+        state.candidates = set(best)
+        state.truncated = len(unlocked) > len(best)
+        state.filled_skill = state.skill
+        state.catalog_version = self.catalog_version
+
+    def _needs_fill(self, state: UserFrontier, limit: int) -> bool:
+        if state.catalog_version != self.catalog_version:
+            return True
+        return state.truncated and (
+            len(state.candidates) < max(min(limit, self.frontier_size), self.frontier_size // 2)
+            or abs(state.skill - state.filled_skill) >= 1
+        )
+
+    def _complete(self, state: UserFrontier, graph: PrerequisiteGraph,
+                  problem_id: int, hints_used: int):
+        if problem_id in state.completed:
+            return
+        state.completed.add(problem_id)
+        state.candidates.discard(problem_id)
+        if problem_id in self._difficulty:
+            state.skill = update_skill(state.skill, self._difficulty[problem_id], hints_used)
+        for dependent in graph.dependents(problem_id):
+            if dependent not in state.completed and graph.prerequisites(dependent) <= state.completed:
+                state.candidates.add(dependent)
+        while len(state.candidates) > self.frontier_size:
+            state.candidates.remove(max(
+                state.candidates, key=lambda candidate: self._score(candidate, state.skill)
+            ))
+            state.truncated = True
+
+    def record_completions(self, completions: Dict[ProgressKey, int]):
+        """
+        Apply committed first completions, with the hints each one used, to
+        the users whose state is loaded; others read them when loaded.
+        """
+        with self._lock:
+            if not prerequisite_graph.loaded:
+                # Frontiers cannot be extended without the graph; rebuild on read
+                self._users.clear()
+                return
+            for (user_id, problem_id), hints_used in completions.items():
+                state = self._users.get(user_id)
+                if state is not None:
+                    self._complete(state, prerequisite_graph, problem_id, hints_used)
+
+    def recommend(self, db: Session, user_id: int, limit: int) -> Tuple[float, List[int]]:
+        """A user's skill estimate and up to `limit` recommended problem ids."""
+        graph = get_prerequisite_graph(db)
+        self._sync_catalog(db, graph)
+        with self._lock:
+            state = self._users.get(user_id)
+            if state is not None and time.monotonic() - state.loaded_at > self.ttl:
+                del self._users[user_id]
+                state = None
+            elif state is not None:
+                self._users.move_to_end(user_id)
+        if state is None:
+            state = self._load_user(db, user_id)
+            with self._lock:
+                if self.max_users > 0:
+                    self._users[user_id] = state
+                    while len(self._users) > self.max_users:
+                        self._users.popitem(last=False)
+        with self._lock:
+            if self._needs_fill(state, limit):
+                self._fill(state, graph)
+            ranked = heapq.nsmallest(
+                limit, state.candidates, key=lambda problem_id: self._score(problem_id, state.skill)
+            )
+            return state.skill, ranked
+
+recommender = Recommender(
+    settings.RECOMMENDATION_MAX_USERS,
+    settings.RECOMMENDATION_FRONTIER_SIZE,
+    settings.RECOMMENDATION_STATE_TTL_SECONDS,
+)
+
+def get_recommendations(db: Session, user_id: int, limit: int) -> Recommendations:
+    """Unlocked problems nearest the user's skill, fetched with one query."""
+    skill, problem_ids = recommender.recommend(db, user_id, limit)
+    problems = {
+        problem.id: problem
+        for problem in db.scalars(
+            select(Problem)
+            .options(load_only(Problem.id, Problem.title, Problem.subject, Problem.difficulty))
+            .filter(Problem.id.in_(problem_ids))
+        )
+    }
+    return Recommendations(
+        skill=round(skill, 2),
+        problems=[problems[problem_id] for problem_id in problem_ids if problem_id in problems],
+    )
@@ -0,0 +1,163 @@
+import re
+from itertools import groupby
+from typing import Iterable, List, NamedTuple, Sequence
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+from app.db.models import Problem, Step, Hint
+from app.schemas.problem import ProblemSearchHit
+
+SEARCH_LIMIT = 20
+REINDEX_BATCH_SIZE = 1000
+
+# Relative weight of matches in the title, description and step/hint text
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 4.0
+BODY_WEIGHT = 1.0
+# The same weights as a ts_rank array, ordered D, C, B, A and scaled to 1
+_TS_RANK_WEIGHTS = "{%s}" % ", ".join(
+    str(weight / TITLE_WEIGHT)
+    for weight in (BODY_WEIGHT, BODY_WEIGHT, DESCRIPTION_WEIGHT, TITLE_WEIGHT)
+)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+class SearchDocument(NamedTuple):
+    problem_id: int
+    title: str
+    description: str
+    body: str
+
+def problem_document(problem_id: int, problem) -> SearchDocument:
+    """Build the indexed text of a problem from a `ProblemCreate`-like object."""
+    body = " ".join(
+        [step.content for step in sorted(problem.steps, key=lambda step: step.order)]
+        + [hint.content for hint in sorted(problem.hints, key=lambda hint: hint.order)]
+    )
+    return SearchDocument(problem_id, problem.title, problem.description, body)
+
+def index_documents(db: Session, documents: Iterable[SearchDocument]):
+    """
+    Add or replace search index entries. The caller commits, so entries are
+    written in the same transaction as the problems they describe.
+    """
+    rows = [document._asdict() for document in documents]
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        db.execute(text("DELETE FROM problem_search WHERE rowid = :problem_id"), rows)
+        db.execute(text(
+            "INSERT INTO problem_search (rowid, title, description, body) "
+            "VALUES (:problem_id, :title, :description, :body)"
+        ), rows)
+    elif dialect == "postgresql":
+        db.execute(text(
+            "INSERT INTO problem_search (problem_id, document) VALUES (:problem_id, "
+            "setweight(to_tsvector('english', :title), 'A') || "
+            "setweight(to_tsvector('english', :description), 'B') || "
+            "setweight(to_tsvector('english', :body), 'C')) "
+            "ON CONFLICT (problem_id) DO UPDATE SET document = excluded.document"
+        ), rows)
+
+def _load_documents(db: Session, problem_ids: Sequence[int]) -> List[SearchDocument]:
+    bodies = {problem_id: [] for problem_id in problem_ids}
+    for model in (Step, Hint):
+        rows = db.execute(
+            select(model.problem_id, model.content)
+            .filter(model.problem_id.in_(problem_ids))
+            .order_by(model.problem_id, model.order)
+        )
+        for problem_id, group in groupby(rows, key=lambda row: row.problem_id):
+            bodies[problem_id].extend(row.content for row in group)
+    problems = db.execute(
+        select(Problem.id, Problem.title, Problem.description)
+        .filter(Problem.id.in_(problem_ids))
+        .order_by(Problem.id)
+    )
+    return [
+        SearchDocument(row.id, row.title or "", row.description or "", " ".join(bodies[row.id]))
+        for row in problems
+    ]
+
+def rebuild_search_index(db: Session, batch_size: int = REINDEX_BATCH_SIZE) -> int:
+    """Rebuild the whole search index from the problem tables; returns the row count."""
+    if db.get_bind().dialect.name not in ("sqlite", "postgresql"):
+        return 0
+    db.execute(text("DELETE FROM problem_search"))
+    indexed, last_id = 0, 0
+    while True:
+        problem_ids = db.scalars(
+            select(Problem.id).filter(Problem.id > last_id).order_by(Problem.id).limit(batch_size)
+        ).all()
+        if not problem_ids:
+            break
+        index_documents(db, _load_documents(db, problem_ids))
+        indexed += len(problem_ids)
+        last_id = problem_ids[-1]
+    if db.get_bind().dialect.name == "sqlite":
+        # Merge the index segments written batch by batch
+        db.execute(text("INSERT INTO problem_search (problem_search) VALUES ('optimize')"))
+    db.commit()
+    return indexed
+
+def _fts5_query(tokens: List[str]) -> str:
+    """All terms must match; the last one may be a prefix (search as you type)."""
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+def _tsquery(tokens: List[str]) -> str:
+    """The same query for Postgres `to_tsquery`, where `:*` marks a prefix."""
+    quoted = [f"'{token}'" for token in tokens]
+    quoted[-1] += ":*"
+    return " & ".join(quoted)
+
+def search_problems(db: Session, query: str, limit: int = SEARCH_LIMIT) -> List[ProblemSearchHit]:
+    """
+    Rank problems matching every word of a query, best first.
+
+    Uses the prebuilt index (BM25 on SQLite, ts_rank on Postgres); higher
+    scores are better. Other databases fall back to an unranked substring
+    match on titles and descriptions.
+    """
+    tokens = _TOKEN.findall(query.lower())
+    if not tokens:
+        return []
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        # Rank inside the index and join only the top rows to problems
+        rows = db.execute(text(
+            "SELECT problems.id, problems.title, problems.subject, problems.difficulty, "
+            "hits.score FROM ("
+            "SELECT rowid, -bm25(problem_search, "
+            f"{TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}, {BODY_WEIGHT}) AS score "
+            "FROM problem_search WHERE problem_search MATCH :query "
+            "ORDER BY score DESC, rowid LIMIT :limit"
+            ") AS hits JOIN problems ON problems.id = hits.rowid "
+            "ORDER BY hits.score DESC, problems.id"
+        ), {"query": _fts5_query(tokens), "limit": limit})
+    elif dialect == "postgresql":
+        rows = db.execute(text(
+            "SELECT problems.id, problems.title, problems.subject, problems.difficulty, "
+            "hits.score FROM ("
+            "SELECT problem_id, "
+            "ts_rank(CAST(:weights AS float4[]), document, query) AS score "
+            "FROM problem_search, to_tsquery('english', :query) AS query "
+            "WHERE document @@ query "
+            "ORDER BY score DESC, problem_id LIMIT :limit"
+            ") AS hits JOIN problems ON problems.id = hits.problem_id "
+            "ORDER BY hits.score DESC, problems.id"
+        ), {"query": _tsquery(tokens), "weights": _TS_RANK_WEIGHTS, "limit": limit})
+    else:
+        conditions = [
+            or_(Problem.title.ilike(f"%{token}%"), Problem.description.ilike(f"%{token}%"))
+            for token in tokens
+        ]
+        rows = db.execute(
+            select(Problem.id, Problem.title, Problem.subject, Problem.difficulty)
+            .filter(*conditions)
+            .order_by(Problem.id)
+            .limit(limit)
+        )
+        return [ProblemSearchHit(**row._asdict(), score=0.0) for row in rows]
+    return [ProblemSearchHit(**row._asdict()) for row in rows]
@@ -0,0 +1,378 @@
+import ast
+import math
+import random
+import re
+import threading
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from fractions import Fraction
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models import Problem
+from app.schemas.validation import BatchAnswer, ValidationResult
+
+# Solution text format. Accepted answers are separated by "||"; each one is
+#   regex:<pattern>     matched case-insensitively against the whole answer
+#   3.14 ± 0.01         a number, optionally with an absolute (or "%" relative)
+#                       tolerance; "+-" and "+/-" also work, as do "x = 3" and 1/3
+#   2x^2 + 3x - 1       an expression in single-letter variables, equal to the
+#                       answer when both agree at a fixed set of sample points
+#   anything else       compared after case folding and whitespace collapsing
+ALTERNATIVE_SEPARATOR = "||"
+REGEX_PREFIX = "regex:"
+
+# Points each expression is evaluated at, and the range variables are drawn
+# from; positive values keep sqrt and log defined for typical answers
+SAMPLE_POINTS = 6
+SAMPLE_RANGE = (0.5, 3.0)
+ABSOLUTE_TOLERANCE = 1e-9
+
+_NUMBER = r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?"
+_NUMBER_RE = re.compile(_NUMBER)
+_FRACTION_RE = re.compile(rf"({_NUMBER})\s*/\s*({_NUMBER})")
+_THOUSANDS_RE = re.compile(r"[-+]?\d{1,3}(?:,\d{3})+(?:\.\d+)?")
+_ASSIGNMENT_RE = re.compile(r"[A-Za-z]\w*\s*=\s*")
+_TOLERANCE_RE = re.compile(rf"(.+?)\s*(?:±|\+/-|\+-)\s*({_NUMBER})\s*(%?)")
+_TOKEN_RE = re.compile(
+    r"\s*(?:(?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)"
+    r"|(?P<name>[A-Za-z]+)|(?P<op>\*\*|[-+*/^(),]))"
+)
+# Typographic operators students paste from documents
+_OPERATOR_TRANSLATION = str.maketrans({"×": "*", "·": "*", "÷": "/", "−": "-"})
+
+FUNCTIONS = {
+    "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "log": math.log, "ln": math.log, "exp": math.exp, "abs": abs,
+}
+CONSTANTS = {"pi": math.pi, "e": math.e}
+_EVAL_GLOBALS = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS}
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Constant, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd,
+)
+
+def normalize_text(text: str) -> str:
+    """Case-fold, collapse whitespace and drop trailing sentence punctuation."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(text.split()).rstrip(".!;,").strip()
+
+def parse_number(text: str) -> Optional[float]:
+    """
+    Parse a numeric answer such as "42", "-1.5e3", "1,000", "3/4" or "x = 2".
+
+    Returns None when the text is not a single number.
+    """
+    text = unicodedata.normalize("NFKC", text).strip().rstrip(".")
+    assignment = _ASSIGNMENT_RE.match(text)
+    if assignment:
+        text = text[assignment.end():]
+    if _NUMBER_RE.fullmatch(text):
+        return float(text)
+    if _THOUSANDS_RE.fullmatch(text):
+        return float(text.replace(",", ""))
+    fraction = _FRACTION_RE.fullmatch(text)
+    if fraction:
+        try:
+            return float(Fraction(fraction.group(1)) / Fraction(fraction.group(2)))
+        except (ValueError, ZeroDivisionError):
+            return None
+    return None
+
+class Expression(NamedTuple):
+    code: object  # compiled eval code
+    variables: FrozenSet[str]
+
+    def evaluate(self, point: Dict[str, float]) -> Optional[float]:
+        """Value at a point, or None outside the expression's real domain."""
+        try:
+            value = eval(self.code, _EVAL_GLOBALS, point)
+        except (ArithmeticError, ValueError, TypeError):
+            return None
+        if isinstance(value, complex) or not math.isfinite(value):
+            return None
+        return value
+
+class _FloatConstants(ast.NodeTransformer):
+    """Evaluate in floats, so huge powers overflow instead of growing integers."""
+
+    def visit_Constant(self, node):
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+def _tokens_to_source(text: str) -> Optional[str]:
+    """Tokenize math notation into Python source, making implicit products explicit."""
+    text = unicodedata.normalize("NFKC", text).translate(_OPERATOR_TRANSLATION).strip()
+    parts = []
+    previous = None  # kind of the previous token
+    position = 0
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if match is None or match.end() == position:
+            return None
+        position = match.end()
+        kind = match.lastgroup
+        token = match.group(kind)
+        opens = kind in ("number", "name") or token == "("
+        # 2x, 3(x + 1), (x + 1)(x - 1), x sin(x); but not sin(x)
+        if opens and (previous in ("number", "name") or previous == ")"):
+            if not (previous == "name" and parts[-1] in FUNCTIONS and token == "("):
+                parts.append("*")
+        parts.append("**" if token == "^" else token)
+        previous = token if kind == "op" else kind
+    return " ".join(parts)
+
+@lru_cache(maxsize=4096)
+def parse_expression(text: str) -> Optional[Expression]:
+    """
+    Compile an arithmetic expression in single-letter variables.
+
+    Only arithmetic, the functions in FUNCTIONS and the constants pi and e
+    are allowed; anything else (including multi-letter names) returns None.
+    """
+    source = _tokens_to_source(text)
+    if not source:
+        return None
+    try:
+        tree = ast.parse(source, mode="eval")
+    except (SyntaxError, ValueError, RecursionError):
+        return None
+    variables = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            return None
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+                return None
+            if node.keywords or len(node.args) != 1:
+                return None
+        elif isinstance(node, ast.Name):
+            if node.id in FUNCTIONS or node.id in CONSTANTS:
+                continue
+            if len(node.id) != 1:
+                return None
+            variables.add(node.id)
+    try:
+        # The transformer and the compiler both recurse over the tree
+        tree = ast.fix_missing_locations(_FloatConstants().visit(tree))
+        code = compile(tree, "<expression>", "eval")
+    except RecursionError:
+        return None
+    return Expression(code, frozenset(variables))
+
+def _close(value: float, expected: float, rel_tolerance: float) -> bool:
+    return math.isclose(value, expected, rel_tol=rel_tolerance, abs_tol=ABSOLUTE_TOLERANCE)
+
+class Matcher(ABC):
+    """A compiled accepted answer."""
+
+    kind = "none"
+
+    @abstractmethod
+    def matches(self, answer: str) -> bool:
+        ...
+
+class TextMatcher(Matcher):
+    kind = "text"
+
+    def __init__(self, expected: str):
+        self.expected = normalize_text(expected)
+
+    def matches(self, answer: str) -> bool:
+        return normalize_text(answer) == self.expected
+
+class RegexMatcher(Matcher):
+    kind = "regex"
+
+    def __init__(self, pattern: str):
+        self.pattern = re.compile(pattern, re.IGNORECASE)
+
+    def matches(self, answer: str) -> bool:
+        return self.pattern.fullmatch(" ".join(answer.split())) is not None
+
+class NumericMatcher(Matcher):
+    """A number within an absolute tolerance, or the default relative one."""
+
+    kind = "numeric"
+
+    def __init__(self, expected: float, tolerance: Optional[float] = None,
+                 rel_tolerance: Optional[float] = None):
+        self.expected = expected
+        self.tolerance = tolerance
+        if rel_tolerance is None:
+            rel_tolerance = settings.VALIDATION_REL_TOLERANCE
+        self.rel_tolerance = rel_tolerance
+
+    def matches(self, answer: str) -> bool:
+        value = parse_number(answer)
+        if value is None:
+            # Accept arithmetic without variables, e.g. "2 * 3" or "sqrt(2)"
+            expression = parse_expression(answer)
+            if expression is None or expression.variables:
+                return False
+            value = expression.evaluate({})
+            if value is None:
+                return False
+        if self.tolerance is not None:
+            return abs(value - self.expected) <= self.tolerance
+        return _close(value, self.expected, self.rel_tolerance)
+
+class ExpressionMatcher(Matcher):
+    """
+    Algebraic equivalence by sampling.
+
+    The solution is evaluated once, at compile time, at SAMPLE_POINTS fixed
+    pseudo-random points; an answer is equivalent when it uses no other
+    variables and agrees at every point where the solution is defined.
+    """
+
+    kind = "expression"
+
+    def __init__(self, expression: Expression, text: str):
+        self.variables = expression.variables
+        self.text = TextMatcher(text)
+        self.rel_tolerance = settings.VALIDATION_REL_TOLERANCE
+        rng = random.Random(0)
+        names = sorted(self.variables)
+        self.samples = []
+        for _ in range(SAMPLE_POINTS if names else 1):
+            point = {name: rng.uniform(*SAMPLE_RANGE) for name in names}
+            value = expression.evaluate(point)
+            if value is not None:
+                self.samples.append((point, value))
+
+    def matches(self, answer: str) -> bool:
+        if self.text.matches(answer):
+            return True
+        expression = parse_expression(answer)
+        if expression is None or not expression.variables <= self.variables:
+            return False
+        for point, expected in self.samples:
+            value = expression.evaluate(point)
+            if value is None or not _close(value, expected, self.rel_tolerance):
+                return False
+        return True
+
+class AnyOf(Matcher):
+    """Accepts an answer matching any of the alternatives."""
+
+    def __init__(self, alternatives: Sequence[Matcher]):
+        self.alternatives = tuple(alternatives)
+
+    @property
+    def kind(self) -> str:
+        return "|".join(alternative.kind for alternative in self.alternatives) or "none"
+
+    def matches(self, answer: str) -> bool:
+        return any(alternative.matches(answer) for alternative in self.alternatives)
+
+def compile_alternative(text: str) -> Matcher:
+    """Compile one accepted answer, picking the most specific matcher it parses as."""
+    text = text.strip()
+    if text.lower().startswith(REGEX_PREFIX):
+        try:
+            return RegexMatcher(text[len(REGEX_PREFIX):].strip())
+        except re.error:
+            return TextMatcher(text)
+    value = parse_number(text)
+    if value is not None:
+        return NumericMatcher(value)
+    tolerance = _TOLERANCE_RE.fullmatch(text)
+    if tolerance:
+        value = parse_number(tolerance.group(1))
+        if value is not None:
+            if tolerance.group(3):
+                return NumericMatcher(value, rel_tolerance=float(tolerance.group(2)) / 100)
+            return NumericMatcher(value, tolerance=abs(float(tolerance.group(2))))
+    # "y = 2x + 1" accepts the right-hand side
+    assignment = _ASSIGNMENT_RE.match(text)
+    body = text[assignment.end():] if assignment else text
+    expression = parse_expression(body)
+    # A bare variable or constant reads better as text ("x", "e")
+    if expression is None or body in (*expression.variables, *CONSTANTS):
+        return TextMatcher(text)
+    if not expression.variables:
+        value = expression.evaluate({})
+        return TextMatcher(text) if value is None else NumericMatcher(value)
+    matcher = ExpressionMatcher(expression, text)
+    return matcher if matcher.samples else TextMatcher(text)
+
+def compile_solution(solution: Optional[str]) -> AnyOf:
+    """Compile a stored solution into a matcher for all of its accepted answers."""
+    alternatives = (solution or "").split(ALTERNATIVE_SEPARATOR)
+    return AnyOf([compile_alternative(text) for text in alternatives if text.strip()])
+
+class SolutionMatchers:
+    """
+    Compiled solution matchers by problem id, least recently used evicted first.
+
+    Repeated submissions for a problem reuse its matcher, so the solution is
+    read and parsed once per process rather than per submission. Solutions
+    are not edited through the API; call `clear` after changing them directly.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Matcher]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, db: Session, problem_ids: Iterable[int]) -> Dict[int, Matcher]:
+        """Matchers for the given problems; unknown ids are left out."""
+        wanted = set(problem_ids)
+        found = {}
+        with self._lock:
+            for problem_id in wanted:
+                matcher = self._entries.get(problem_id)
+                if matcher is not None:
+                    self._entries.move_to_end(problem_id)
+                    found[problem_id] = matcher
+        missing = wanted - found.keys()
+        if missing:
+            rows = db.execute(
+                select(Problem.id, Problem.solution).filter(Problem.id.in_(missing))
+            )
+            compiled = {problem_id: compile_solution(solution) for problem_id, solution in rows}
+            found.update(compiled)
+            self._store(compiled)
+        return found
+
+    def _store(self, compiled: Dict[int, Matcher]):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries.update(compiled)
+            for problem_id in compiled:
+                self._entries.move_to_end(problem_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+solution_matchers = SolutionMatchers(settings.VALIDATION_MATCHER_CACHE_SIZE)
+
+def validate_answers(db: Session, answers: Sequence[BatchAnswer]) -> Optional[List[ValidationResult]]:
+    """
+    Check answers against their problems' solutions, in submission order.
+
+    Uncached solutions are loaded with one query. Returns None when any of
+    the problems does not exist.
+    """
+    matchers = solution_matchers.get_many(db, (answer.problem_id for answer in answers))
+    if len(matchers) < len({answer.problem_id for answer in answers}):
+        return None
+    return [
+        ValidationResult(
+            problem_id=answer.problem_id,
+            correct=matchers[answer.problem_id].matches(answer.answer),
+        )
+        for answer in answers
+    ]
+
+def validate_answer(db: Session, problem_id: int, answer: str) -> Optional[ValidationResult]:
+    """Check one answer; returns None when the problem does not exist."""
+    results = validate_answers(db, [BatchAnswer(problem_id=problem_id, answer=answer)])
+    return results[0] if results else None
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Sync vs async database stack load test.
+
+Serves the same catalog from the sync routers (threadpool + Session) and the
+async routers (AsyncSession) and reports requests/sec and latency for
+problem reads at a fixed number of concurrent clients.
+
+Usage (from the backend directory):
+    python -m benchmarks.async_vs_sync --clients 200 --duration 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_db_dir = tempfile.mkdtemp(prefix="lbd-bench-")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+)
+
+import httpx
+from fastapi import FastAPI
+
+from app.api import auth, problems, async_auth, async_problems
+from app.core.config import settings
+from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.schemas.problem import ProblemCreate, StepCreate, HintCreate
+from app.services.problem_service import create_problem
+from benchmarks.login_storm import percentile
+
+
+def build_app(async_stack: bool) -> FastAPI:
+    app = FastAPI()
+    routers = (async_auth, async_problems) if async_stack else (auth, problems)
+    for module in routers:
+        app.include_router(module.router, prefix=settings.API_V1_STR)
+    return app
+
+
+def seed(count: int) -> list:
+    db = SessionLocal()
+    try:
+        ids = []
+        for i in range(count):
+            problem = create_problem(db, ProblemCreate(
+                title=f"Problem {i}", subject="algebra", difficulty=i % 5,
+                description="Solve for x.", solution="x = 1",
+                steps=[StepCreate(order=j, content=f"Step {j}") for j in range(3)],
+                hints=[HintCreate(order=j, content=f"Hint {j}") for j in range(2)],
+                prerequisite_ids=[ids[-1]] if i % 4 else [],
+            ))
+            ids.append(problem.id)
+        return ids
+    finally:
+        db.close()
+
+
+async def client_loop(client, paths, deadline, samples, errors):
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        response = await client.get(path)
+        samples.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+
+async def run(app, paths, clients, duration):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", limits=limits
+    ) as client:
+        await client.get(paths[0])  # warm up
+        samples, errors = [], []
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*[
+            client_loop(client, paths, deadline, samples, errors) for _ in range(clients)
+        ])
+        elapsed = time.perf_counter() - start
+    return samples, errors, elapsed
+
+
+async def main(args):
+    init_db()
+    # Short prerequisite chains keep the eager-loaded trees bounded
+    ids = seed(args.problems)
+    paths = ["/api/v1/problems/?limit=20"] + [f"/api/v1/problems/{i}" for i in ids[:10]]
+
+    print(f"{args.clients} concurrent clients, {args.duration:.0f}s per stack\n")
+    for label, async_stack in (("sync", False), ("async", True)):
+        samples, errors, elapsed = await run(
+            build_app(async_stack), paths, args.clients, args.duration
+        )
+        print(
+            f"  {label:<6} {len(samples) / elapsed:8.1f} req/s  "
+            f"p50={percentile(samples, 50):7.1f} ms  "
+            f"p99={percentile(samples, 99):7.1f} ms  errors={len(errors)}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--clients", type=int, default=200, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per stack")
+    parser.add_argument("--problems", type=int, default=100, help="problems to seed")
+    asyncio.run(main(parser.parse_args()))
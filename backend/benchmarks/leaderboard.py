@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Leaderboard operation latency at scale.
+
+Builds a board of random completion counts, then times completion events,
+rank-of-user, top-N and around-me queries against it, next to the naive
+approach of sorting every score per query.
+
+Usage (from the backend directory):
+    python -m benchmarks.leaderboard --users 1000000 --operations 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.leaderboard import Leaderboard
+from benchmarks.login_storm import percentile
+
+
+def time_operation(operation, count, rng, users):
+    samples = []
+    for _ in range(count):
+        user_id = rng.randint(1, users)
+        start = time.perf_counter()
+        operation(user_id)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def report(label, samples):
+    total = sum(samples) / 1e6
+    print(
+        f"  {label:<18} p50={percentile(samples, 50):9.1f} us  "
+        f"p99={percentile(samples, 99):9.1f} us  {len(samples) / total:10.0f} ops/s"
+    )
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    # Skewed like real activity: most users complete a few problems
+    scores = {user_id: int(rng.paretovariate(1.5)) for user_id in range(1, args.users + 1)}
+    start = time.perf_counter()
+    board = Leaderboard(scores)
+    print(
+        f"Built a board of {len(board)} users in {time.perf_counter() - start:.2f} s\n"
+    )
+
+    report("completion", time_operation(lambda u: board.add(u, 1), args.operations, rng, args.users))
+    report("rank of user", time_operation(board.rank, args.operations, rng, args.users))
+    report("top 10", time_operation(lambda u: board.top(10), args.operations, rng, args.users))
+    report("around me (5)", time_operation(
+        lambda u: board.around(u, 5), args.operations, rng, args.users
+    ))
+
+    def naive_rank(user_id):
+        ranking = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [user for user, _ in ranking].index(user_id)
+
+    report("naive rank (sort)", time_operation(naive_rank, args.naive, rng, args.users))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=1000000, help="users on the board")
+    parser.add_argument("--operations", type=int, default=20000, help="timed calls per operation")
+    parser.add_argument("--naive", type=int, default=5, help="timed naive full-sort queries")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    main(parser.parse_args())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+List view payload benchmark.
+
+Compares a page of full `Problem` trees (the previous list response) with a
+page of `ProblemSummary` projections: response size and time to query and
+serialize the page.
+
+Usage (from the backend directory):
+    python -m benchmarks.list_payload --problems 1000 --limit 100
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_db_dir = tempfile.mkdtemp(prefix="lbd-bench-")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+)
+
+from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.schemas.problem import serialize_problem_summaries, serialize_problems
+from app.services.import_service import import_problems
+from app.services.problem_service import LIST_PREREQUISITE_DEPTH, get_problems_page
+from benchmarks.login_storm import percentile
+
+PARAGRAPH = (
+    "Work through the construction carefully, justify every step and check the "
+    "result against the special cases before moving on. "
+)
+
+
+def seed(count):
+    records = [
+        {
+            "ref": str(i),
+            "title": f"Rich problem {i}",
+            "subject": "geometry",
+            "difficulty": i % 5 + 1,
+            "description": PARAGRAPH * 15,
+            "solution": PARAGRAPH * 15,
+            "steps": [{"order": j, "content": PARAGRAPH * 2} for j in range(8)],
+            "hints": [{"order": j, "content": PARAGRAPH * 2} for j in range(5)],
+            # Short prerequisite chains, as in a real curriculum
+            "prerequisite_refs": [str(i - 1)] if i % 4 else [],
+        }
+        for i in range(count)
+    ]
+    db = SessionLocal()
+    try:
+        import_problems(db, records)
+    finally:
+        db.close()
+
+
+def measure(depth, serialize, limit, repeats):
+    samples, size = [], 0
+    for _ in range(repeats):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            page = get_problems_page(db, limit=limit, prerequisite_depth=depth)
+            size = len(serialize(page.items))
+            samples.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close()
+    return size, samples
+
+
+def main(args):
+    init_db()
+    seed(args.problems)
+    print(f"Page of {args.limit} problems, {args.repeats} runs each\n")
+    results = {}
+    for label, depth, serialize in (
+        ("full", LIST_PREREQUISITE_DEPTH, serialize_problems),
+        ("summary", None, serialize_problem_summaries),
+    ):
+        size, samples = measure(depth, serialize, args.limit, args.repeats)
+        results[label] = (size, percentile(samples, 50))
+        print(
+            f"  {label:<8} {size / 1024:9.1f} KiB  "
+            f"p50={percentile(samples, 50):7.2f} ms  p95={percentile(samples, 95):7.2f} ms"
+        )
+    (full_size, full_ms), (summary_size, summary_ms) = results["full"], results["summary"]
+    print(f"\n  payload {full_size / summary_size:.0f}x smaller, {full_ms / summary_ms:.1f}x faster")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--problems", type=int, default=1000, help="problems to seed")
+    parser.add_argument("--limit", type=int, default=100, help="page size")
+    parser.add_argument("--repeats", type=int, default=50, help="runs per variant")
+    main(parser.parse_args())
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+"""
+API load-testing suite.
+
+Seeds a synthetic catalog and user base from a fixed random seed, then
+drives register, token, /auth/me, the problems list and problem detail
+against the in-process ASGI app at a fixed concurrency. Every scenario
+reports throughput and p50/p95/p99 latency. Results can be stored as a
+baseline and later runs fail (exit code 1) when a scenario regresses past
+the tolerance.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.load_suite --baseline benchmarks/baseline.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_db_dir = tempfile.mkdtemp(prefix="lbd-bench-")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+)
+# Every simulated client shares one IP; measure the endpoints, not the limiter
+for _limit in (
+    "LOGIN_RATE_LIMIT_PER_IP", "LOGIN_RATE_LIMIT_PER_USERNAME", "REGISTER_RATE_LIMIT_PER_IP"
+):
+    os.environ.setdefault(_limit, "0")
+
+import httpx
+from sqlalchemy import insert
+
+from app.main import app
+from app.core.security import create_access_token, get_password_hash
+from app.db.init_db import init_db
+from app.db.models import User
+from app.db.session import SessionLocal
+from app.services.import_service import import_problems
+from benchmarks.login_storm import percentile
+
+PASSWORD = "loadtestpassword123"
+SUBJECTS = ["algebra", "geometry", "calculus", "statistics", "physics"]
+WORDS = "solve prove derive estimate integrate factor compare sketch justify measure".split()
+
+
+class Scenario(NamedTuple):
+    name: str
+    # Builds the request for the i-th call: (method, path, keyword arguments)
+    request: Callable[[int], tuple]
+    expected_status: int = 200
+
+
+def catalog_records(rng: random.Random, args) -> List[dict]:
+    """Synthetic problems; each may depend on up to three earlier problems."""
+    records = []
+    for i in range(args.problems):
+        candidates = range(max(0, i - 50), i)
+        prerequisites = [
+            str(j) for j in rng.sample(candidates, min(3, len(candidates)))
+            if rng.random() < args.prerequisite_density
+        ]
+        records.append({
+            "ref": str(i),
+            "title": f"{rng.choice(WORDS).title()} problem {i}",
+            "subject": rng.choice(SUBJECTS),
+            "difficulty": rng.randint(1, 5),
+            "description": " ".join(rng.choices(WORDS, k=60)),
+            "solution": " ".join(rng.choices(WORDS, k=20)),
+            "steps": [
+                {"order": j, "content": " ".join(rng.choices(WORDS, k=15))}
+                for j in range(args.steps)
+            ],
+            "hints": [
+                {"order": j, "content": " ".join(rng.choices(WORDS, k=10))}
+                for j in range(args.hints)
+            ],
+            "prerequisite_refs": prerequisites,
+        })
+    return records
+
+
+def seed(args) -> tuple:
+    """Seed problems and users; returns problem ids and usernames."""
+    init_db()
+    rng = random.Random(args.seed)
+    usernames = [f"load_user_{i}" for i in range(args.users)]
+    # Every seeded user shares one hash so seeding does not run bcrypt per user
+    hashed_password = get_password_hash(PASSWORD)
+    db = SessionLocal()
+    try:
+        result = import_problems(db, catalog_records(rng, args))
+        db.execute(insert(User), [
+            {
+                "email": f"{username}@example.com",
+                "username": username,
+                "hashed_password": hashed_password,
+                "is_active": True,
+            }
+            for username in usernames
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return sorted(result.ids_by_ref.values()), usernames
+
+
+def build_scenarios(problem_ids: List[int], usernames: List[str], run_id: str) -> List[Scenario]:
+    tokens = [create_access_token({"sub": username}) for username in usernames]
+    return [
+        Scenario("register", lambda i: ("POST", "/api/v1/auth/register", {"json": {
+            "email": f"new_{run_id}_{i}@example.com",
+            "username": f"new_{run_id}_{i}",
+            "password": PASSWORD,
+        }}), expected_status=201),
+        Scenario("token", lambda i: ("POST", "/api/v1/auth/token", {"data": {
+            "username": usernames[i % len(usernames)], "password": PASSWORD,
+        }})),
+        Scenario("me", lambda i: ("GET", "/api/v1/auth/me", {"headers": {
+            "Authorization": f"Bearer {tokens[i % len(tokens)]}",
+        }})),
+        Scenario("problems_list", lambda i: ("GET", "/api/v1/problems/", {"params": {
+            "limit": 20, "subject": SUBJECTS[i % len(SUBJECTS)],
+        }})),
+        Scenario("problem_detail", lambda i: (
+            "GET", f"/api/v1/problems/{problem_ids[i * 7919 % len(problem_ids)]}", {}
+        )),
+    ]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int,
+                       concurrency: int) -> dict:
+    """Send `requests` calls from `concurrency` workers and summarize them."""
+    samples: List[float] = []
+    errors: Dict[int, int] = {}
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            method, path, kwargs = scenario.request(i)
+            start = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            samples.append((time.perf_counter() - start) * 1000)
+            if response.status_code != scenario.expected_status:
+                errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(samples),
+        "throughput": round(len(samples) / elapsed, 1),
+        "p50_ms": round(percentile(samples, 50), 2),
+        "p95_ms": round(percentile(samples, 95), 2),
+        "p99_ms": round(percentile(samples, 99), 2),
+        "errors": errors,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """List regressions: lower throughput or higher p95 beyond the tolerance."""
+    regressions = []
+    for name, result in results.items():
+        if result["errors"]:
+            regressions.append(f"{name}: unexpected responses {result['errors']}")
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["throughput"] < expected["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result['throughput']} req/s, "
+                f"baseline {expected['throughput']} req/s"
+            )
+        if result["p95_ms"] > expected["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']} ms, baseline {expected['p95_ms']} ms"
+            )
+    return regressions
+
+
+def load_baseline(path: str, config: dict) -> Optional[dict]:
+    if not os.path.exists(path):
+        print(f"No baseline at {path}; run with --save-baseline to create one")
+        return None
+    with open(path) as stream:
+        stored = json.load(stream)
+    if stored.get("config") != config:
+        print(f"Warning: baseline was recorded with {stored.get('config')}")
+    return stored["scenarios"]
+
+
+async def main(args) -> int:
+    config = {
+        "problems": args.problems, "steps": args.steps, "hints": args.hints,
+        "prerequisite_density": args.prerequisite_density, "users": args.users,
+        "requests": args.requests, "concurrency": args.concurrency, "seed": args.seed,
+    }
+    problem_ids, usernames = seed(args)
+    scenarios = build_scenarios(problem_ids, usernames, run_id=os.urandom(4).hex())
+    selected = [s for s in scenarios if not args.only or s.name in args.only]
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    limits = httpx.Limits(max_connections=None)
+    results = {}
+    print(
+        f"{args.problems} problems, {args.users} users, "
+        f"{args.requests} requests per scenario at concurrency {args.concurrency}\n"
+    )
+    async with app.router.lifespan_context(app), httpx.AsyncClient(
+        transport=transport, base_url="http://bench", limits=limits
+    ) as client:
+        for scenario in selected:
+            # Warm up caches and worker processes outside the measured run
+            await run_scenario(client, scenario._replace(
+                request=lambda i, s=scenario: s.request(args.requests + i)
+            ), min(20, args.requests), 1)
+            result = results[scenario.name] = await run_scenario(
+                client, scenario, args.requests, args.concurrency
+            )
+            print(
+                f"  {scenario.name:<15} {result['throughput']:8.1f} req/s  "
+                f"p50={result['p50_ms']:7.1f} ms  p95={result['p95_ms']:7.1f} ms  "
+                f"p99={result['p99_ms']:7.1f} ms  errors={sum(result['errors'].values())}"
+            )
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as stream:
+            json.dump({
+                "config": config,
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "scenarios": results,
+            }, stream, indent=2, sort_keys=True)
+            stream.write("\n")
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    baseline = load_baseline(args.baseline, config) if args.baseline else {}
+    regressions = compare(results, baseline or {}, args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--problems", type=int, default=500, help="problems to seed")
+    parser.add_argument("--steps", type=int, default=5, help="steps per problem")
+    parser.add_argument("--hints", type=int, default=3, help="hints per problem")
+    parser.add_argument("--prerequisite-density", type=float, default=0.3,
+                        help="chance that each of three candidate prerequisites is kept")
+    parser.add_argument("--users", type=int, default=200, help="users to seed")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the catalog")
+    parser.add_argument("--only", nargs="*", help="scenarios to run (default: all)")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", help="write this run's results as a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative drop in throughput or rise in p95")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Login storm benchmark.
+
+Measures /api/v1/health and /api/v1/problems/ latency while many clients hit
+/api/v1/auth/token at once, first with bcrypt running inline on request
+threads and then with the bounded hashing process pool.
+
+Usage (from the backend directory):
+    python -m benchmarks.login_storm --storm 64 --duration 5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_db_dir = tempfile.mkdtemp(prefix="lbd-bench-")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+)
+# The storm measures bcrypt scheduling, not the login rate limiter
+os.environ.setdefault("LOGIN_RATE_LIMIT_PER_IP", "0")
+os.environ.setdefault("LOGIN_RATE_LIMIT_PER_USERNAME", "0")
+
+import httpx
+
+from app.main import app
+from app.core import security
+from app.core.hashing_pool import PasswordHashingPool
+from app.db.init_db import init_db
+
+USERNAME = "storm_user"
+PASSWORD = "stormpassword123"
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of a list of samples."""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def seed(client):
+    await client.post("/api/v1/auth/register", json={
+        "email": "storm@example.com", "username": USERNAME, "password": PASSWORD
+    })
+    for i in range(50):
+        await client.post("/api/v1/problems/", json={
+            "title": f"Problem {i}", "subject": "algebra", "difficulty": i % 5,
+            "description": "Solve it.", "solution": "1",
+            "steps": [{"order": 1, "content": "Think"}],
+            "hints": [{"order": 1, "content": "Harder"}],
+        })
+
+
+async def login_loop(client, stop, outcomes):
+    while not stop.is_set():
+        response = await client.post(
+            "/api/v1/auth/token", data={"username": USERNAME, "password": PASSWORD}
+        )
+        outcomes[response.status_code] = outcomes.get(response.status_code, 0) + 1
+
+
+async def probe_loop(client, path, stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(path)
+        samples.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def measure(client, storm, duration):
+    stop = asyncio.Event()
+    outcomes = {}
+    samples = {"/api/v1/health": [], "/api/v1/problems/?limit=20": []}
+    tasks = [asyncio.create_task(login_loop(client, stop, outcomes)) for _ in range(storm)]
+    tasks += [
+        asyncio.create_task(probe_loop(client, path, stop, path_samples))
+        for path, path_samples in samples.items()
+    ]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return samples, outcomes
+
+
+def report(label, samples, outcomes):
+    print(f"\n{label}")
+    print("-" * 72)
+    for path, path_samples in samples.items():
+        print(
+            f"  {path:<32} n={len(path_samples):<5} "
+            f"p50={percentile(path_samples, 50):8.1f} ms  "
+            f"p99={percentile(path_samples, 99):8.1f} ms"
+        )
+    if outcomes:
+        print(f"  login responses by status: {dict(sorted(outcomes.items()))}")
+
+
+async def main(args):
+    init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await seed(client)
+
+        modes = [
+            ("inline bcrypt on request threads", PasswordHashingPool(0, args.storm)),
+            (
+                f"hashing pool ({args.workers} workers, {args.pending} pending)",
+                PasswordHashingPool(args.workers, args.pending),
+            ),
+        ]
+        samples, _ = await measure(client, 0, args.duration)
+        report("idle (no login storm)", samples, {})
+        for label, pool in modes:
+            security.hashing_pool = pool
+            # Warm up worker processes outside the measured window
+            pool.run(security._hash_password, "warmup")
+            samples, outcomes = await measure(client, args.storm, args.duration)
+            report(f"login storm x{args.storm}: {label}", samples, outcomes)
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--storm", type=int, default=64, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per phase")
+    parser.add_argument("--workers", type=int, default=2, help="hashing pool workers")
+    parser.add_argument("--pending", type=int, default=8, help="hashing pool queue depth")
+    asyncio.run(main(parser.parse_args()))
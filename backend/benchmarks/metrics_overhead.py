@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Metrics overhead benchmark.
+
+Times a trivial endpoint with and without MetricsMiddleware, and a
+`SELECT 1` loop with and without the SQL statement hooks, to check that
+instrumentation stays negligible next to real request and query costs.
+
+Usage (from the backend directory):
+    python -m benchmarks.metrics_overhead --requests 2000 --statements 20000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import MetricsMiddleware, registry
+from app.db.session import instrument_engine
+from benchmarks.login_storm import percentile
+
+
+def build_app(instrumented):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def time_requests(app, count):
+    samples = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(50):  # warm up
+            await client.get(f"/items/{i}")
+        for i in range(count):
+            start = time.perf_counter()
+            await client.get(f"/items/{i}")
+            samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def time_statements(instrumented, count):
+    engine = create_engine("sqlite:///:memory:")
+    if instrumented:
+        instrument_engine(engine)
+    with engine.connect() as connection:
+        statement = text("SELECT 1")
+        start = time.perf_counter()
+        for _ in range(count):
+            connection.execute(statement).scalar()
+        elapsed = time.perf_counter() - start
+    engine.dispose()
+    return elapsed / count * 1e6
+
+
+def main(args):
+    print(f"Requests: {args.requests} sequential GETs per variant")
+    results = {}
+    for label, instrumented in (("plain", False), ("instrumented", True)):
+        samples = asyncio.run(time_requests(build_app(instrumented), args.requests))
+        results[label] = percentile(samples, 50)
+        print(
+            f"  {label:<13} p50={results[label]:8.1f} us  "
+            f"p95={percentile(samples, 95):8.1f} us"
+        )
+    print(f"  overhead      {results['instrumented'] - results['plain']:8.1f} us per request\n")
+
+    print(f"SQL: {args.statements} SELECT 1 statements per variant")
+    plain = time_statements(False, args.statements)
+    instrumented = time_statements(True, args.statements)
+    print(f"  plain         {plain:8.2f} us per statement")
+    print(f"  instrumented  {instrumented:8.2f} us per statement")
+    print(f"  overhead      {instrumented - plain:8.2f} us per statement")
+    registry.clear()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per variant")
+    parser.add_argument("--statements", type=int, default=20000, help="statements per variant")
+    main(parser.parse_args())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Password verify latency per hash cost.
+
+Times verifying a password against bcrypt hashes of increasing rounds, and
+argon2 when argon2-cffi is installed, then shows the cost the startup
+calibration would pick for a target verify time.
+
+Usage (from the backend directory):
+    python -m benchmarks.password_cost --min-rounds 10 --max-rounds 14 --target-ms 250
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from passlib.exc import MissingBackendError
+
+from app.core.security import PasswordPolicy, calibrate_bcrypt_rounds, crypt_context
+from benchmarks.login_storm import percentile
+
+PASSWORD = "benchmarkpassword123"
+
+
+def time_verify(policy, repeats):
+    context = crypt_context(policy)
+    hashed = context.hash(PASSWORD)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        context.verify(PASSWORD, hashed)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    print(
+        f"  {label:<16} p50={percentile(samples, 50):8.1f} ms  "
+        f"p95={percentile(samples, 95):8.1f} ms  "
+        f"{1000 / percentile(samples, 50):7.1f} verifies/s per core"
+    )
+
+
+def main(args):
+    print(f"Verify latency, {args.repeats} runs per setting\n")
+    for rounds in range(args.min_rounds, args.max_rounds + 1):
+        samples = time_verify(PasswordPolicy("bcrypt", rounds), args.repeats)
+        report(f"bcrypt {rounds} rounds", samples)
+    try:
+        report("argon2 defaults", time_verify(PasswordPolicy("argon2"), args.repeats))
+    except MissingBackendError:
+        print("  argon2           skipped (pip install argon2-cffi)")
+
+    rounds = calibrate_bcrypt_rounds(args.target_ms, args.min_rounds, args.max_rounds)
+    print(f"\nCalibration for a {args.target_ms} ms target picks {rounds} bcrypt rounds")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--min-rounds", type=int, default=10, help="lowest bcrypt cost")
+    parser.add_argument("--max-rounds", type=int, default=14, help="highest bcrypt cost")
+    parser.add_argument("--target-ms", type=float, default=250, help="calibration target")
+    parser.add_argument("--repeats", type=int, default=10, help="verifies per setting")
+    main(parser.parse_args())
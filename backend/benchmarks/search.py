@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+Full-text search benchmark.
+
+Seeds a synthetic catalog, builds the search index and reports query latency
+for one-word, multi-word and prefix queries. The target is p95 under 10 ms
+at 100k problems.
+
+Usage (from the backend directory):
+    python -m benchmarks.search --problems 100000 --queries 500
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_db_dir = tempfile.mkdtemp(prefix="lbd-bench-")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI", f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+)
+
+from sqlalchemy import insert
+
+from app.db.init_db import init_db
+from app.db.models import Problem, Step, Hint
+from app.db.session import SessionLocal
+from app.services.search_service import rebuild_search_index, search_problems
+from benchmarks.login_storm import percentile
+
+SUBJECTS = ["algebra", "geometry", "calculus", "probability", "number theory", "combinatorics"]
+FILLER = ["find", "compute", "show", "value", "given", "each", "using", "first", "result", "then"]
+SYLLABLES = [c + v for c in "bdfklmnprst" for v in "aeiou"]
+
+
+def make_vocabulary(rng, size):
+    """Distinct pseudo-words standing in for a catalog's topic vocabulary."""
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(3)))
+    return sorted(words)
+
+
+def sentence(rng, topics, words=12):
+    # Roughly a third topic words; the rest is common filler and rare terms
+    return " ".join(
+        rng.choice(topics) if rng.random() < 0.3
+        else rng.choice(FILLER) if rng.random() < 0.9
+        else f"term{rng.randrange(50000)}"
+        for _ in range(words)
+    )
+
+
+def seed(count, topics, batch_size=5000):
+    rng = random.Random(42)
+    db = SessionLocal()
+    try:
+        for start in range(1, count + 1, batch_size):
+            ids = range(start, min(start + batch_size, count + 1))
+            db.execute(insert(Problem), [
+                {
+                    "id": i,
+                    "title": f"{rng.choice(topics).title()} {rng.choice(topics)} problem {i}",
+                    "subject": rng.choice(SUBJECTS),
+                    "difficulty": rng.randint(1, 5),
+                    "description": sentence(rng, topics, 30),
+                    "solution": "42",
+                }
+                for i in ids
+            ])
+            db.execute(insert(Step), [
+                {"problem_id": i, "order": j, "content": sentence(rng, topics)}
+                for i in ids for j in range(3)
+            ])
+            db.execute(insert(Hint), [
+                {"problem_id": i, "order": j, "content": sentence(rng, topics, 8)}
+                for i in ids for j in range(2)
+            ])
+        db.commit()
+        start = time.perf_counter()
+        rebuild_search_index(db)
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def main(args):
+    init_db()
+    topics = make_vocabulary(random.Random(1), args.topics)
+    print(f"Seeding {args.problems} problems...")
+    build_seconds = seed(args.problems, topics)
+    print(f"Index built in {build_seconds:.1f}s\n")
+
+    rng = random.Random(7)
+    workloads = {
+        "one word": lambda: rng.choice(topics),
+        "two words": lambda: f"{rng.choice(topics)} {rng.choice(topics)}",
+        "rare term": lambda: f"term{rng.randrange(50000)}",
+        "prefix": lambda: rng.choice(topics)[:5],
+    }
+    db = SessionLocal()
+    try:
+        for label, make_query in workloads.items():
+            search_problems(db, make_query())  # warm up
+            samples = []
+            for _ in range(args.queries):
+                query = make_query()
+                start = time.perf_counter()
+                search_problems(db, query, limit=args.limit)
+                samples.append((time.perf_counter() - start) * 1000)
+            print(
+                f"  {label:<10} p50={percentile(samples, 50):6.2f} ms  "
+                f"p95={percentile(samples, 95):6.2f} ms  "
+                f"p99={percentile(samples, 99):6.2f} ms"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--problems", type=int, default=100_000, help="problems to seed")
+    parser.add_argument("--topics", type=int, default=500, help="distinct topic words")
+    parser.add_argument("--queries", type=int, default=500, help="queries per workload")
+    parser.add_argument("--limit", type=int, default=20, help="results per query")
+    main(parser.parse_args())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Response serialization micro-benchmark.
+
+Times turning 100 ORM problems (with steps, hints and a prerequisite) into
+response bytes: FastAPI's default path (response_model validation, then
+jsonable_encoder, then stdlib json) against model_response (one validation
+from attributes, dumped by pydantic-core).
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization --problems 100 --repeats 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import FastJSONResponse, model_response
+from app.db.models import Problem as ProblemModel, Step, Hint
+from app.schemas.problem import Problem
+from benchmarks.login_storm import percentile
+
+
+def build_problems(count):
+    problems = []
+    for i in range(count):
+        problems.append(ProblemModel(
+            id=i + 1,
+            title=f"Problem {i}",
+            subject="algebra",
+            difficulty=i % 5,
+            description="Solve for x. " * 20,
+            solution="x = 1",
+            steps=[Step(id=i * 10 + j, problem_id=i + 1, order=j, content=f"Step {j} " * 10)
+                   for j in range(5)],
+            hints=[Hint(id=i * 10 + j, problem_id=i + 1, order=j, content=f"Hint {j} " * 10)
+                   for j in range(3)],
+            prerequisites=[problems[-1]] if i % 4 else [],
+        ))
+    return problems
+
+
+def default_path(field, problems):
+    content = asyncio.run(serialize_response(field=field, response_content=problems))
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_path(problems):
+    return model_response(List[Problem], problems).body
+
+
+def time_it(func, repeats):
+    func()  # warm up
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main(args):
+    problems = build_problems(args.problems)
+    field = create_response_field(name="response", type_=List[Problem])
+    orjson_path = lambda: FastJSONResponse(
+        jsonable_encoder(asyncio.run(serialize_response(field=field, response_content=problems)))
+    ).body
+
+    print(f"Serializing {args.problems} problems, {args.repeats} runs each\n")
+    baseline = None
+    for label, func in (
+        ("default", lambda: default_path(field, problems)),
+        ("orjson", orjson_path),
+        ("model_response", lambda: fast_path(problems)),
+    ):
+        samples = time_it(func, args.repeats)
+        p50 = percentile(samples, 50)
+        baseline = baseline or p50
+        print(
+            f"  {label:<15} p50={p50:7.2f} ms  p95={percentile(samples, 95):7.2f} ms  "
+            f"{baseline / p50:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--problems", type=int, default=100, help="problems per response")
+    parser.add_argument("--repeats", type=int, default=200, help="timed runs per path")
+    main(parser.parse_args())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Answer validation throughput.
+
+Builds solutions of every matcher kind and times validating answers
+against them, compiling the solution on every check (the cold path) and
+with the compiled matcher reused (as the per-problem cache serves repeat
+submissions). Runs in one process, so the rates are per core.
+
+Usage (from the backend directory):
+    python -m benchmarks.validation --validations 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.validation_service import compile_solution, parse_expression
+
+# (solution, correct answer, wrong answer) per matcher kind
+CASES = {
+    "text": ("Photosynthesis", "  photosynthesis. ", "respiration"),
+    "regex": (r"regex:\d+ (apples|pears)", "12 Apples", "twelve apples"),
+    "numeric": ("3.14 ± 0.01", "3.145", "3.2"),
+    "expression": ("(x + 1)^2 - 2y", "x^2 + 2x + 1 - 2y", "x^2 + 1 - 2y"),
+    "alternatives": ("4 || four || regex:iv", "Four", "five"),
+}
+
+
+def rate(check, answers, count):
+    """Validations per second over `count` calls alternating the answers."""
+    start = time.perf_counter()
+    for i in range(count):
+        check(answers[i % len(answers)])
+    return count / (time.perf_counter() - start)
+
+
+def main(args):
+    print(f"{args.validations} validations per kind, one core\n")
+    print(f"  {'kind':<13} {'compiled each time':>20} {'cached matcher':>18} {'speedup':>8}")
+    for kind, (solution, *answers) in CASES.items():
+        matcher = compile_solution(solution)
+        assert matcher.matches(answers[0]) and not matcher.matches(answers[1]), kind
+
+        def cold(answer):
+            # Clear the expression cache too, as a fresh parse would
+            parse_expression.cache_clear()
+            return compile_solution(solution).matches(answer)
+
+        cold_rate = rate(cold, answers, max(1, args.validations // 10))
+        warm_rate = rate(matcher.matches, answers, args.validations)
+        print(
+            f"  {kind:<13} {cold_rate:>14.0f} val/s {warm_rate:>12.0f} val/s "
+            f"{warm_rate / cold_rate:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--validations", type=int, default=50000,
+                        help="cached validations per kind (cold runs a tenth)")
+    main(parser.parse_args())
@@ -108,3 +108,106 @@ class TestAuthAPI:
         response = client.get("/api/v1/auth/me")
         assert response.status_code == 401
         assert "Not authenticated" in response.json()["detail"]
+
+    def test_current_user_is_cached_until_user_changes(self, client, db_session, query_counter):
+        """Test that repeat authenticated calls skip the database until the user changes."""
+        from app.db.models import User
+
+        user_data = {
+            "email": "cacheduser@example.com",
+            "username": "cacheduser",
+            "password": "securepassword123"
+        }
+        assert client.post("/api/v1/auth/register", json=user_data).status_code == 201
+        response = client.post(
+            "/api/v1/auth/token",
+            data={"username": "cacheduser", "password": "securepassword123"},
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+        query_counter.clear()
+        response = client.get("/api/v1/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["email"] == "cacheduser@example.com"
+        assert query_counter == []
+
+        # Deactivating the user must invalidate the cached snapshot
+        user = db_session.query(User).filter(User.username == "cacheduser").one()
+        user.is_active = False
+        db_session.commit()
+        query_counter.clear()
+        response = client.get("/api/v1/auth/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["is_active"] is False
+        assert len(query_counter) > 0
+
+    def test_register_when_hashing_pool_is_saturated(self, client, monkeypatch):
+        """Test that registration returns 503 with Retry-After when hashing is saturated."""
+        from app.core import security
+        from app.core.hashing_pool import PasswordHashingBusy
+
+        def saturated(*args):
+            raise PasswordHashingBusy(retry_after=2)
+
+        monkeypatch.setattr(security.hashing_pool, "run", saturated)
+        user_data = {
+            "email": "busyuser@example.com",
+            "username": "busyuser",
+            "password": "securepassword123"
+        }
+        response = client.post("/api/v1/auth/register", json=user_data)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
+
+    def test_login_rate_limit_rejects_before_hashing(self, client, monkeypatch):
+        """Test that over-limit logins get 429 without verifying the password."""
+        from app.core import rate_limit, security
+
+        monkeypatch.setattr(rate_limit.login_username_limiter, "limit", 3)
+        calls = []
+
+        def counting_run(fn, *args):
+            calls.append(fn)
+            return False
+
+        monkeypatch.setattr(security.hashing_pool, "run", counting_run)
+        form = {"username": "limiteduser", "password": "wrongpassword"}
+        for _ in range(3):
+            response = client.post("/api/v1/auth/token", data=form)
+            assert response.status_code == 401
+        hashed = len(calls)
+
+        response = client.post("/api/v1/auth/token", data=form)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert len(calls) == hashed
+        assert rate_limit.rate_limit_checks.value(
+            limiter="login_username", outcome="rejected"
+        ) >= 1
+
+        # Other usernames still have their own budget
+        response = client.post(
+            "/api/v1/auth/token", data={"username": "otheruser", "password": "wrongpassword"}
+        )
+        assert response.status_code == 401
+
+    def test_forwarded_for_ignored_from_untrusted_peer(self, client, monkeypatch):
+        """Test that X-Forwarded-For cannot dodge the per-IP limit without a trusted proxy."""
+        from app.core import rate_limit
+
+        monkeypatch.setattr(rate_limit.register_ip_limiter, "limit", 2)
+        statuses = []
+        for i in range(3):
+            response = client.post(
+                "/api/v1/auth/register",
+                json={
+                    "email": f"spoofer{i}@example.com",
+                    "username": f"spoofer{i}",
+                    "password": "securepassword123"
+                },
+                headers={"X-Forwarded-For": f"198.51.100.{i}"},
+            )
+            statuses.append(response.status_code)
+        assert statuses == [201, 201, 429]
@@ -0,0 +1,31 @@
+from app.db.models import Problem
+
+
+class TestLeaderboardAPI:
+    """Test leaderboard endpoints."""
+
+    def test_leaderboard_and_standing(self, client, db_session, test_user_token):
+        """Test that a completion shows up on the global and subject boards."""
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        response = client.get("/api/v1/leaderboard/me", headers=headers)
+        assert response.status_code == 200
+        assert response.json() == {"rank": None, "score": 0, "players": 0, "around": []}
+
+        problem = Problem(title="Leaderboard API", subject="ranking", difficulty=1,
+                          description="d", solution="s")
+        db_session.add(problem)
+        db_session.commit()
+        client.put(f"/api/v1/progress/{problem.id}", json={"completed": True}, headers=headers)
+
+        response = client.get("/api/v1/leaderboard/", params={"subject": "ranking"})
+        assert response.status_code == 200
+        [entry] = response.json()
+        assert (entry["rank"], entry["score"]) == (1, 1)
+        standing = client.get("/api/v1/leaderboard/me", headers=headers).json()
+        assert (standing["rank"], standing["score"], standing["players"]) == (1, 1, 1)
+        assert standing["around"][0]["username"] == entry["username"]
+
+    def test_leaderboard_errors(self, client):
+        """Test authentication and query validation."""
+        assert client.get("/api/v1/leaderboard/me").status_code == 401
+        assert client.get("/api/v1/leaderboard/", params={"limit": 0}).status_code == 422
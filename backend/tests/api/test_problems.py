@@ -0,0 +1,389 @@
+import json
+import pytest
+from fastapi import status
+
+from app.core.pagination import encode_cursor
+from app.db.models import Problem
+from app.schemas.problem import ProblemCreate, StepCreate, HintCreate
+from app.services.problem_service import create_problem
+
+
+def make_problem(db_session, title, prerequisite_ids=None, subject="geometry", difficulty=2):
+    """Create a problem with two steps and two hints."""
+    return create_problem(db_session, ProblemCreate(
+        title=title,
+        subject=subject,
+        difficulty=difficulty,
+        description=f"Description of {title}",
+        solution="42",
+        steps=[StepCreate(order=i, content=f"Step {i}") for i in range(2)],
+        hints=[HintCreate(order=i, content=f"Hint {i}") for i in range(2)],
+        prerequisite_ids=prerequisite_ids or [],
+    ))
+
+
+@pytest.fixture(scope="function")
+def problem_catalog(db_session):
+    """Create a catalog whose prerequisite trees are two levels deep."""
+    roots = [make_problem(db_session, f"Root {i}") for i in range(3)]
+    middles = [
+        make_problem(db_session, f"Middle {i}", [roots[i % len(roots)].id])
+        for i in range(6)
+    ]
+    leaves = [
+        make_problem(db_session, f"Leaf {i}", [middles[i % len(middles)].id])
+        for i in range(20)
+    ]
+    problem_ids = [problem.id for problem in roots + middles + leaves]
+    db_session.expunge_all()
+    return problem_ids
+
+
+class TestProblemsAPI:
+    """Test problem API endpoints."""
+
+    def test_create_and_read_problem(self, client):
+        """Test creating a problem and reading it back."""
+        problem_data = {
+            "title": "Area of a triangle",
+            "subject": "geometry",
+            "difficulty": 1,
+            "description": "Find the area.",
+            "solution": "6",
+            "steps": [{"order": 1, "content": "Use base times height over two"}],
+            "hints": [{"order": 1, "content": "The base is 4"}],
+            "prerequisite_ids": [],
+        }
+        response = client.post("/api/v1/problems/", json=problem_data)
+        assert response.status_code == status.HTTP_201_CREATED
+        created = response.json()
+        assert created["title"] == problem_data["title"]
+        assert len(created["steps"]) == 1
+        assert len(created["hints"]) == 1
+
+        response = client.get(f"/api/v1/problems/{created['id']}")
+        assert response.status_code == 200
+        assert response.json()["id"] == created["id"]
+
+        response = client.get("/api/v1/problems/999999")
+        assert response.status_code == 404
+
+    def test_list_query_count_is_independent_of_page_size(
+        self, client, db_session, problem_catalog, query_counter
+    ):
+        """Test that listing problems issues a constant number of statements."""
+        leaves = problem_catalog[-20:]
+        skip = db_session.query(Problem).filter(Problem.id < leaves[0]).count()
+        counts = []
+        for limit in (5, len(leaves)):
+            db_session.expunge_all()
+            query_counter.clear()
+            response = client.get(f"/api/v1/problems/?skip={skip}&limit={limit}")
+            assert response.status_code == 200
+            assert len(response.json()) == limit
+            counts.append(len(query_counter))
+        assert counts[0] > 0
+        assert counts[0] == counts[1]
+
+    def test_list_returns_summaries(self, client, db_session, problem_catalog, query_counter):
+        """Test that list views carry summaries and never load long columns."""
+        leaf_id = problem_catalog[-1]
+        skip = db_session.query(Problem).filter(Problem.id < leaf_id).count()
+        db_session.expunge_all()
+        query_counter.clear()
+        response = client.get("/api/v1/problems/", params={"skip": skip, "limit": 1})
+        summary = response.json()[0]
+        assert summary["id"] == leaf_id
+        assert set(summary) == {
+            "id", "title", "subject", "difficulty", "preview", "step_count", "prerequisite_ids"
+        }
+        assert summary["preview"] == "Description of Leaf 19"
+        assert summary["step_count"] == 2
+        assert summary["prerequisite_ids"] == [problem_catalog[3 + 19 % 6]]
+        # One SELECT for the page and one for prerequisite ids
+        assert len(query_counter) == 2
+        assert not any("solution" in statement for statement in query_counter)
+        assert not any("FROM hints" in statement for statement in query_counter)
+
+    def test_detail_serializes_nested_prerequisites(self, client, problem_catalog):
+        """Test that eager-loaded prerequisites are serialized with their content."""
+        response = client.get(f"/api/v1/problems/{problem_catalog[-1]}")
+        assert response.status_code == 200
+        middle = response.json()["prerequisites"][0]
+        assert len(middle["steps"]) == 2
+        assert len(middle["hints"]) == 2
+        root = middle["prerequisites"][0]
+        assert root["title"].startswith("Root")
+        assert root["prerequisites"] == []
+
+    def test_cursor_pagination(self, client, db_session, problem_catalog):
+        """Test walking the catalog forwards and backwards with cursors."""
+        seen = []
+        response = client.get("/api/v1/problems/?limit=7")
+        assert response.status_code == 200
+        assert "X-Prev-Cursor" not in response.headers
+        while True:
+            seen.extend(problem["id"] for problem in response.json())
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if next_cursor is None:
+                break
+            # Problems inserted while paging must not shift later pages.
+            make_problem(db_session, "Inserted while paging")
+            response = client.get(f"/api/v1/problems/?limit=7&cursor={next_cursor}")
+            assert response.status_code == 200
+        assert seen == sorted(seen)
+        assert len(seen) == len(set(seen))
+        assert set(problem_catalog) <= set(seen)
+
+        last_page = response.json()
+        prev_cursor = response.headers["X-Prev-Cursor"]
+        response = client.get(f"/api/v1/problems/?limit=7&cursor={prev_cursor}")
+        assert response.status_code == 200
+        previous_page = [problem["id"] for problem in response.json()]
+        assert len(previous_page) == 7
+        assert previous_page[-1] < last_page[0]["id"]
+        assert previous_page == seen[-len(last_page) - 7:-len(last_page)]
+
+    def test_invalid_cursor(self, client):
+        """Test that a malformed cursor is rejected."""
+        response = client.get("/api/v1/problems/?cursor=not-a-cursor")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+        # Well-formed cursors with ids that cannot be bound as SQL integers
+        for bad_id in (True, 10 ** 30, -(2 ** 63) - 1):
+            response = client.get("/api/v1/problems/", params={
+                "cursor": encode_cursor({"id": bad_id}, "next")
+            })
+            assert response.status_code == 400
+        cursor = encode_cursor({"id": 2 ** 63 - 1}, "prev")
+        assert client.get("/api/v1/problems/", params={"cursor": cursor}).status_code == 200
+
+    def test_bulk_import(self, client):
+        """Test uploading an NDJSON file to the bulk import endpoint."""
+        lines = [
+            {"ref": "second", "title": "Second", "subject": "bulk", "difficulty": 2,
+             "description": "d", "solution": "s", "steps": [], "hints": [],
+             "prerequisite_refs": ["first"]},
+            {"ref": "first", "title": "First", "subject": "bulk", "difficulty": 1,
+             "description": "d", "solution": "s",
+             "steps": [{"order": 1, "content": "Start here"}], "hints": []},
+        ]
+        payload = "\n".join(json.dumps(line) for line in lines).encode()
+        response = client.post(
+            "/api/v1/problems/bulk",
+            files={"file": ("problems.ndjson", payload, "application/x-ndjson")},
+        )
+        assert response.status_code == 201
+        result = response.json()
+        assert result["created"] == 2
+
+        response = client.get(f"/api/v1/problems/{result['ids_by_ref']['second']}")
+        prerequisite = response.json()["prerequisites"][0]
+        assert prerequisite["id"] == result["ids_by_ref"]["first"]
+        assert prerequisite["steps"][0]["content"] == "Start here"
+
+        response = client.post(
+            "/api/v1/problems/bulk",
+            files={"file": ("bad.json", b"[{", "application/json")},
+        )
+        assert response.status_code == 400
+
+    def test_bulk_import_rejects_cycles(self, client):
+        """Test that an import whose prerequisites form a cycle is rejected."""
+        lines = [
+            {"ref": ref, "title": f"Cycle {ref}", "subject": "bulk", "difficulty": 1,
+             "description": "d", "solution": "s", "steps": [], "hints": [],
+             "prerequisite_refs": [prereq]}
+            for ref, prereq in (("x", "y"), ("y", "z"), ("z", "x"))
+        ]
+        payload = "\n".join(json.dumps(line) for line in lines).encode()
+        response = client.post(
+            "/api/v1/problems/bulk",
+            files={"file": ("cycle.ndjson", payload, "application/x-ndjson")},
+        )
+        assert response.status_code == 400
+        assert "cycle" in response.json()["detail"]
+
+    def test_export(self, client, problem_catalog):
+        """Test streaming the catalog as NDJSON."""
+        response = client.get("/api/v1/problems/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        by_id = {line["id"]: line for line in lines}
+        assert set(problem_catalog) <= set(by_id)
+
+        middle = by_id[problem_catalog[3]]
+        assert middle["title"] == "Middle 0"
+        assert middle["prerequisite_refs"] == [str(problem_catalog[0])]
+        assert [step["content"] for step in middle["steps"]] == ["Step 0", "Step 1"]
+
+    def test_learning_path(self, client, db_session):
+        """Test listing a problem's prerequisites in study order."""
+        basics = make_problem(db_session, "Path basics")
+        angles = make_problem(db_session, "Path angles", [basics.id])
+        lengths = make_problem(db_session, "Path lengths", [basics.id])
+        triangles = make_problem(db_session, "Path triangles", [angles.id, lengths.id])
+        expected = [basics.id, angles.id, lengths.id, triangles.id]
+
+        response = client.get(f"/api/v1/problems/{triangles.id}/learning-path")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["problem_id"] == triangles.id
+        assert [problem["id"] for problem in data["problems"]] == expected
+        assert data["problems"][0]["title"] == "Path basics"
+
+        # Problems created after the graph is built are picked up incrementally
+        proofs = make_problem(db_session, "Path proofs", [triangles.id])
+        response = client.get(f"/api/v1/problems/{proofs.id}/learning-path")
+        assert [problem["id"] for problem in response.json()["problems"]] == expected + [proofs.id]
+
+        response = client.get("/api/v1/problems/999999/learning-path")
+        assert response.status_code == 404
+
+    def test_search(self, client, db_session):
+        """Test the full-text search endpoint."""
+        problem = make_problem(db_session, "Searchable pentagon tiling")
+        response = client.get("/api/v1/problems/search", params={"q": "pentagon tiling"})
+        assert response.status_code == 200
+        hits = response.json()
+        assert hits[0]["id"] == problem.id
+        assert set(hits[0]) == {"id", "title", "subject", "difficulty", "score"}
+        assert client.get("/api/v1/problems/search").status_code == 422
+
+    def test_filters(self, client, db_session):
+        """Test subject and difficulty filters with cursor pagination."""
+        subject = f"filters-{pytest.test_run_id}"
+        ids = [make_problem(db_session, f"Filtered {i}", subject=subject, difficulty=i % 4).id
+               for i in range(12)]
+        make_problem(db_session, "Other subject", subject=f"{subject}-other", difficulty=2)
+
+        params = {"subject": subject, "min_difficulty": 1, "max_difficulty": 2, "limit": 4}
+        response = client.get("/api/v1/problems/", params=params)
+        assert response.status_code == 200
+        first_page = [problem["id"] for problem in response.json()]
+        response = client.get("/api/v1/problems/", params={
+            **params, "cursor": response.headers["X-Next-Cursor"]
+        })
+        second_page = [problem["id"] for problem in response.json()]
+        assert first_page + second_page == [i for n, i in enumerate(ids) if n % 4 in (1, 2)]
+        assert "X-Next-Cursor" not in response.headers
+
+        response = client.get("/api/v1/problems/", params={"subject": subject, "skip": 10})
+        assert [problem["id"] for problem in response.json()] == ids[10:]
+
+        response = client.get("/api/v1/problems/", params={"min_difficulty": 3, "max_difficulty": 1})
+        assert response.status_code == 400
+
+    def test_completion_status_filter(self, client, db_session):
+        """Test filtering by the signed-in user's completion state."""
+        subject = f"status-{pytest.test_run_id}"
+        done, started, untouched = [
+            make_problem(db_session, f"Status {i}", subject=subject).id for i in range(3)
+        ]
+        assert client.get("/api/v1/problems/", params={"status": "completed"}).status_code == 401
+
+        username = f"statusfilter{pytest.test_run_id}"
+        client.post("/api/v1/auth/register", json={
+            "email": f"{username}@example.com", "username": username, "password": "secret123"
+        })
+        token = client.post("/api/v1/auth/token", data={
+            "username": username, "password": "secret123"
+        }).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.put(f"/api/v1/progress/{done}", json={"completed": True}, headers=headers)
+        client.put(f"/api/v1/progress/{started}", json={"current_step": 1}, headers=headers)
+
+        for state, expected in (("completed", [done]), ("in_progress", [started]),
+                                ("not_started", [untouched])):
+            response = client.get("/api/v1/problems/", headers=headers,
+                                  params={"subject": subject, "status": state})
+            assert [problem["id"] for problem in response.json()] == expected
+            response = client.get("/api/v1/problems/facets", headers=headers,
+                                  params={"subject": subject, "status": state})
+            assert response.json()["total"] == 1
+
+        # Only a status filter verifies the token; the catalog ignores stale ones
+        stale = {"Authorization": "Bearer not-a-valid-token"}
+        response = client.get("/api/v1/problems/", headers=stale, params={"subject": subject})
+        assert len(response.json()) == 3
+        response = client.get("/api/v1/problems/facets", headers=stale, params={"subject": subject})
+        assert response.json()["total"] == 3
+        response = client.get("/api/v1/problems/", headers=stale,
+                              params={"subject": subject, "status": "completed"})
+        assert response.status_code == 401
+
+    def test_facets(self, client, db_session, query_counter):
+        """Test per-subject and per-difficulty counts from one grouped query."""
+        subject = f"facets-{pytest.test_run_id}"
+        for i in range(5):
+            make_problem(db_session, f"Faceted {i}", subject=subject, difficulty=i % 2 + 1)
+        make_problem(db_session, "Faceted other", subject=f"{subject}-b", difficulty=3)
+
+        query_counter.clear()
+        response = client.get("/api/v1/problems/facets",
+                              params={"min_difficulty": 1, "max_difficulty": 3},
+                              headers={"Authorization": "Bearer not-looked-up"})
+        assert response.status_code == 200
+        assert len(query_counter) == 1
+        facets = response.json()
+        assert facets["subjects"][subject] == 5
+        assert facets["subjects"][f"{subject}-b"] == 1
+        assert facets["total"] == sum(facets["subjects"].values())
+        assert facets["total"] == sum(facets["difficulties"].values())
+
+        response = client.get("/api/v1/problems/facets", params={"subject": subject})
+        assert response.json() == {"total": 5, "subjects": {subject: 5},
+                                   "difficulties": {"1": 3, "2": 2}}
+
+    def test_conditional_get(self, client, db_session, problem_catalog, query_counter):
+        """Test ETag revalidation and invalidation when problems change."""
+        detail_url = f"/api/v1/problems/{problem_catalog[0]}"
+        response = client.get(detail_url)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+
+        # Repeat reads are served from the cache without touching the database
+        query_counter.clear()
+        response = client.get(detail_url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert query_counter == []
+        assert client.get(detail_url, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+        response = client.get("/api/v1/problems/?limit=5")
+        list_etag = response.headers["ETag"]
+        assert response.headers["X-Next-Cursor"]
+        response = client.get("/api/v1/problems/?limit=5", headers={"If-None-Match": list_etag})
+        assert response.status_code == 304
+        assert response.headers["X-Next-Cursor"]
+
+        # Creating a problem invalidates cached reads
+        make_problem(db_session, "Invalidates the cache")
+        query_counter.clear()
+        response = client.get(detail_url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert len(query_counter) > 0
+
+    def test_recommended(self, client, db_session, test_user_token):
+        """Test that completing a problem unlocks its dependents as recommendations."""
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        basics = make_problem(db_session, "Basics", difficulty=1)
+        make_problem(db_session, "Next", [basics.id], difficulty=2)
+        make_problem(db_session, "Hard", difficulty=5)
+
+        response = client.get("/api/v1/problems/recommended?limit=2", headers=headers)
+        assert response.status_code == 200
+        result = response.json()
+        assert result["skill"] == 1.0
+        assert [problem["title"] for problem in result["problems"]] == ["Basics", "Hard"]
+
+        client.put(f"/api/v1/progress/{basics.id}", json={"completed": True}, headers=headers)
+        result = client.get("/api/v1/problems/recommended?limit=2", headers=headers).json()
+        assert result["skill"] == 1.15
+        assert [problem["title"] for problem in result["problems"]] == ["Next", "Hard"]
+
+        assert client.get("/api/v1/problems/recommended").status_code == 401
+        response = client.get("/api/v1/problems/recommended?limit=0", headers=headers)
+        assert response.status_code == 422
@@ -0,0 +1,83 @@
+import pytest
+
+from app.db.models import Problem
+
+
+@pytest.fixture(scope="function")
+def auth_headers(client):
+    """Register a fresh user and return bearer auth headers."""
+    username = f"progress{pytest.test_run_id}"
+    user = {"email": f"{username}@example.com", "username": username, "password": "secret123"}
+    response = client.post("/api/v1/auth/register", json=user)
+    assert response.status_code == 201
+    response = client.post("/api/v1/auth/token", data={
+        "username": user["username"], "password": user["password"]
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class TestProgressAPI:
+    """Test progress endpoints."""
+
+    def test_record_and_read_progress(self, client, db_session, auth_headers):
+        """Test recording step and hint events and reading them back."""
+        problem = Problem(title="Progress API", subject="progress", difficulty=1,
+                          description="d", solution="s")
+        db_session.add(problem)
+        db_session.commit()
+        url = f"/api/v1/progress/{problem.id}"
+
+        assert client.get(url, headers=auth_headers).status_code == 404
+        response = client.put(url, json={"current_step": 1}, headers=auth_headers)
+        assert response.status_code == 200
+        response = client.put(url, json={"hints_used": 2}, headers=auth_headers)
+        assert response.json() == {
+            "user_id": response.json()["user_id"],
+            "problem_id": problem.id,
+            "completed": False,
+            "current_step": 1,
+            "hints_used": 2,
+        }
+        response = client.put(url, json={"current_step": 3, "completed": True},
+                              headers=auth_headers)
+        assert response.json()["completed"] is True
+
+        response = client.get("/api/v1/progress/", headers=auth_headers)
+        assert [(p["problem_id"], p["current_step"]) for p in response.json()] == [(problem.id, 3)]
+
+    def test_progress_summary(self, client, db_session, auth_headers):
+        """Test the dashboard summary after completing a problem."""
+        response = client.get("/api/v1/progress/summary", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.json()["subjects"] == []
+
+        problem = Problem(title="Summary API", subject="summary", difficulty=1,
+                          description="d", solution="s")
+        db_session.add(problem)
+        db_session.commit()
+        client.put(f"/api/v1/progress/{problem.id}", json={"hints_used": 1, "completed": True},
+                   headers=auth_headers)
+
+        summary = client.get("/api/v1/progress/summary", headers=auth_headers).json()
+        assert summary["subjects"] == [{
+            "subject": "summary", "started": 1, "completed": 1,
+            "hints_used": 1, "average_hints": 1.0,
+        }]
+        assert (summary["completed"], summary["current_streak"]) == (1, 1)
+        assert client.get("/api/v1/progress/summary").status_code == 401
+
+    def test_progress_errors(self, client):
+        """Test authentication, validation and unknown problems."""
+        assert client.get("/api/v1/progress/").status_code == 401
+        username = f"progresserr{pytest.test_run_id}"
+        client.post("/api/v1/auth/register", json={
+            "email": f"{username}@example.com", "username": username, "password": "secret123"
+        })
+        token = client.post("/api/v1/auth/token", data={
+            "username": username, "password": "secret123"
+        }).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        response = client.put("/api/v1/progress/999999", json={"current_step": 1}, headers=headers)
+        assert response.status_code == 404
+        response = client.put("/api/v1/progress/1", json={"current_step": -1}, headers=headers)
+        assert response.status_code == 422
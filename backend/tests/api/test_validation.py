@@ -0,0 +1,45 @@
+from app.db.models import Problem
+
+
+class TestValidationAPI:
+    """Test answer validation endpoints."""
+
+    def test_validate_answers(self, client, db_session):
+        """Test single and batch validation."""
+        problems = [
+            Problem(title="Validation API", subject="validation", difficulty=1,
+                    description="d", solution="x^2 - 1"),
+            Problem(title="Validation API 2", subject="validation", difficulty=1,
+                    description="d", solution="Paris"),
+        ]
+        db_session.add_all(problems)
+        db_session.commit()
+        first, second = (problem.id for problem in problems)
+
+        response = client.post(f"/api/v1/validation/{first}", json={"answer": "(x-1)(x+1)"})
+        assert response.status_code == 200
+        assert response.json() == {"problem_id": first, "correct": True}
+        response = client.post(f"/api/v1/validation/{first}", json={"answer": "x^2 + 1"})
+        assert response.json()["correct"] is False
+        response = client.post(f"/api/v1/validation/{first}", json={"answer": "-" * 999 + "1"})
+        assert response.status_code == 200
+        assert response.json()["correct"] is False
+
+        response = client.post("/api/v1/validation/batch", json={"answers": [
+            {"problem_id": second, "answer": "paris"},
+            {"problem_id": first, "answer": "x*x - 1"},
+            {"problem_id": second, "answer": "Lyon"},
+        ]})
+        assert response.status_code == 200
+        assert [result["correct"] for result in response.json()] == [True, True, False]
+
+    def test_validation_errors(self, client):
+        """Test unknown problems and oversized input."""
+        assert client.post("/api/v1/validation/999999", json={"answer": "1"}).status_code == 404
+        response = client.post("/api/v1/validation/batch", json={"answers": [
+            {"problem_id": 999999, "answer": "1"},
+        ]})
+        assert response.status_code == 404
+        response = client.post("/api/v1/validation/1", json={"answer": "1" * 1001})
+        assert response.status_code == 422
+        assert client.post("/api/v1/validation/batch", json={"answers": []}).status_code == 422
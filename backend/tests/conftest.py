@@ -1,18 +1,44 @@
 import os
+import tempfile
+
+# Hash passwords inline; the process pool has its own tests
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+# Cheapest bcrypt cost; hashing strength is not what the suite tests
+os.environ.setdefault("PASSWORD_BCRYPT_ROUNDS", "4")
+# Give every (xdist worker) process its own app database instead of the
+# shared development file; tests themselves use the in-memory engine below
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='lbd-test-'), 'app.db')}"
+)
+# Write progress events through; buffering is tested on its own
+os.environ.setdefault("PROGRESS_FLUSH_INTERVAL_SECONDS", "0")
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.db.models import Base
 from app.db.session import get_db
 from app.core.config import settings
+from app.core.cache import problem_cache
+from app.core.rate_limit import rate_limit_backend
+from app.core.security import token_cache
+from app.services.leaderboard import leaderboards
+from app.services.prerequisite_graph import prerequisite_graph
+from app.services.recommendation_service import recommender
+from app.services.validation_service import solution_matchers
 
-# Use in-memory SQLite for testing
+# Use in-memory SQLite for testing; each xdist worker is a separate process
+# and so gets its own database
 TEST_SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
+# Transaction control around the per-test savepoints, not counted as queries
+TRANSACTION_STATEMENTS = ("BEGIN", "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
 @pytest.fixture(scope="session")
 def test_engine():
     """Create a test database engine."""
@@ -21,19 +47,61 @@ def test_engine():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy
+    # emit BEGIN itself
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
 
 @pytest.fixture(scope="function")
 def db_session(test_engine):
-    """Create a fresh database session for each test."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
-    session = TestingSessionLocal()
+    """
+    Create a session whose changes are rolled back after the test.
+
+    The test runs inside an outer transaction; `commit()` and `rollback()`
+    in the code under test only release or roll back savepoints within it,
+    so every test starts from the empty schema.
+    """
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
     try:
         yield session
     finally:
         session.close()
+        transaction.rollback()
+        connection.close()
+        # In-memory state built from committed rows; ids are reused next test
+        prerequisite_graph.reset()
+        solution_matchers.clear()
+        leaderboards.reset()
+        recommender.reset()
+
+@pytest.fixture(scope="function")
+def query_counter(test_engine):
+    """Record every SQL statement executed against the test engine."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not statement.lstrip().upper().startswith(TRANSACTION_STATEMENTS):
+            statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(test_engine, "before_cursor_execute", before_cursor_execute)
 
 @pytest.fixture(scope="function")
 def client(db_session):
@@ -48,6 +116,9 @@ def client(db_session):
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+    token_cache.clear()
+    problem_cache.backend.clear()
+    rate_limit_backend.clear()
 
 # Generate a unique ID for this test run to avoid username/email conflicts
 pytest.test_run_id = os.urandom(4).hex()
@@ -0,0 +1,115 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.db.init_db import SchemaUpgradeError, upgrade_db
+from app.db.models import Base, Problem, UserProgress
+from app.schemas.user import UserCreate
+from app.services.auth_service import create_user
+from app.services.progress_service import write_progress
+
+# Tables as created by the original models, before any upgrade step
+LEGACY_SCHEMA = [
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, email VARCHAR, username VARCHAR, "
+    "hashed_password VARCHAR, is_active BOOLEAN)",
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    "CREATE UNIQUE INDEX ix_users_username ON users (username)",
+    "CREATE TABLE user_progress (id INTEGER PRIMARY KEY, user_id INTEGER REFERENCES users (id), "
+    "problem_id INTEGER REFERENCES problems (id), completed BOOLEAN, current_step INTEGER, "
+    "hints_used INTEGER)",
+]
+
+
+@pytest.fixture(scope="function")
+def legacy_engine():
+    """An in-memory database created by the original models."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+def index_names(engine, table):
+    with engine.connect() as connection:
+        return set(connection.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {"table": table},
+        ).scalars())
+
+
+def register(engine, email, username):
+    with Session(engine) as db:
+        return create_user(db, UserCreate(email=email, username=username, password="password123"))
+
+
+class TestUpgradeDB:
+    """Test bringing databases created by earlier models up to date."""
+
+    def test_upgrade_users(self, legacy_engine):
+        """Test that the case-insensitive unique indexes replace the old ones."""
+        upgrade_db(legacy_engine)
+        # Running again on an up-to-date database changes nothing
+        upgrade_db(legacy_engine)
+        names = index_names(legacy_engine, "users")
+        assert {"uq_users_email_lower", "uq_users_username_lower"} <= names
+        assert not names & {"ix_users_email", "ix_users_username"}
+
+        register(legacy_engine, "legacy@example.com", "legacy")
+        with pytest.raises(HTTPException) as error:
+            register(legacy_engine, "Legacy@example.com", "other")
+        assert error.value.detail == "Email already registered"
+
+    def test_upgrade_reports_case_duplicates(self, legacy_engine):
+        """Test that accounts differing only in case stop the upgrade, untouched."""
+        first = register(legacy_engine, "Bob@example.com", "bob").id
+        second = register(legacy_engine, "bob@example.com", "bobby").id
+        with pytest.raises(SchemaUpgradeError) as error:
+            upgrade_db(legacy_engine)
+        assert f"email 'bob@example.com': user ids {first}, {second}" in str(error.value)
+        assert "ix_users_email" in index_names(legacy_engine, "users")
+
+        with legacy_engine.begin() as connection:
+            connection.execute(text("UPDATE users SET email = 'robert@example.com' WHERE id = :id"),
+                               {"id": second})
+        upgrade_db(legacy_engine)
+        assert "uq_users_email_lower" in index_names(legacy_engine, "users")
+
+    def test_duplicates_before_upgrade(self, legacy_engine):
+        """Test that the old indexes' violations still map to registration errors."""
+        register(legacy_engine, "legacy@example.com", "legacy")
+        with pytest.raises(HTTPException) as error:
+            register(legacy_engine, "other@example.com", "legacy")
+        assert (error.value.status_code, error.value.detail) == (400, "Username already taken")
+        with pytest.raises(HTTPException) as error:
+            register(legacy_engine, "legacy@example.com", "legacy")
+        assert error.value.detail == "Email already registered"
+
+    def test_upgrade_user_progress(self, legacy_engine):
+        """Test that progress upserts work once duplicates are dropped and columns added."""
+        with legacy_engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO user_progress (user_id, problem_id, completed, current_step, hints_used) "
+                "VALUES (1, 1, 0, 1, 0), (1, 1, 0, 3, 1), (1, 2, 1, 2, 0)"
+            ))
+        upgrade_db(legacy_engine)
+        upgrade_db(legacy_engine)
+        assert "uq_user_progress_user_problem" in index_names(legacy_engine, "user_progress")
+
+        with Session(legacy_engine) as db:
+            db.add(Problem(id=1, title="Legacy", subject="legacy", difficulty=1,
+                           description="d", solution="s"))
+            write_progress(db, {(1, 1): {"completed": True}})
+            db.commit()
+            rows = {row.problem_id: row for row in db.query(UserProgress)}
+        assert len(rows) == 2
+        assert (rows[1].current_step, rows[1].completed) == (3, True)
+        assert rows[1].completed_at is not None and rows[2].completed_at is None
@@ -0,0 +1,84 @@
+import threading
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.db.pool import InstrumentedQueuePool
+from app.db.session import configure_sqlite, engine_options
+
+
+class TestEngineConfiguration:
+    """Test engine and connection pool configuration."""
+
+    def test_engine_options_for_sqlite_file(self):
+        """Test that file-backed SQLite gets a sized, instrumented pool."""
+        options = engine_options("sqlite:///./learnbydoing.db")
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["connect_args"] == {"check_same_thread": False}
+        assert "pool_size" in options
+
+    def test_engine_options_for_memory_sqlite(self):
+        """Test that in-memory SQLite keeps SQLAlchemy's default pool."""
+        options = engine_options("sqlite:///:memory:")
+        assert "poolclass" not in options
+
+    def test_engine_options_for_postgres(self, monkeypatch):
+        """Test that Postgres connections get a statement timeout."""
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 1500)
+        options = engine_options("postgresql://u:p@db/lbd")
+        assert options["connect_args"] == {"options": "-c statement_timeout=1500"}
+        options = engine_options("postgresql+asyncpg://u:p@db/lbd", use_async=True)
+        assert options["connect_args"] == {"server_settings": {"statement_timeout": "1500"}}
+
+    def test_sqlite_pragmas(self, tmp_path):
+        """Test that SQLite connections use WAL and a busy timeout."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pragmas.db'}",
+            **engine_options(f"sqlite:///{tmp_path / 'pragmas.db'}")
+        )
+        configure_sqlite(engine)
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        engine.dispose()
+
+    def test_pool_records_waits_and_timeouts(self, tmp_path):
+        """Test that checkouts blocked on a full pool are counted."""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1,
+        )
+        pool = engine.pool
+
+        held = engine.connect()
+        assert pool.usage()["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        assert pool.usage()["timeouts"] == 1
+
+        releaser = threading.Timer(0.05, held.close)
+        releaser.start()
+        with engine.connect():
+            pass
+        releaser.join()
+        usage = pool.usage()
+        assert usage["waits"] == 1
+        assert usage["wait_time_max_ms"] > 0
+        assert usage["checked_out"] == 0
+        engine.dispose()
+
+
+class TestDatabaseHealth:
+    """Test the database health endpoint."""
+
+    def test_health_db(self, client):
+        """Test that pool statistics are reported."""
+        response = client.get("/api/v1/health/db")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ok"
+        assert data["dialect"] == "sqlite"
+        assert "class" in data["pool"]
@@ -1,90 +1,108 @@
 #!/usr/bin/env python
 """
 Test runner for Learn By Doing backend tests.
-Provides a clean output of test results with pass/fail status.
+Runs the whole suite in one pytest session, spread across cores when
+pytest-xdist is installed, and prints pass/fail counts per category.
 """
 
 import os
 import sys
 import pytest
 import time
+from collections import defaultdict
 from datetime import datetime
 
 # Add the backend directory to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Define test categories
+TEST_CATEGORIES = [
+    {"name": "API Authentication Tests", "path": "api/test_auth.py"},
+    {"name": "API Async Stack Tests", "path": "api/test_async_api.py"},
+    {"name": "API Problem Tests", "path": "api/test_problems.py"},
+    {"name": "API Progress Tests", "path": "api/test_progress.py"},
+    {"name": "API Leaderboard Tests", "path": "api/test_leaderboard.py"},
+    {"name": "API Validation Tests", "path": "api/test_validation.py"},
+    {"name": "Auth Service Tests", "path": "services/test_auth_service.py"},
+    {"name": "Export Service Tests", "path": "services/test_export_service.py"},
+    {"name": "Import Service Tests", "path": "services/test_import_service.py"},
+    {"name": "Leaderboard Tests", "path": "services/test_leaderboard.py"},
+    {"name": "Prerequisite Graph Tests", "path": "services/test_prerequisite_graph.py"},
+    {"name": "Progress Service Tests", "path": "services/test_progress_service.py"},
+    {"name": "Recommendation Tests", "path": "services/test_recommendation_service.py"},
+    {"name": "Search Service Tests", "path": "services/test_search_service.py"},
+    {"name": "Validation Service Tests", "path": "services/test_validation_service.py"},
+    {"name": "Database Session Tests", "path": "db/test_session.py"},
+    {"name": "Schema Upgrade Tests", "path": "db/test_init_db.py"},
+    {"name": "Security Utility Tests", "path": "utils/test_security.py"},
+    {"name": "Hashing Pool Tests", "path": "utils/test_hashing_pool.py"},
+    {"name": "Token Cache Tests", "path": "utils/test_token_cache.py"},
+    {"name": "Response Cache Tests", "path": "utils/test_cache.py"},
+    {"name": "Response Serialization Tests", "path": "utils/test_responses.py"},
+    {"name": "Metrics Tests", "path": "utils/test_metrics.py"},
+    {"name": "Rate Limiter Tests", "path": "utils/test_rate_limit.py"},
+]
+
+
+class CategoryReport:
+    """Pytest plugin counting outcomes per test file."""
+
+    def __init__(self):
+        self.outcomes = defaultdict(lambda: defaultdict(int))
+        self.durations = defaultdict(float)
+
+    def pytest_runtest_logreport(self, report):
+        path = report.nodeid.split("::")[0]
+        if path.startswith("tests/"):
+            path = path[len("tests/"):]
+        self.durations[path] += report.duration
+        if report.when == "call" or report.outcome != "passed":
+            self.outcomes[path][report.outcome] += 1
+
+
+def xdist_args():
+    """Spread tests across cores when pytest-xdist is available."""
+    try:
+        import xdist  # noqa: F401
+    except ImportError:
+        return []
+    return ["-n", "auto"]
+
+
 def run_tests():
     """Run all backend tests and display results."""
     print("\n" + "=" * 80)
     print(f"LEARN BY DOING - BACKEND TEST SUITE")
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 80)
-    
-    # Define test categories
-    test_categories = [
-        {"name": "API Authentication Tests", "path": "api/test_auth.py"},
-        {"name": "Auth Service Tests", "path": "services/test_auth_service.py"},
-        {"name": "Security Utility Tests", "path": "utils/test_security.py"},
-    ]
-    
+
+    report = CategoryReport()
+    start_time = time.time()
+    # Run pytest with detailed output for failures only
+    result = pytest.main(
+        [TESTS_DIR, "-q", "--no-header", "--tb=short", *xdist_args()],
+        plugins=[report],
+    )
+    total_time = time.time() - start_time
+
     # Track overall statistics
     total_passed = 0
     total_failed = 0
-    total_time = 0
-    
-    # Run each test category
-    for category in test_categories:
-        print(f"\n{category['name']}:")
-        print("-" * 80)
-        
-        start_time = time.time()
-        test_path = os.path.join(os.path.dirname(__file__), category["path"])
-        
-        # Run pytest with detailed output for failures only
-        result = pytest.main([
-            test_path, 
-            "-v",
-            "--no-header",
-            "--tb=short"
-        ])
-        
-        end_time = time.time()
-        duration = end_time - start_time
-        total_time += duration
-        
-        # Get test counts from pytest exit code
-        if result == 0:  # All tests passed
-            print(f"✅ ALL TESTS PASSED in {duration:.2f} seconds")
-            # We don't know exactly how many passed, but we can count them
-            # by parsing the test file (simplified approach)
-            with open(test_path, "r") as f:
-                content = f.read()
-                test_count = content.count("def test_")
-                total_passed += test_count
-        else:
-            # Some tests failed
-            # Parse the output to get a more accurate count of failures
-            with open(test_path, "r") as f:
-                content = f.read()
-                test_count = content.count("def test_")
-            
-            # Pytest returns a bit mask where:
-            # 1 = test collection error
-            # 2 = test execution failed
-            # 4 = test execution interrupted
-            # 8 = internal pytest error
-            # So we need to check if bit 1 is set (value 2)
-            if result & 2:
-                failed_count = 1  # At least one test failed
-                passed_count = test_count - failed_count
-                total_passed += passed_count
-                total_failed += failed_count
-                print(f"❌ {failed_count} TESTS FAILED, {passed_count} PASSED in {duration:.2f} seconds")
-            else:
-                # Some other error occurred
-                total_failed += 1
-                print(f"❌ ERROR OCCURRED in {duration:.2f} seconds")
-    
+    for category in TEST_CATEGORIES:
+        outcomes = report.outcomes.get(category["path"], {})
+        passed = outcomes.get("passed", 0)
+        failed = outcomes.get("failed", 0)
+        total_passed += passed
+        total_failed += failed
+        duration = report.durations.get(category["path"], 0.0)
+        status = "✅" if not failed else "❌"
+        print(
+            f"{status} {category['name']:<32} {passed:>3} passed  {failed:>3} failed"
+            f"  {duration:6.2f}s"
+        )
+
     # Print summary
     print("\n" + "=" * 80)
     print(f"TEST SUMMARY:")
@@ -93,8 +111,8 @@ def run_tests():
     print(f"Failed: {total_failed}")
     print(f"Total Time: {total_time:.2f} seconds")
     print("=" * 80 + "\n")
-    
-    return total_failed
+
+    return 0 if result == 0 else 1
 
 if __name__ == "__main__":
     sys.exit(run_tests())
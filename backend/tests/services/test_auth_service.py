@@ -1,5 +1,9 @@
+import threading
 import pytest
 from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from app.db.models import Base
 from app.services.auth_service import (
     get_user_by_email,
     get_user_by_username,
@@ -90,6 +94,62 @@ class TestAuthService:
         assert excinfo.value.status_code == 400
         assert "Username already taken" in excinfo.value.detail
 
+    def test_create_user_is_case_insensitive_and_single_statement(self, db_session, query_counter):
+        """Test that registration is one INSERT and duplicates ignore case."""
+        query_counter.clear()
+        db_user = create_user(db_session, UserCreate(
+            email="Case_Test@example.com", username="Case_Test", password="password123"
+        ))
+        # No duplicate SELECTs before the INSERT and no refresh after it
+        assert len(query_counter) == 1
+        assert query_counter[0].lstrip().upper().startswith("INSERT")
+        assert db_user.id is not None and db_user.is_active is True
+        assert get_user_by_username(db_session, "case_test").id == db_user.id
+        assert get_user_by_email(db_session, "CASE_TEST@example.com").id == db_user.id
+
+        with pytest.raises(HTTPException) as excinfo:
+            create_user(db_session, UserCreate(
+                email="other_case@example.com", username="CASE_test", password="password123"
+            ))
+        assert excinfo.value.detail == "Username already taken"
+
+    def test_concurrent_registrations(self, tmp_path):
+        """Test that racing registrations for one username create a single user."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        barrier = threading.Barrier(6)
+        outcomes = []
+
+        def register(i):
+            db = Session()
+            try:
+                barrier.wait()
+                create_user(db, UserCreate(
+                    email=f"racer{i}@example.com",
+                    username="Racer" if i % 2 else "racer",
+                    password="password123"
+                ))
+                outcomes.append("created")
+            except HTTPException as exc:
+                outcomes.append(exc.detail)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=register, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(outcomes) == ["Username already taken"] * 5 + ["created"]
+        with Session() as db:
+            count = db.scalar(
+                select(func.count(User.id)).where(func.lower(User.username) == "racer")
+            )
+        assert count == 1
+        engine.dispose()
+
     def test_authenticate_user(self, db_session):
         """Test user authentication."""
         # Create a test user with a known password hash
@@ -116,6 +176,26 @@ class TestAuthService:
         authenticated_user = authenticate_user(db_session, "nonexistent", "testpassword")
         assert authenticated_user is None
 
+    def test_authenticate_user_rehashes_outdated_hash(self, db_session, monkeypatch):
+        """Test that a successful login upgrades a low-cost hash."""
+        from app.core import security
+        from app.core.security import PasswordPolicy, crypt_context
+        monkeypatch.setattr(security, "password_policy", PasswordPolicy("bcrypt", 5))
+        weak_hash = crypt_context(PasswordPolicy("bcrypt", 4)).hash("testpassword")
+        user = User(email="rehash@example.com", username="rehash_test", hashed_password=weak_hash)
+        db_session.add(user)
+        db_session.commit()
+
+        assert authenticate_user(db_session, "rehash_test", "wrongpassword") is None
+        db_session.refresh(user)
+        assert user.hashed_password == weak_hash
+
+        assert authenticate_user(db_session, "rehash_test", "testpassword") is not None
+        db_session.expire_all()
+        stored = get_user_by_username(db_session, "rehash_test").hashed_password
+        assert stored.startswith("$2b$05$")
+        assert authenticate_user(db_session, "rehash_test", "testpassword") is not None
+
     def test_create_user_token(self, db_session):
         """Test token creation for a user."""
         # Create a test user
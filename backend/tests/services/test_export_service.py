@@ -0,0 +1,57 @@
+import io
+import json
+
+from app.services.export_service import iter_problem_export
+from app.services.import_service import import_problems, iter_json_records
+
+
+def record(ref, prerequisite_refs=()):
+    return {
+        "ref": ref,
+        "title": f"Exported {ref}",
+        "subject": "export",
+        "difficulty": 2,
+        "description": f"Description of {ref} – with ünïcode",
+        "solution": "7",
+        "steps": [{"order": i, "content": f"{ref} step {i}"} for i in range(2)],
+        "hints": [{"order": 0, "content": f"{ref} hint"}],
+        "prerequisite_refs": list(prerequisite_refs),
+    }
+
+
+class TestExportService:
+    """Test streaming the problem catalog as NDJSON."""
+
+    def test_export_streams_in_batches(self, db_session, query_counter):
+        """Test that each batch costs a fixed number of queries."""
+        result = import_problems(
+            db_session, [record(f"e{i}", [f"e{i - 1}"] if i else []) for i in range(25)]
+        )
+        ids = sorted(result.ids_by_ref.values())
+        db_session.expunge_all()
+
+        query_counter.clear()
+        chunks = list(iter_problem_export(db_session, batch_size=10))
+        # One problem SELECT, then steps, hints and prerequisites per batch
+        assert len(query_counter) == 1 + 3 * len(chunks)
+
+        lines = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        exported = [line for line in lines if line["id"] in ids]
+        assert [line["id"] for line in exported] == ids
+        first, second = exported[0], exported[1]
+        assert first["ref"] == str(first["id"])
+        assert second["prerequisite_refs"] == [first["ref"]]
+        assert second["steps"] == [{"order": 0, "content": "e1 step 0"},
+                                   {"order": 1, "content": "e1 step 1"}]
+        assert "prerequisite_ids" not in second
+
+    def test_export_round_trips_through_import(self, db_session):
+        """Test that an export file loads back through the bulk import."""
+        import_problems(db_session, [record("base"), record("next", ["base"])])
+        db_session.expunge_all()
+        export = b"".join(iter_problem_export(db_session))
+
+        records = list(iter_json_records(io.BytesIO(export)))
+        result = import_problems(db_session, records)
+        assert result.created == len(records)
+        assert set(result.ids_by_ref) == {record["ref"] for record in records}
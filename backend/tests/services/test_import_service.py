@@ -0,0 +1,83 @@
+import io
+import json
+import pytest
+
+from app.db.models import Problem
+from app.services.import_service import BulkImportError, import_problems, iter_json_records
+
+
+def record(ref, prerequisite_refs=(), prerequisite_ids=()):
+    return {
+        "ref": ref,
+        "title": f"Imported {ref}",
+        "subject": "import",
+        "difficulty": 3,
+        "description": f"Description of {ref} – with ünïcode",
+        "solution": "7",
+        "steps": [{"order": i, "content": f"{ref} step {i}"} for i in range(3)],
+        "hints": [{"order": i, "content": f"{ref} hint {i}"} for i in range(2)],
+        "prerequisite_refs": list(prerequisite_refs),
+        "prerequisite_ids": list(prerequisite_ids),
+    }
+
+
+class TestImportService:
+    """Test bulk problem import."""
+
+    def test_iter_json_records_formats(self):
+        """Test streaming records from JSON arrays and NDJSON in small chunks."""
+        records = [record("a"), record("b", ["a"])]
+        as_array = json.dumps(records).encode()
+        as_ndjson = "\n".join(json.dumps(r) for r in records).encode() + b"\n"
+        for payload in (as_array, as_ndjson):
+            parsed = list(iter_json_records(io.BytesIO(payload), chunk_size=7))
+            assert parsed == records
+        assert list(iter_json_records(io.BytesIO(b"  "))) == []
+
+    def test_iter_json_records_rejects_malformed_input(self):
+        """Test that malformed files raise BulkImportError."""
+        for payload in (b'[{"a": 1} {"b": 2}]', b'[{"a": 1},', b'{"a": ', b"[1, 2]"):
+            with pytest.raises(BulkImportError):
+                list(iter_json_records(io.BytesIO(payload), chunk_size=4))
+
+    def test_import_with_forward_references(self, db_session, query_counter):
+        """Test importing a batch whose prerequisites point forwards and backwards."""
+        existing = Problem(title="Existing", subject="import", difficulty=1,
+                           description="d", solution="s")
+        db_session.add(existing)
+        db_session.commit()
+
+        records = [record(f"r{i}", [f"r{i + 1}"] if i < 49 else [], [existing.id])
+                   for i in range(50)]
+        query_counter.clear()
+        result = import_problems(db_session, records, batch_size=20)
+        assert result.created == 50
+        # Steps and hints take one INSERT per batch and edges a single one,
+        # regardless of row counts. (Problem rows need ordered RETURNING,
+        # which SQLite only provides one row at a time.)
+        inserts = [s for s in query_counter if s.lstrip().upper().startswith("INSERT")]
+        assert len([s for s in inserts if "INTO steps" in s]) == 3
+        assert len([s for s in inserts if "INTO hints" in s]) == 3
+        assert len([s for s in inserts if "INTO problem_prerequisites" in s]) == 1
+
+        first = db_session.get(Problem, result.ids_by_ref["r0"])
+        assert [p.id for p in first.prerequisites] == sorted(
+            [result.ids_by_ref["r1"], existing.id]
+        )
+        assert [s.content for s in sorted(first.steps, key=lambda s: s.order)] == [
+            "r0 step 0", "r0 step 1", "r0 step 2"
+        ]
+        assert len(first.hints) == 2
+
+    def test_import_is_atomic(self, db_session):
+        """Test that an unresolvable reference leaves the database untouched."""
+        before = db_session.query(Problem).count()
+        with pytest.raises(BulkImportError, match="Unknown prerequisite ref 'missing'"):
+            import_problems(db_session, [record("x1"), record("x2", ["missing"])])
+        with pytest.raises(BulkImportError, match="Unknown prerequisite ids"):
+            import_problems(db_session, [record("y1", [], [987654])])
+        with pytest.raises(BulkImportError, match="Duplicate ref"):
+            import_problems(db_session, [record("z1"), record("z1")])
+        with pytest.raises(BulkImportError, match="Record 1 is invalid"):
+            import_problems(db_session, [record("w1"), {"title": "no subject"}])
+        assert db_session.query(Problem).count() == before
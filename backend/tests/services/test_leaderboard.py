@@ -0,0 +1,119 @@
+import random
+from bisect import bisect_left
+
+from app.db.models import Problem, User, UserSubjectStats
+from app.services.leaderboard import Leaderboard, RankedList, get_leaderboards, leaderboards
+from app.services.progress_service import ProgressBuffer
+
+
+class TestRankedList:
+    """Test the order-statistics list against a plain sorted list."""
+
+    def test_matches_sorted_list(self):
+        """Test inserts, removals, positions and slices across bucket splits."""
+        rng = random.Random(7)
+        ranked = RankedList(load=4)
+        expected = []
+        for _ in range(3000):
+            if expected and rng.random() < 0.4:
+                key = rng.choice(expected)
+                expected.remove(key)
+                ranked.remove(key)
+            else:
+                key = rng.randrange(-1000, 1000)
+                if key in expected:
+                    continue
+                expected.append(key)
+                expected.sort()
+                ranked.add(key)
+            assert len(ranked) == len(expected)
+            probe = rng.randrange(-1100, 1100)
+            assert ranked.bisect_left(probe) == bisect_left(expected, probe)
+            start = rng.randrange(-2, len(expected) + 2)
+            stop = start + rng.randrange(10)
+            assert list(ranked.islice(start, stop)) == expected[max(0, start):max(0, stop)]
+
+
+class TestLeaderboard:
+    """Test scores, competition ranks and around-user windows."""
+
+    def test_ranks_and_ties(self):
+        """Test that tied users share a rank and are listed by user id."""
+        board = Leaderboard({1: 5, 2: 3, 3: 5, 4: 0})
+        board.add(5, 3)
+        board.add(2, 1)
+        assert [tuple(entry) for entry in board.top(10)] == [
+            (1, 1, 5), (1, 3, 5), (3, 2, 4), (4, 5, 3),
+        ]
+        assert (board.rank(2), board.rank(4), len(board)) == (3, None, 4)
+        assert [entry.user_id for entry in board.around(2, 1)] == [3, 2, 5]
+        assert [entry.user_id for entry in board.around(1, 1)] == [1, 3]
+        assert board.around(4, 1) == []
+
+        board.add(5, -3)
+        assert board.rank(5) is None and len(board) == 3
+
+
+class TestLeaderboards:
+    """Test loading boards from the aggregates and incremental updates."""
+
+    def test_load_and_record_completions(self, db_session):
+        """Test that committed completions move both boards."""
+        users = [User(email=f"lb{i}@example.com", username=f"lb{i}", hashed_password="x")
+                 for i in range(3)]
+        problems = [Problem(title=f"Board {i}", subject=subject, difficulty=1,
+                            description="d", solution="s")
+                    for i, subject in enumerate(["algebra", "algebra", "geometry"])]
+        db_session.add_all([*users, *problems])
+        db_session.commit()
+        first, second, third = (user.id for user in users)
+        db_session.add_all([
+            UserSubjectStats(user_id=first, subject="algebra", started=2, completed=2, hints_used=0),
+            UserSubjectStats(user_id=second, subject="geometry", started=1, completed=1, hints_used=0),
+        ])
+        db_session.commit()
+
+        boards = get_leaderboards(db_session)
+        assert [(entry.user_id, entry.score) for entry in boards.top(None, 10)] == [
+            (first, 2), (second, 1),
+        ]
+        assert boards.standing("geometry", third, 2) == (None, 0, 1, [])
+
+        buffer = ProgressBuffer(lambda: db_session, flush_interval=60, max_pending=100)
+        for problem in problems:
+            buffer.record(db_session, third, problem.id, {"completed": True})
+        # Completing again does not score twice
+        buffer.record(db_session, third, problems[0].id, {"completed": True})
+
+        rank, score, players, around = leaderboards.standing(None, third, 1)
+        assert (rank, score, players) == (1, 3, 3)
+        assert [entry.user_id for entry in around] == [third, first]
+        assert leaderboards.standing("algebra", third, 0)[:2] == (1, 2)
+
+        # A reload from the aggregates agrees with the incremental boards
+        leaderboards.rebuild(db_session)
+        assert leaderboards.standing(None, third, 1) == (rank, score, players, around)
+
+    def test_completions_during_rebuild_are_kept(self, db_session):
+        """Test that completions recorded after the snapshot survive the swap."""
+        user = User(email="race@example.com", username="race", hashed_password="x")
+        db_session.add(user)
+        db_session.commit()
+        db_session.add(UserSubjectStats(user_id=user.id, subject="algebra", started=1,
+                                        completed=1, hints_used=0))
+        db_session.commit()
+        leaderboards.rebuild(db_session)
+
+        class RacingSession:
+            """Records a completion committed after the snapshot was read."""
+
+            def execute(self, statement):
+                rows = db_session.execute(statement).all()
+                leaderboards.record_completions({(user.id, "algebra"): 1})
+                return rows
+
+        leaderboards.rebuild(RacingSession())
+        assert leaderboards.standing("algebra", user.id, 0)[:2] == (1, 2)
+        # Recorded once the reload finished: applied to the new boards only
+        leaderboards.record_completions({(user.id, "algebra"): 1})
+        assert leaderboards.standing(None, user.id, 0)[:2] == (1, 3)
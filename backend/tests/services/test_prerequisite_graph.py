@@ -0,0 +1,78 @@
+import pytest
+
+from app.db.models import Problem
+from app.services.prerequisite_graph import PrerequisiteCycleError, PrerequisiteGraph
+
+
+def build_graph(edges):
+    """Build a graph from (problem, prerequisite) pairs."""
+    graph = PrerequisiteGraph()
+    for child, parent in edges:
+        graph.add_problem(child)
+        graph.add_problem(parent)
+    graph.add_edges(edges)
+    return graph
+
+
+class TestPrerequisiteGraph:
+    """Test the in-memory prerequisite graph."""
+
+    def test_transitive_closure(self):
+        """Test ancestor and descendant sets across several levels."""
+        graph = build_graph([(2, 1), (3, 2), (4, 1), (5, 3), (5, 4)])
+        assert graph.prerequisites(5) == {3, 4}
+        assert graph.ancestors(5) == {1, 2, 3, 4}
+        assert graph.descendants(1) == {2, 3, 4, 5}
+        assert graph.dependents(1) == {2, 4}
+        assert graph.ancestors(1) == set()
+
+    def test_incremental_updates(self):
+        """Test that new edges propagate to existing descendants."""
+        graph = build_graph([(2, 1), (3, 2)])
+        graph.add_problem(10)
+        graph.add_edges([(1, 10)])
+        assert graph.ancestors(3) == {1, 2, 10}
+        assert graph.descendants(10) == {1, 2, 3}
+
+        graph.add_problem(11, [3, 10])
+        assert graph.ancestors(11) == {1, 2, 3, 10}
+        assert 11 in graph.descendants(10)
+
+    def test_rejects_cycles(self):
+        """Test that cyclic edges are rejected and leave the graph unchanged."""
+        graph = build_graph([(2, 1), (3, 2)])
+        for edges in ([(1, 3)], [(1, 1)], [(7, 8), (8, 7)], [(7, 3), (1, 7)]):
+            with pytest.raises(PrerequisiteCycleError):
+                graph.add_edges(edges)
+        assert graph.ancestors(3) == {1, 2}
+        assert graph.descendants(3) == set()
+        graph.check_new_edges([(7, 3), (8, 7), (8, 1)])
+
+    def test_learning_path_order(self):
+        """Test that a learning path lists prerequisites before dependents."""
+        graph = build_graph([(2, 1), (3, 2), (4, 1), (5, 3), (5, 4), (6, 1)])
+        path = graph.learning_path(5)
+        assert path[-1] == 5
+        assert set(path) == {1, 2, 3, 4, 5}
+        position = {problem_id: index for index, problem_id in enumerate(path)}
+        for problem_id in path:
+            for parent in graph.prerequisites(problem_id):
+                assert position[parent] < position[problem_id]
+        assert graph.learning_path(1) == [1]
+
+    def test_rebuild_from_database(self, db_session):
+        """Test building the graph from stored problems and edges."""
+        root = Problem(title="Graph root", subject="graph", difficulty=1,
+                       description="d", solution="s")
+        middle = Problem(title="Graph middle", subject="graph", difficulty=2,
+                         description="d", solution="s", prerequisites=[root])
+        leaf = Problem(title="Graph leaf", subject="graph", difficulty=3,
+                       description="d", solution="s", prerequisites=[middle])
+        db_session.add_all([root, middle, leaf])
+        db_session.commit()
+
+        graph = PrerequisiteGraph()
+        graph.rebuild(db_session)
+        assert graph.loaded
+        assert graph.learning_path(leaf.id) == [root.id, middle.id, leaf.id]
+        assert graph.descendants(root.id) == {middle.id, leaf.id}
@@ -0,0 +1,197 @@
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from app.db.models import Problem, User, UserProgress, UserStreak, UserSubjectStats
+from app.services.progress_service import (
+    ProgressBuffer,
+    check_progress_summaries,
+    extend_streak,
+    get_progress_summary,
+    rebuild_progress_summaries,
+    write_progress,
+)
+
+
+@pytest.fixture(scope="function")
+def learner(db_session):
+    """Create a user and two problems; returns (user_id, problem_ids)."""
+    name = f"learner{os.urandom(4).hex()}"
+    user = User(email=f"{name}@example.com", username=name, hashed_password="x")
+    problems = [Problem(title=f"Progress {i}", subject="progress", difficulty=1,
+                        description="d", solution="s") for i in range(2)]
+    db_session.add_all([user, *problems])
+    db_session.commit()
+    return user.id, [problem.id for problem in problems]
+
+
+def stored(db_session, user_id, problem_id):
+    db_session.expire_all()
+    return db_session.scalars(select(UserProgress).filter(
+        UserProgress.user_id == user_id, UserProgress.problem_id == problem_id
+    )).first()
+
+
+class TestProgressService:
+    """Test coalesced progress writes."""
+
+    def test_events_are_coalesced(self, db_session, learner, query_counter):
+        """Test that many events become one upsert per flush."""
+        user_id, (first, second) = learner
+        buffer = ProgressBuffer(lambda: db_session, flush_interval=60, max_pending=100)
+        query_counter.clear()
+        for step in range(1, 11):
+            buffer.record(db_session, user_id, first, {"current_step": step})
+        buffer.record(db_session, user_id, first, {"hints_used": 2})
+        buffer.record(db_session, user_id, second, {"current_step": 1})
+        assert query_counter == []
+        assert len(buffer) == 2
+        assert buffer.pending(user_id, first) == {"current_step": 10, "hints_used": 2}
+
+        assert buffer.flush(db_session) == 2
+        upserts = [s for s in query_counter if "INSERT INTO user_progress" in s]
+        # One statement per distinct set of changed fields
+        assert len(upserts) == 2
+        assert "ON CONFLICT" in upserts[0]
+        row = stored(db_session, user_id, first)
+        assert (row.current_step, row.hints_used, row.completed) == (10, 2, False)
+        assert buffer.pending(user_id, first) is None
+
+        # Later events only overwrite the fields they carry
+        buffer.record(db_session, user_id, first, {"hints_used": 3})
+        buffer.flush(db_session)
+        row = stored(db_session, user_id, first)
+        assert (row.current_step, row.hints_used) == (10, 3)
+
+    def test_completion_is_written_immediately(self, db_session, learner):
+        """Test that completing a problem flushes before record returns."""
+        user_id, (problem_id, _) = learner
+        buffer = ProgressBuffer(lambda: db_session, flush_interval=60, max_pending=100)
+        buffer.record(db_session, user_id, problem_id, {"current_step": 3})
+        assert stored(db_session, user_id, problem_id) is None
+        buffer.record(db_session, user_id, problem_id, {"current_step": 4, "completed": True})
+        assert len(buffer) == 0
+        row = stored(db_session, user_id, problem_id)
+        assert (row.current_step, row.completed) == (4, True)
+
+        # Completion is sticky
+        buffer.record(db_session, user_id, problem_id, {"completed": False})
+        buffer.flush(db_session)
+        assert stored(db_session, user_id, problem_id).completed is True
+
+    def test_flush_when_full_and_on_close(self, db_session, learner):
+        """Test flushing once max_pending entries wait and on shutdown."""
+        user_id, (first, second) = learner
+        buffer = ProgressBuffer(lambda: db_session, flush_interval=60, max_pending=2)
+        buffer.record(db_session, user_id, first, {"current_step": 1})
+        assert len(buffer) == 1
+        buffer.record(db_session, user_id, second, {"current_step": 1})
+        assert len(buffer) == 0
+
+        buffer.record(db_session, user_id, first, {"current_step": 2})
+        buffer.close()
+        assert len(buffer) == 0
+        assert stored(db_session, user_id, first).current_step == 2
+
+    def test_failed_flush_is_retried(self, db_session, learner, monkeypatch):
+        """Test that entries from a failed flush are kept and merged with newer ones."""
+        user_id, (problem_id, _) = learner
+        buffer = ProgressBuffer(lambda: db_session, flush_interval=60, max_pending=100)
+        buffer.record(db_session, user_id, problem_id, {"current_step": 1, "hints_used": 1})
+
+        def fail(db, entries):
+            raise RuntimeError("database unavailable")
+        monkeypatch.setattr("app.services.progress_service.write_progress", fail)
+        with pytest.raises(RuntimeError):
+            buffer.flush(db_session)
+        monkeypatch.undo()
+
+        buffer.record(db_session, user_id, problem_id, {"current_step": 2})
+        assert buffer.pending(user_id, problem_id) == {"current_step": 2, "hints_used": 1}
+        buffer.flush(db_session)
+        row = stored(db_session, user_id, problem_id)
+        assert (row.current_step, row.hints_used) == (2, 1)
+
+    def test_unique_user_problem_index(self, db_session, learner):
+        """Test that a user has at most one progress row per problem."""
+        user_id, (problem_id, _) = learner
+        write_progress(db_session, {(user_id, problem_id): {"current_step": 1}})
+        db_session.commit()
+        db_session.add(UserProgress(user_id=user_id, problem_id=problem_id))
+        with pytest.raises(IntegrityError):
+            db_session.commit()
+        db_session.rollback()
+
+
+class TestProgressSummary:
+    """Test the dashboard aggregates maintained alongside progress writes."""
+
+    def write(self, db_session, entries):
+        write_progress(db_session, entries)
+        db_session.commit()
+
+    def test_aggregates_follow_progress_writes(self, db_session, learner, query_counter):
+        """Test incremental updates and that the summary is one lookup."""
+        user_id, (first, second) = learner
+        other = Problem(title="Summary", subject="summary", difficulty=1,
+                        description="d", solution="s")
+        db_session.add(other)
+        db_session.commit()
+
+        self.write(db_session, {
+            (user_id, first): {"current_step": 1, "hints_used": 2},
+            (user_id, other.id): {"hints_used": 1},
+        })
+        self.write(db_session, {
+            (user_id, first): {"hints_used": 3, "completed": True},
+            (user_id, second): {"completed": True},
+        })
+        # Completing again changes nothing
+        self.write(db_session, {(user_id, first): {"completed": True}})
+
+        query_counter.clear()
+        summary = get_progress_summary(db_session, user_id)
+        assert len(query_counter) == 1
+        assert [
+            (subject.subject, subject.started, subject.completed, subject.hints_used)
+            for subject in summary.subjects
+        ] == [("progress", 2, 2, 3), ("summary", 1, 0, 1)]
+        assert (summary.started, summary.completed, summary.hints_used) == (3, 2, 4)
+        assert summary.average_hints == 1.33
+        assert (summary.current_streak, summary.longest_streak) == (1, 1)
+        assert check_progress_summaries(db_session) == []
+
+        # Streaks lapse once a whole day passes without a completion
+        later = get_progress_summary(db_session, user_id, today=date.today() + timedelta(days=3))
+        assert (later.current_streak, later.longest_streak) == (0, 1)
+        assert get_progress_summary(db_session, -1).subjects == []
+
+    def test_extend_streak(self):
+        """Test consecutive, repeated and broken completion days."""
+        streak = UserStreak(user_id=1)
+        start = date(2024, 1, 1)
+        for offset in (0, 0, 1, 2, 5, 6):
+            extend_streak(streak, start + timedelta(days=offset))
+        assert (streak.current_streak, streak.longest_streak) == (2, 3)
+        assert streak.last_completed_on == start + timedelta(days=6)
+
+    def test_rebuild_and_check(self, db_session, learner):
+        """Test that drift is reported and a rebuild restores the aggregates."""
+        user_id, (first, second) = learner
+        self.write(db_session, {
+            (user_id, first): {"hints_used": 1, "completed": True},
+            (user_id, second): {"current_step": 2},
+        })
+        db_session.execute(delete(UserSubjectStats))
+        db_session.execute(delete(UserStreak))
+        db_session.commit()
+        assert len(check_progress_summaries(db_session)) == 2
+
+        assert rebuild_progress_summaries(db_session) == 1
+        assert check_progress_summaries(db_session) == []
+        summary = get_progress_summary(db_session, user_id)
+        assert (summary.started, summary.completed, summary.hints_used) == (2, 1, 1)
+        assert summary.current_streak == 1
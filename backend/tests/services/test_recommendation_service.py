@@ -0,0 +1,81 @@
+import pytest
+
+from app.db.models import Problem, User
+from app.services.progress_service import ProgressBuffer
+from app.services.recommendation_service import Recommender, recommender, update_skill
+
+
+@pytest.fixture(scope="function")
+def catalog(db_session):
+    """
+    Create five problems: b needs a, c needs a and b, d and e stand alone.
+    Returns (learner id, {name: problem id}).
+    """
+    user = User(email="recommend@example.com", username="recommend", hashed_password="x")
+    a = Problem(title="A", subject="algebra", difficulty=1, description="d", solution="s")
+    b = Problem(title="B", subject="algebra", difficulty=2, description="d", solution="s",
+                prerequisites=[a])
+    c = Problem(title="C", subject="algebra", difficulty=3, description="d", solution="s",
+                prerequisites=[a, b])
+    d = Problem(title="D", subject="geometry", difficulty=1, description="d", solution="s")
+    e = Problem(title="E", subject="geometry", difficulty=5, description="d", solution="s")
+    db_session.add_all([user, a, b, c, d, e])
+    db_session.commit()
+    return user.id, {problem.title.lower(): problem.id for problem in (a, b, c, d, e)}
+
+
+class TestUpdateSkill:
+    """Test the skill estimate's moving average."""
+
+    def test_hints_lower_performance(self):
+        """Test that clean solves raise skill and hints are capped at one level."""
+        assert update_skill(1.0, 1, 0) == pytest.approx(1.15)
+        assert update_skill(1.0, 1, 2) == pytest.approx(1.0)
+        assert update_skill(1.0, 3, 4) == update_skill(1.0, 3, 40)
+
+
+class TestRecommender:
+    """Test frontier maintenance and ranking by skill."""
+
+    def test_frontier_follows_completions(self, db_session, catalog, query_counter):
+        """Test that committed completions unlock dependents without queries."""
+        user_id, ids = catalog
+        skill, ranked = recommender.recommend(db_session, user_id, 5)
+        assert (skill, ranked) == (1.0, [ids["a"], ids["d"], ids["e"]])
+
+        buffer = ProgressBuffer(lambda: db_session, flush_interval=60, max_pending=100)
+        buffer.record(db_session, user_id, ids["a"], {"completed": True})
+        query_counter.clear()
+        skill, ranked = recommender.recommend(db_session, user_id, 5)
+        assert query_counter == []
+        assert skill == pytest.approx(1.15)
+        assert ranked == [ids["d"], ids["b"], ids["e"]]
+
+        # Hard-won completions move skill less
+        buffer.record(db_session, user_id, ids["b"], {"hints_used": 4, "completed": True})
+        skill, ranked = recommender.recommend(db_session, user_id, 2)
+        assert skill == pytest.approx(1.255)
+        assert ranked == [ids["d"], ids["c"]]
+
+        # A fresh load replays the stored completions to the same state
+        reloaded = Recommender(max_users=10, frontier_size=10, ttl=300)
+        assert reloaded.recommend(db_session, user_id, 2) == (skill, ranked)
+
+    def test_bounded_state(self, db_session, catalog):
+        """Test the user cap and refilling a truncated frontier."""
+        _, ids = catalog
+        bounded = Recommender(max_users=2, frontier_size=2, ttl=300)
+        for user_id in (101, 102, 103):
+            assert bounded.recommend(db_session, user_id, 10)[1] == [ids["a"], ids["d"]]
+        assert list(bounded._users) == [102, 103]
+
+        bounded.record_completions({(103, ids["a"]): 0, (103, ids["d"]): 0})
+        assert bounded._users[103].candidates == {ids["b"]}
+        # Truncated below the request: e is found again by a refill
+        assert bounded.recommend(db_session, 103, 2)[1] == [ids["b"], ids["e"]]
+
+        expired = Recommender(max_users=2, frontier_size=2, ttl=0)
+        expired.recommend(db_session, 101, 1)
+        expired.record_completions({(101, ids["a"]): 0})
+        # The expired state is reloaded from the database, which has no completions
+        assert expired.recommend(db_session, 101, 1)[1] == [ids["a"]]
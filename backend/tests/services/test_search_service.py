@@ -0,0 +1,68 @@
+import os
+
+from app.schemas.problem import ProblemCreate, StepCreate, HintCreate
+from app.services.import_service import import_problems
+from app.services.problem_service import create_problem
+from app.services.search_service import _fts5_query, _tsquery, rebuild_search_index, search_problems
+
+
+def word():
+    """A token no other test has indexed."""
+    return f"zq{os.urandom(4).hex()}"
+
+
+def make_problem(db_session, title, description="", step="", hint=""):
+    return create_problem(db_session, ProblemCreate(
+        title=title,
+        subject="search",
+        difficulty=1,
+        description=description,
+        solution="s",
+        steps=[StepCreate(order=0, content=step)],
+        hints=[HintCreate(order=0, content=hint)],
+    ))
+
+
+class TestSearchService:
+    """Test full-text problem search."""
+
+    def test_ranks_title_matches_first(self, db_session):
+        """Test that title matches outrank description and step matches."""
+        term = word()
+        in_step = make_problem(db_session, "Unrelated", step=f"Use {term} here")
+        in_title = make_problem(db_session, f"Solving {term}")
+        in_description = make_problem(db_session, "Other", description=f"About {term}")
+
+        hits = search_problems(db_session, term)
+        assert [hit.id for hit in hits] == [in_title.id, in_description.id, in_step.id]
+        assert hits[0].score > hits[1].score > hits[2].score
+        assert hits[0].title == f"Solving {term}"
+
+    def test_query_syntax(self, db_session):
+        """Test multi-word, prefix, stemmed and punctuation-only queries."""
+        term = word()
+        problem = make_problem(db_session, f"Counting triangles {term}",
+                               hint="Draw the diagram")
+        assert [hit.id for hit in search_problems(db_session, f"{term} triangle")] == [problem.id]
+        assert [hit.id for hit in search_problems(db_session, term[:-2])] == [problem.id]
+        assert [hit.id for hit in search_problems(db_session, f"{term} diagrams")] == [problem.id]
+        assert search_problems(db_session, f"{term} missingword") == []
+        assert search_problems(db_session, '"*) OR (') == []
+
+    def test_prefix_on_last_term(self):
+        """Test that both index dialects treat only the last term as a prefix."""
+        assert _fts5_query(["right", "triang"]) == '"right" "triang"*'
+        assert _tsquery(["right", "triang"]) == "'right' & 'triang':*"
+
+    def test_index_follows_imports_and_rebuilds(self, db_session):
+        """Test that imported problems are indexed and the index can be rebuilt."""
+        term = word()
+        result = import_problems(db_session, [{
+            "ref": "a", "title": "Imported", "subject": "search", "difficulty": 1,
+            "description": "d", "solution": "s", "steps": [],
+            "hints": [{"order": 0, "content": f"Hint mentioning {term}"}],
+        }])
+        assert [hit.id for hit in search_problems(db_session, term)] == [result.ids_by_ref["a"]]
+
+        assert rebuild_search_index(db_session, batch_size=7) > 0
+        assert [hit.id for hit in search_problems(db_session, term)] == [result.ids_by_ref["a"]]
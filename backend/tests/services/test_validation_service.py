@@ -0,0 +1,110 @@
+import pytest
+
+from app.db.models import Problem
+from app.schemas.validation import BatchAnswer
+from app.services.validation_service import (
+    compile_solution, parse_expression, solution_matchers, validate_answers,
+)
+
+
+class TestAnswerMatching:
+    """Test compiling solutions and matching answers against them."""
+
+    @pytest.mark.parametrize("solution, answer, correct", [
+        ("42", "42", True),
+        ("42", "x = 42", True),
+        ("42", "42.00000001", True),
+        ("42", "43", False),
+        ("1/3", "2/6", True),
+        ("1,000", "1000", True),
+        ("sqrt(2)", "1.41421356", True),
+        ("3.14 ± 0.01", "3.145", True),
+        ("3.14 +- 0.01", "3.2", False),
+        ("100 +/- 5%", "104", True),
+        ("100 +/- 5%", "106", False),
+    ])
+    def test_numeric(self, solution, answer, correct):
+        """Test numbers, fractions and tolerances."""
+        matcher = compile_solution(solution)
+        assert matcher.kind == "numeric"
+        assert matcher.matches(answer) is correct
+
+    @pytest.mark.parametrize("solution, answer, correct", [
+        ("2x + 3", "3 + 2*x", True),
+        ("2x + 3", "2x + 4", False),
+        ("(x + 1)^2", "x^2 + 2x + 1", True),
+        ("(x + 1)(x - 1)", "x**2 - 1", True),
+        ("y = 2x + 1", "1 + x·2", True),
+        ("sin(x)^2 + cos(x)^2", "1", True),
+        ("x^2", "y^2", False),
+        ("2x", "__import__('os')", False),
+        ("2x", "x.real * 2", False),
+    ])
+    def test_expression(self, solution, answer, correct):
+        """Test algebraic equivalence and that only arithmetic is evaluated."""
+        matcher = compile_solution(solution)
+        assert matcher.kind == "expression"
+        assert matcher.matches(answer) is correct
+
+    def test_text_regex_and_alternatives(self):
+        """Test normalized text, regex solutions and "||" alternatives."""
+        assert compile_solution("Photosynthesis").matches("  PHOTOSYNTHESIS. ")
+        assert not compile_solution("Photosynthesis").matches("respiration")
+        assert compile_solution("x").kind == "text"
+
+        matcher = compile_solution(r"regex:\d+ apples")
+        assert matcher.kind == "regex"
+        assert matcher.matches("12   Apples")
+        assert not matcher.matches("twelve apples")
+
+        matcher = compile_solution("4 || four")
+        assert matcher.kind == "numeric|text"
+        assert matcher.matches("4.0") and matcher.matches("Four")
+        assert not compile_solution(None).matches("")
+
+    def test_hostile_answers(self):
+        """Test that huge powers and deep nesting are rejected, not computed."""
+        matcher = compile_solution("2x")
+        assert not matcher.matches("9^9^9^9")
+        assert not matcher.matches("(" * 500 + "x" + ")" * 500)
+        # Parses, but recurses too deep to transform and compile
+        assert not matcher.matches("-" * 999 + "x")
+        assert not compile_solution("1").matches("-" * 999 + "1")
+        assert parse_expression("x.__class__") is None
+
+
+class TestValidationService:
+    """Test validating answers against stored solutions."""
+
+    def test_matchers_are_cached_per_problem(self, db_session, query_counter):
+        """Test that repeat submissions neither query nor recompile."""
+        problems = [
+            Problem(title=f"Validate {i}", subject="validation", difficulty=1,
+                    description="d", solution=solution)
+            for i, solution in enumerate(["2x + 3", "12 ± 0.5"])
+        ]
+        db_session.add_all(problems)
+        db_session.commit()
+        first, second = (problem.id for problem in problems)
+        answers = [
+            BatchAnswer(problem_id=first, answer="3 + 2x"),
+            BatchAnswer(problem_id=second, answer="13"),
+            BatchAnswer(problem_id=second, answer="12.25"),
+        ]
+
+        query_counter.clear()
+        results = validate_answers(db_session, answers)
+        assert [(r.problem_id, r.correct) for r in results] == [
+            (first, True), (second, False), (second, True),
+        ]
+        assert len(query_counter) == 1
+
+        matcher = solution_matchers.get_many(db_session, [first])[first]
+        query_counter.clear()
+        assert validate_answers(db_session, answers[:1])[0].correct
+        assert query_counter == []
+        assert solution_matchers.get_many(db_session, [first])[first] is matcher
+
+    def test_unknown_problem(self, db_session):
+        """Test that a batch with an unknown problem is rejected."""
+        assert validate_answers(db_session, [BatchAnswer(problem_id=999999, answer="1")]) is None
@@ -0,0 +1,66 @@
+from app.core import cache as cache_module
+from app.core.cache import LRUCacheBackend, ResponseCache, etag_matches, make_etag
+
+
+class TestResponseCache:
+    """Test the versioned response cache."""
+
+    def test_lru_backend_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        backend = LRUCacheBackend(max_entries=2)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+        assert backend.get("a") == 1
+        assert backend.get("b") is None
+        assert backend.get("c") == 3
+
+    def test_invalidate_bumps_version(self):
+        """Test that invalidation hides every entry and survives eviction."""
+        cache = ResponseCache("test", LRUCacheBackend(max_entries=2))
+        _, version = cache.get("detail:1")
+        entry = cache.set("detail:1", version, b'{"id": 1}', {"X-Extra": "1"})
+        assert cache.get("detail:1") == (entry, version)
+        assert entry.etag == make_etag(b'{"id": 1}')
+
+        cache.invalidate()
+        assert cache.get("detail:1")[0] is None
+        for i in range(5):
+            cache.set(f"detail:{i}", cache.get(f"detail:{i}")[1], b"{}")
+        cache.invalidate()
+        assert cache.get("detail:4")[0] is None
+
+    def test_write_during_query_is_not_cached(self):
+        """Test that a response built before an invalidation is never served."""
+        cache = ResponseCache("test", LRUCacheBackend(max_entries=10))
+        entry, version = cache.get("list")
+        assert entry is None
+        # A write commits and invalidates while the query runs
+        cache.invalidate()
+        cache.set("list", version, b"[]")
+        assert cache.get("list")[0] is None
+
+    def test_entries_expire(self, monkeypatch):
+        """Test that entries are dropped once their TTL has passed."""
+        now = [100.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache = ResponseCache("test", LRUCacheBackend(max_entries=10), ttl=30)
+        cache.set("detail:1", 0, b"{}")
+        now[0] += 29
+        assert cache.get("detail:1")[0] is not None
+        now[0] += 1
+        assert cache.get("detail:1")[0] is None
+        # Version counters never expire
+        cache.invalidate()
+        now[0] += 1000
+        assert cache.get("detail:1")[1] == 1
+
+    def test_etag_matches(self):
+        """Test If-None-Match parsing."""
+        etag = make_etag(b"body")
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
@@ -0,0 +1,43 @@
+import threading
+import time
+import pytest
+
+from app.core.hashing_pool import PasswordHashingPool, PasswordHashingBusy
+from app.core.security import _hash_password, _verify_password
+
+
+class TestPasswordHashingPool:
+    """Test the bounded password hashing pool."""
+
+    def test_hash_and_verify_in_worker_process(self):
+        """Test that hashing round-trips through worker processes."""
+        pool = PasswordHashingPool(max_workers=1, max_pending=1)
+        try:
+            hashed = pool.run(_hash_password, "testpassword123")
+            assert pool.run(_verify_password, "testpassword123", hashed) is True
+            assert pool.run(_verify_password, "wrongpassword", hashed) is False
+        finally:
+            pool.shutdown()
+
+    def test_rejects_when_saturated(self):
+        """Test that calls beyond the worker and queue capacity fail fast."""
+        pool = PasswordHashingPool(max_workers=0, max_pending=1, retry_after=3)
+        started = threading.Event()
+
+        def slow_call():
+            started.set()
+            time.sleep(0.3)
+
+        threads = [threading.Thread(target=pool.run, args=(slow_call,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        started.wait()
+        time.sleep(0.05)
+        with pytest.raises(PasswordHashingBusy) as excinfo:
+            pool.run(_hash_password, "testpassword123")
+        assert excinfo.value.retry_after == 3
+        for thread in threads:
+            thread.join()
+
+        # Capacity is released once the running calls finish
+        assert pool.run(_verify_password, "x", _hash_password("x")) is True
@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.core.metrics import (
+    Histogram,
+    MetricsRegistry,
+    db_statements,
+    http_request_duration,
+    http_requests,
+    password_hash_duration,
+    registry,
+)
+from app.core.security import get_password_hash, verify_password
+from app.db.session import instrument_engine
+
+
+class TestMetrics:
+    """Test metric collection and the Prometheus exposition."""
+
+    def test_histogram_rendering(self):
+        """Test cumulative buckets, sum and count in the text format."""
+        metrics = MetricsRegistry()
+        latency = metrics.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        requests = metrics.counter("requests_total", "Requests", ("route",))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, route='/a"b')
+        requests.inc(route="/a")
+
+        lines = metrics.render().splitlines()
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{route="/a\\"b",le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a\\"b",le="1.0"} 3' in lines
+        assert 'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 4' in lines
+        assert 'latency_seconds_sum{route="/a\\"b"} 3.65' in lines
+        assert 'latency_seconds_count{route="/a\\"b"} 4' in lines
+        assert 'requests_total{route="/a"} 1' in lines
+
+        with Histogram("timed_seconds", "Timed").time():
+            pass
+
+    def test_request_metrics(self, client):
+        """Test that requests are labelled by route template."""
+        route = "/api/v1/problems/{problem_id}"
+        before = http_requests.value(method="GET", route=route, status="404")
+        client.get("/api/v1/problems/999999")
+        client.get("/api/v1/problems/999998")
+        assert http_requests.value(method="GET", route=route, status="404") == before + 2
+        assert http_request_duration.count(method="GET", route=route) >= 2
+
+        client.get("/no/such/path")
+        assert http_requests.value(method="GET", route="unmatched", status="404") >= 1
+
+        response = client.get("/api/v1/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert f'http_requests_total{{method="GET",route="{route}",status="404"}}' in response.text
+        assert "# TYPE http_requests_in_progress gauge" in response.text
+        assert "db_pool_" in response.text
+
+    def test_sql_metrics(self):
+        """Test counting statements executed on an instrumented engine."""
+        engine = create_engine("sqlite:///:memory:")
+        instrument_engine(engine)
+        before = db_statements.value()
+        with engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(text("SELECT 1"))
+        assert db_statements.value() == before + 3
+
+    def test_sql_metrics_after_failed_statement(self):
+        """Test that a failing statement does not leave its start time behind."""
+        engine = create_engine("sqlite:///:memory:")
+        instrument_engine(engine)
+        before = db_statements.value()
+        with engine.connect() as connection:
+            with pytest.raises(exc.OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+            connection.execute(text("SELECT 1"))
+            assert connection.info["statement_start"] == []
+        assert db_statements.value() == before + 2
+
+    def test_password_hash_metrics(self):
+        """Test that hashing and verification are timed separately."""
+        before = password_hash_duration.count(operation="verify")
+        hashed = get_password_hash("testpassword123")
+        assert verify_password("testpassword123", hashed)
+        assert password_hash_duration.count(operation="verify") == before + 1
+        assert password_hash_duration.count(operation="hash") >= 1
+        assert "password_hash_duration_seconds_bucket" in registry.render()
@@ -0,0 +1,78 @@
+import ipaddress
+
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import (
+    InMemoryRateLimitBackend,
+    RateLimiter,
+    RateLimitExceeded,
+    client_address
+)
+
+
+class TestRateLimiter:
+    """Test the token bucket rate limiter."""
+
+    def test_burst_then_reject(self):
+        """Test that a key gets `limit` requests, then a retry hint."""
+        limiter = RateLimiter("test", limit=3, window=60, backend=InMemoryRateLimitBackend())
+        for _ in range(3):
+            limiter.check("1.2.3.4")
+        with pytest.raises(RateLimitExceeded) as excinfo:
+            limiter.check("1.2.3.4")
+        # One token refills every 20 seconds
+        assert 1 <= excinfo.value.retry_after <= 20
+        limiter.check("5.6.7.8")
+        limiter.check(None)
+
+    def test_budget_refills(self, monkeypatch):
+        """Test that tokens come back over time, up to the limit."""
+        now = [1000.0]
+        monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+        limiter = RateLimiter("test", limit=2, window=10, backend=InMemoryRateLimitBackend())
+        limiter.check("user")
+        limiter.check("user")
+        with pytest.raises(RateLimitExceeded):
+            limiter.check("user")
+
+        now[0] += 5
+        limiter.check("user")
+        with pytest.raises(RateLimitExceeded):
+            limiter.check("user")
+
+        now[0] += 3600
+        limiter.check("user")
+        limiter.check("user")
+        with pytest.raises(RateLimitExceeded):
+            limiter.check("user")
+
+    def test_disabled_and_bounded(self):
+        """Test that a zero limit disables checks and old keys are evicted."""
+        backend = InMemoryRateLimitBackend(max_keys=2)
+        disabled = RateLimiter("off", limit=0, window=60, backend=backend)
+        for _ in range(100):
+            disabled.check("key")
+
+        limiter = RateLimiter("test", limit=1, window=60, backend=backend)
+        for key in ("a", "b", "c"):
+            limiter.check(key)
+        assert len(backend._buckets) == 2
+        # "a" was evicted, so it starts with a fresh budget
+        limiter.check("a")
+
+    def test_client_address_behind_trusted_proxies(self):
+        """Test that X-Forwarded-For is only read through trusted proxies."""
+        trusted = [ipaddress.ip_network("10.0.0.0/8"), ipaddress.ip_network("::1")]
+        # Direct clients cannot pick their own key
+        assert client_address("203.0.113.5", "1.1.1.1", trusted) == "203.0.113.5"
+        assert client_address("203.0.113.5", "1.1.1.1", []) == "203.0.113.5"
+        # Behind the proxy, the rightmost untrusted hop is the client and
+        # entries the client forged to its left are ignored
+        assert client_address("10.0.0.2", "1.1.1.1, 203.0.113.5", trusted) == "203.0.113.5"
+        assert client_address("10.0.0.2", "203.0.113.5, 10.0.0.9", trusted) == "203.0.113.5"
+        assert client_address("::1", "203.0.113.5", trusted) == "203.0.113.5"
+        # Only proxies in the chain, or no header at all
+        assert client_address("10.0.0.2", "10.0.0.3", trusted) == "10.0.0.3"
+        assert client_address("10.0.0.2", None, trusted) == "10.0.0.2"
+        assert client_address(None, "1.1.1.1", trusted) is None
@@ -0,0 +1,39 @@
+import json
+from typing import List
+
+from app.core.responses import FastJSONResponse, model_response
+from app.db.models import Problem as ProblemModel, Step as StepModel
+from app.schemas.problem import Problem, ProblemSummary
+from app.schemas.user import User
+
+
+class TestResponses:
+    """Test the fast JSON response path."""
+
+    def test_fast_json_response_rendering(self):
+        """Test rendering dicts, models and pre-serialized bytes."""
+        response = FastJSONResponse({"total": 2, "counts": {1: 2}, "name": "ünï"})
+        assert json.loads(response.body) == {"total": 2, "counts": {"1": 2}, "name": "ünï"}
+
+        user = User(id=1, email="a@example.com", username="a")
+        assert json.loads(FastJSONResponse(user).body)["username"] == "a"
+        assert FastJSONResponse(b'{"cached":true}').body == b'{"cached":true}'
+
+    def test_model_response_from_orm_objects(self):
+        """Test serializing ORM objects straight to a response."""
+        root = ProblemModel(id=1, title="Root", subject="s", difficulty=1,
+                            description="d", solution="x", steps=[], hints=[])
+        leaf = ProblemModel(id=2, title="Leaf", subject="s", difficulty=2,
+                            description="d", solution="x", hints=[], prerequisites=[root],
+                            steps=[StepModel(id=5, problem_id=2, order=1, content="Go")])
+        response = model_response(Problem, leaf, status_code=201)
+        assert response.status_code == 201
+        assert response.media_type == "application/json"
+        body = json.loads(response.body)
+        assert body["steps"] == [{"order": 1, "content": "Go", "id": 5, "problem_id": 2}]
+        assert body["prerequisites"][0]["title"] == "Root"
+        assert body == json.loads(Problem.model_validate(leaf).model_dump_json())
+
+        leaf.preview, leaf.step_count = "d", 1
+        response = model_response(List[ProblemSummary], [leaf])
+        assert json.loads(response.body)[0]["prerequisite_ids"] == [1]
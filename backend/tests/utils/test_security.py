@@ -3,7 +3,12 @@ import time
 from datetime import timedelta, datetime, timezone
 from jose import jwt
 
+from app.core import security
 from app.core.security import (
+    PasswordPolicy,
+    calibrate_bcrypt_rounds,
+    crypt_context,
+    verify_and_update_password,
     verify_password,
     get_password_hash,
     create_access_token,
@@ -29,6 +34,28 @@ class TestSecurity:
         # Verify an incorrect password fails
         assert verify_password("wrongpassword", hashed) is False
 
+    def test_verify_and_update_password(self, monkeypatch):
+        """Test that hashes below the current cost are flagged for rehashing."""
+        monkeypatch.setattr(security, "password_policy", PasswordPolicy("bcrypt", 5))
+        weak = crypt_context(PasswordPolicy("bcrypt", 4)).hash("testpassword123")
+        valid, new_hash = verify_and_update_password("testpassword123", weak)
+        assert valid is True
+        assert new_hash.startswith("$2b$05$")
+        assert verify_and_update_password("testpassword123", new_hash) == (True, None)
+        assert verify_and_update_password("wrongpassword", weak) == (False, None)
+
+        # Stronger hashes than the policy are kept as they are
+        strong = crypt_context(PasswordPolicy("bcrypt", 6)).hash("testpassword123")
+        assert verify_and_update_password("testpassword123", strong) == (True, None)
+
+    def test_calibrate_bcrypt_rounds(self, monkeypatch):
+        """Test picking the highest cost that fits the verify time target."""
+        # 10 ms at 10 rounds, doubling with every extra round
+        monkeypatch.setattr(security, "time_bcrypt", lambda rounds: 0.010)
+        assert calibrate_bcrypt_rounds(100) == 13
+        assert calibrate_bcrypt_rounds(1) == 10
+        assert calibrate_bcrypt_rounds(10 ** 6, max_rounds=14) == 14
+
     def test_create_access_token(self):
         """Test JWT token creation."""
         data = {"sub": "testuser"}
@@ -0,0 +1,46 @@
+import time
+
+from app.core.token_cache import TokenCache
+
+
+class TestTokenCache:
+    """Test the verified-token cache."""
+
+    def test_get_and_set(self):
+        """Test caching claims and a user snapshot for a token."""
+        cache = TokenCache(max_entries=10, max_ttl=60)
+        claims = {"sub": "alice", "exp": time.time() + 60}
+        assert cache.get("token-a") is None
+        cache.set("token-a", claims, {"username": "alice"})
+        entry = cache.get("token-a")
+        assert entry.claims == claims
+        assert entry.user == {"username": "alice"}
+
+    def test_entries_expire_with_the_token(self):
+        """Test that entries are dropped once the token has expired."""
+        cache = TokenCache(max_entries=10, max_ttl=60)
+        cache.set("expired", {"sub": "alice", "exp": time.time() - 1}, None)
+        assert cache.get("expired") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test that the least recently used token is evicted first."""
+        cache = TokenCache(max_entries=2, max_ttl=60)
+        cache.set("a", {"sub": "alice"}, None)
+        cache.set("b", {"sub": "bob"}, None)
+        cache.get("a")
+        cache.set("c", {"sub": "carol"}, None)
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+
+    def test_invalidate_user(self):
+        """Test that invalidating a user drops all of their tokens."""
+        cache = TokenCache(max_entries=10, max_ttl=60)
+        cache.set("a1", {"sub": "alice"}, None)
+        cache.set("a2", {"sub": "alice"}, None)
+        cache.set("b1", {"sub": "bob"}, None)
+        cache.invalidate_user("alice")
+        assert cache.get("a1") is None
+        assert cache.get("a2") is None
+        assert cache.get("b1") is not None
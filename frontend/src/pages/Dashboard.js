@@ -53,7 +53,7 @@ const Dashboard = () => {
       return {
         ...progress,
         problem,
-        progressPercentage: problem ? (progress.current_step / problem.steps.length) * 100 : 0
+        progressPercentage: problem ? (progress.current_step / problem.step_count) * 100 : 0
       };
     });
   
@@ -77,9 +77,9 @@ const ProblemList = () => {
                     />
                   </Box>
                   <Typography variant="body2" color="text.secondary">
-                    {problem.description.length > 150 
-                      ? `${problem.description.substring(0, 150)}...` 
-                      : problem.description}
+                    {problem.preview.length > 150 
+                      ? `${problem.preview.substring(0, 150)}...` 
+                      : problem.preview}
                   </Typography>
                 </CardContent>
                 <CardActions>